@@ -1,3 +1,9 @@
 from . import _version
 
-__version__ = _version.get_versions()["version"]
+
+def __getattr__(name):
+    # computing the version can be slow (e.g. it might invoke git),
+    # so it is only done on demand
+    if name == "__version__":
+        return _version.get_versions()["version"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
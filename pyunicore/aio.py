@@ -0,0 +1,896 @@
+"""
+    Asyncio-based client library for UNICORE
+
+    This module offers asyncio counterparts of the main classes
+    from pyunicore.client, so that a single event loop can drive many
+    concurrent operations (e.g. monitoring thousands of jobs)
+    without requiring lots of threads.
+
+    It is based on the 'httpx' library, install it with
+
+        pip install pyunicore[async]
+
+    >>> async with AsyncTransport(credential) as transport:
+    >>>     client = AsyncClient(transport, base_url)
+    >>>     job = await client.new_job({"Executable": "date"})
+    >>>     await job.poll()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import pathlib
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime
+from datetime import timedelta
+
+import httpx
+
+from pyunicore.client import _DEFAULT_CACHE_TIME
+from pyunicore.client import _DEFAULT_POOL_SIZE
+from pyunicore.client import JobStatus
+from pyunicore.client import TransferStatus
+from pyunicore.client import WorkflowStatus
+from pyunicore.client import _url_params
+from pyunicore.codec import JSONCodec
+from pyunicore.codec import get_codec
+from pyunicore.credentials import AuthenticationFailedException
+from pyunicore.credentials import Credential
+from pyunicore.http2 import is_available as http2_available
+from pyunicore.polling import PollingStrategy
+
+_CHUNK_SIZE = 64 * 1024
+
+
+async def _poll(resource, get_state, is_done, message, timeout=0, polling_strategy=None):
+    """await is_done(await get_state()), checking the state according to the
+    polling strategy (by default, the one of the resource's transport).
+    If the optional timeout (in seconds) is reached, a TimeoutError is raised
+    """
+    strategy = polling_strategy or resource.transport.polling_strategy
+    poller = strategy.poller()
+    start_time = time.time()
+    state = await get_state()
+    while not is_done(state):
+        interval = poller.next_interval(state)
+        if timeout > 0:
+            remaining = start_time + timeout - time.time()
+            if remaining <= 0:
+                raise TimeoutError(message)
+            interval = min(interval, remaining)
+        await asyncio.sleep(interval)
+        resource._last_retrieved = datetime.min
+        state = await get_state()
+    poller.done(type(resource).__name__)
+
+
+async def _run_concurrently(function, items, max_concurrent):
+    """await function(item) for all items, with at most 'max_concurrent'
+    running at the same time. Returns two dictionaries (results and errors),
+    keyed by item
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def run(item):
+        async with semaphore:
+            return await function(item)
+
+    outcomes = await asyncio.gather(*[run(item) for item in items], return_exceptions=True)
+    results = {}
+    errors = {}
+    for item, outcome in zip(items, outcomes):
+        if isinstance(outcome, Exception):
+            errors[item] = outcome
+        else:
+            results[item] = outcome
+    return results, errors
+
+
+class AsyncTransport:
+    """asyncio counterpart of pyunicore.client.Transport, which
+        - adds HTTP Authorization header based on the supplied credentials
+        - transparently handles security sessions
+        - handles user preferences
+        - keeps connections alive, using a connection pool that is
+          shared by all clones of the transport
+    """
+
+    def __init__(
+        self,
+        credential: Credential,
+        verify=False,
+        use_security_sessions=True,
+        timeout=120,
+        pool_size=_DEFAULT_POOL_SIZE,
+        client: httpx.AsyncClient = None,
+        codec: JSONCodec = None,
+        http2=False,
+        polling_strategy: PollingStrategy = None,
+    ):
+        """
+        Create a new AsyncTransport.
+
+        Args:
+            credential: the credential
+            timeout: timeout for HTTP calls (defaults to 120 seconds)
+            use_security_sessions: if true, UNICORE's security sessions mechanism
+                will be used (to speed up request processing)
+            verify: if true, SSL verification of the server's certificate will be done
+            pool_size: maximum number of connections kept open per host
+            client: optional httpx.AsyncClient to use (if not given, a new one is
+                created). The client is shared by all clones of this transport
+            codec: JSON codec for encoding request bodies and decoding responses.
+                By default, the fastest available one is used (see pyunicore.codec)
+            http2: if true, HTTP/2 is used if the server supports it and the 'h2'
+                library is installed. Ignored if a 'client' is given
+            polling_strategy: optional PollingStrategy used when waiting for jobs,
+                transfers etc. The strategy is shared by all clones of this transport
+        """
+        self.credential = credential
+        self.verify = verify
+        self.use_security_sessions = use_security_sessions
+        self.last_session_id = None
+        self._preferences = None
+        self.timeout = timeout
+        self.settings_changed = True
+        self.pool_size = pool_size
+        if client is None:
+            limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+            client = httpx.AsyncClient(
+                verify=verify, timeout=timeout, limits=limits, http2=http2 and http2_available()
+            )
+        self.client = client
+        self.codec = codec if codec is not None else get_codec()
+        self.polling_strategy = (
+            polling_strategy if polling_strategy is not None else PollingStrategy()
+        )
+
+    def _clone(self):
+        """create a copy of this transport, sharing the underlying connection pool"""
+        tr = AsyncTransport(
+            self.credential,
+            pool_size=self.pool_size,
+            client=self.client,
+            codec=self.codec,
+            polling_strategy=self.polling_strategy,
+        )
+        tr._preferences = self._preferences
+        tr.use_security_sessions = self.use_security_sessions
+        tr.last_session_id = self.last_session_id
+        tr.timeout = self.timeout
+        tr.verify = self.verify
+        return tr
+
+    def _headers(self, kwargs):
+        headers = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+        auth = self.credential.get_auth_header()
+        if auth:
+            headers["Authorization"] = auth
+
+        if self.use_security_sessions and self.last_session_id is not None:
+            headers["X-UNICORE-SecuritySession"] = self.last_session_id
+
+        if self._preferences is not None:
+            headers["X-UNICORE-User-Preferences"] = self._preferences
+
+        if "headers" in kwargs:
+            headers.update(kwargs["headers"])
+            del kwargs["headers"]
+
+        return headers
+
+    @property
+    def preferences(self):
+        return self._preferences
+
+    @preferences.setter
+    def preferences(self, value):
+        self._preferences = value
+        self.last_session_id = None
+        self.settings_changed = True
+
+    async def aclose(self):
+        """close all pooled connections (affects all clones of this transport)"""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+    async def check_error(self, res: httpx.Response):
+        """checks for error and extracts any error info sent by the server"""
+        if 400 <= res.status_code < 600:
+            await res.aread()
+            reason = res.reason_phrase
+            try:
+                reason = res.json().get("errorMessage", "n/a")
+            except ValueError:
+                pass
+            msg = f"{res.status_code} Server Error: {reason} for url: {res.url}"
+            raise httpx.HTTPStatusError(msg, request=res.request, response=res)
+
+    def repeat_required(self, res, headers):
+        if self.use_security_sessions:
+            if 432 == res.status_code:
+                headers.pop("X-UNICORE-SecuritySession", None)
+                return True
+        return False
+
+    async def run_method(self, method, url, stream=False, **args):
+        """performs the requested method, handling security sessions, timeouts etc
+
+        Args:
+            method: the HTTP method ("GET", "PUT", "POST", "DELETE")
+            url: the URL to send the request to
+            stream: if true, the response body is not read, and the caller
+                must close the response (see 'stream()')
+        """
+        _headers = self._headers(args)
+        if "json" in args:
+            args["content"] = self.codec.dumps(args.pop("json"))
+        req = self.client.build_request(method, url, headers=_headers, **args)
+        res = await self.client.send(req, stream=stream)
+        if self.repeat_required(res, _headers):
+            await res.aclose()
+            req = self.client.build_request(method, url, headers=_headers, **args)
+            res = await self.client.send(req, stream=stream)
+        try:
+            await self.check_error(res)
+        except httpx.HTTPStatusError:
+            await res.aclose()
+            raise
+        if self.use_security_sessions:
+            self.last_session_id = res.headers.get("X-UNICORE-SecuritySession", None)
+        self.settings_changed = False
+        return res
+
+    async def get(self, to_json=True, **kwargs):
+        """do GET and return the response content as JSON
+
+        Note:
+            For the raw response, set `to_json` to false
+        """
+        res = await self.run_method("GET", **kwargs)
+        if not to_json:
+            return res
+        return self.codec.loads(res.content)
+
+    async def get_many(self, urls, max_concurrent=None, **kwargs):
+        """do concurrent GETs for all the given URLs
+
+        Args:
+            urls: list of URLs
+            max_concurrent: maximum number of concurrent requests (defaults to
+                the connection pool size)
+            kwargs: additional arguments for get(), e.g. 'params'
+
+        Returns:
+            two dictionaries keyed by URL: the JSON results, and the errors
+            for the URLs that could not be retrieved
+        """
+        return await _run_concurrently(
+            lambda url: self._clone().get(url=url, **kwargs),
+            list(dict.fromkeys(urls)),
+            max_concurrent or self.pool_size,
+        )
+
+    async def put(self, **kwargs):
+        """do a PUT and return the response"""
+        return await self.run_method("PUT", **kwargs)
+
+    async def post(self, **kwargs):
+        """do a POST and return the response"""
+        return await self.run_method("POST", **kwargs)
+
+    async def delete(self, **kwargs):
+        """send a DELETE to the current endpoint and return the response"""
+        return await self.run_method("DELETE", **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method, **kwargs):
+        """perform a request without reading the response body
+
+        >>> async with transport.stream("GET", url=...) as res:
+        >>>     async for chunk in res.aiter_bytes():
+        >>>         ...
+        """
+        res = await self.run_method(method, stream=True, **kwargs)
+        try:
+            yield res
+        finally:
+            await res.aclose()
+
+
+class AsyncResource:
+    """Base class for accessing a UNICORE REST endpoint with (cached)
+    properties and some common methods.
+    """
+
+    def __init__(
+        self,
+        security: Credential | AsyncTransport,
+        resource_url: str,
+        cache_time=_DEFAULT_CACHE_TIME,
+    ):
+        """
+        Create a new AsyncResource.
+        Args:
+            security: this can be either a Credential or an AsyncTransport
+            resource_url: the endpoint to connect to
+            cache_time: the minimum time in seconds between calls to the endpoint
+                    when getting properties
+        """
+        if isinstance(security, Credential):
+            self.transport = AsyncTransport(security)
+        elif isinstance(security, AsyncTransport):
+            self.transport = security._clone()
+        else:
+            raise TypeError("Need Credential or AsyncTransport object")
+        self.resource_url = resource_url
+        self.cache_time = cache_time
+        self._last_properties = None
+        self._last_retrieved = datetime.min
+
+    async def properties(self):
+        """get resource properties (these are cached for cache_time seconds)"""
+        now = datetime.now()
+        if (
+            self.transport.settings_changed
+            or self.cache_time <= 0
+            or (timedelta(seconds=self.cache_time) < now - self._last_retrieved)
+        ):
+            self._last_properties = await self.transport.get(url=self.resource_url)
+            self._last_retrieved = now
+        return self._last_properties
+
+    @staticmethod
+    async def prefetch(resources, max_concurrent=None) -> dict:
+        """concurrently fetch the properties of the given resources, so that
+        subsequent access to their properties is served from the cache.
+
+        Returns:
+            dictionary of errors, keyed by resource URL
+        """
+        resources = list(resources)
+        if not resources:
+            return {}
+        max_concurrent = max_concurrent or resources[0].transport.pool_size
+        _, errors = await _run_concurrently(lambda r: r.properties(), resources, max_concurrent)
+        return {r.resource_url: e for r, e in errors.items()}
+
+    async def links(self):
+        urls = (await self.properties())["_links"]
+        return {k: v["href"] for k, v in urls.items()}
+
+    async def delete(self):
+        """delete/destroy this resource"""
+        await self.transport.delete(url=self.resource_url)
+
+    async def set_properties(self, props):
+        """set/update resource properties"""
+        res = await self.transport.put(url=self.resource_url, json=props)
+        return self.transport.codec.loads(res.content)
+
+    async def _post_action(self, name):
+        url = (await self.links())[name]
+        await self.transport.post(url=url, json={})
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}: {self.resource_url}"
+
+    __str__ = __repr__
+
+
+class AsyncClient(AsyncResource):
+    """Entrypoint to the UNICORE API at a site
+
+    >>> site_client = AsyncClient(credential, base_url)
+    >>> await site_client.assert_authentication()
+    >>> jobs = await site_client.get_jobs()
+    >>> job = await site_client.new_job(job_description)
+    """
+
+    def __init__(
+        self,
+        security: Credential | AsyncTransport,
+        site_url: str,
+        cache_time=_DEFAULT_CACHE_TIME,
+    ):
+        super().__init__(security, site_url, cache_time)
+
+    async def assert_authentication(self):
+        '''Asserts that the remote role is not "anonymous"'''
+        if (await self.access_info())["role"]["selected"] == "anonymous":
+            raise AuthenticationFailedException("Failure to authenticate at %s" % self.resource_url)
+
+    async def access_info(self):
+        """get authentication and authentication information about the current user"""
+        return (await self.properties())["client"]
+
+    async def server_version_info(self):
+        """get server version as a tuple (major, minor, patch)"""
+        v = (await self.properties())["server"]["version"]
+        return tuple([int(x) for x in tuple(v.split("-")[0].split("."))])
+
+    async def get_storages(self, offset=0, num=200, tags=[], all=False):
+        """get a list of all Storages on this site"""
+        filter = "all" if all else None
+        q_params = _url_params(offset, num, tags, filter)
+        url = (await self.links())["storages"]
+        urls = (await self.transport.get(url=url, params=q_params))["storages"]
+        return [AsyncStorage(self.transport, url) for url in urls]
+
+    async def get_transfers(self, offset=0, num=200, tags=[]):
+        """get a list of all Transfers"""
+        q_params = _url_params(offset, num, tags)
+        url = (await self.links())["transfers"]
+        urls = (await self.transport.get(url=url, params=q_params))["transfers"]
+        return [AsyncTransfer(self.transport, url) for url in urls]
+
+    async def get_jobs(self, offset=0, num=None, tags=[], prefetch=False):
+        """return a list of `AsyncJob` objects.
+        If 'prefetch' is True, the properties of all jobs are fetched concurrently."""
+        q_params = _url_params(offset, num, tags)
+        url = (await self.links())["jobs"]
+        urls = (await self.transport.get(url=url, params=q_params))["jobs"]
+        jobs = [AsyncJob(self.transport, url) for url in urls]
+        if prefetch:
+            await AsyncResource.prefetch(jobs)
+        return jobs
+
+    async def new_job(self, job_description: dict, inputs=None, autostart: bool = True):
+        """Submit and start a job on the site, optionally uploading local input data files
+        The input files can be either a simple array of local file names, or a dictionary
+        with the destination names as keys and the local file names as values.
+        """
+        if inputs is None:
+            inputs = []
+        if len(inputs) > 0 or job_description.get("haveClientStageIn") is True:
+            job_description["haveClientStageIn"] = "true"
+        url = (await self.links())["jobs"]
+        resp = await self.transport.post(url=url, json=job_description)
+        job = AsyncJob(self.transport, resp.headers["Location"])
+        if len(inputs) > 0:
+            working_dir = await job.working_dir()
+            uploads = []
+            for input_item in inputs:
+                if isinstance(inputs, dict):
+                    uploads.append(working_dir.upload(inputs[input_item], destination=input_item))
+                else:
+                    uploads.append(working_dir.upload(input_item))
+            await asyncio.gather(*uploads)
+        if autostart:
+            await job.start()
+        return job
+
+    async def issue_auth_token(self, lifetime=-1, renewable=False, limited=False) -> str:
+        """
+        Issue an authentication token (JWT) from this UNICORE server
+        Args:
+            lifetime: lifetime in seconds. If <=0, the server default will be used
+            limited: if True, the token will only be useable on this server
+            renewable: if True, the token can be used to get a new token
+        """
+        params = {}
+        if lifetime > 0:
+            params["lifetime"] = lifetime
+        if renewable:
+            params["renewable"] = "true"
+        if limited:
+            params["limited"] = "true"
+        resp = await self.transport.get(
+            url=self.resource_url + "/token",
+            headers={"Accept": "text/plain"},
+            to_json=False,
+            params=params,
+        )
+        return resp.text
+
+
+class AsyncJob(AsyncResource):
+    """wrapper around UNICORE job"""
+
+    def __init__(
+        self,
+        security: Credential | AsyncTransport,
+        job_url: str,
+        cache_time=_DEFAULT_CACHE_TIME,
+    ):
+        super().__init__(security, job_url, cache_time)
+
+    async def working_dir(self):
+        """return the AsyncStorage for accessing this job's working directory"""
+        wd = AsyncStorage(self.transport, (await self.links())["workingDirectory"])
+        await wd._wait_until_ready()
+        return wd
+
+    async def status(self):
+        return JobStatus((await self.properties())["status"])
+
+    async def bss_details(self):
+        """return a JSON containing the low-level batch system details"""
+        return await self.transport.get(url=(await self.links())["details"])
+
+    async def is_running(self):
+        """checks whether this job is still running"""
+        return (await self.properties())["status"] not in ("SUCCESSFUL", "FAILED")
+
+    async def abort(self):
+        """abort this job"""
+        await self._post_action("action:abort")
+
+    async def restart(self):
+        """restart this job"""
+        await self._post_action("action:restart")
+
+    async def start(self):
+        """start this job - only required if client had to stage-in local files"""
+        await self._post_action("action:start")
+
+    @property
+    def job_id(self):
+        """get the UUID of this job"""
+        return os.path.basename(self.resource_url)
+
+    async def poll(self, state=JobStatus.SUCCESSFUL, timeout=0, polling_strategy=None):
+        """wait until this job reaches the given status (default : SUCCESSFUL)
+        or a later one (like SUCCESSFUL or FAILED).
+        If the optional timeout is reached, a TimeoutError will be raised
+        Args:
+            state - job state to wait for (default : JobStatus.SUCCESSFUL)
+            timeout - timeout in seconds (default: 0 = no timeout)
+            polling_strategy - PollingStrategy (default: the transport's strategy)
+        """
+        if state == JobStatus.UNDEFINED:
+            raise ValueError("Cannot wait for %s" % state)
+        target = min(state.ordinal(), JobStatus.SUCCESSFUL.ordinal())
+        await _poll(
+            self,
+            self.status,
+            lambda status: status.ordinal() >= target,
+            "Timeout waiting for job to become %s" % state.value,
+            timeout,
+            polling_strategy,
+        )
+
+
+class AsyncStorage(AsyncResource):
+    """wrapper around a UNICORE Storage resource"""
+
+    def __init__(
+        self,
+        security: Credential | AsyncTransport,
+        storage_url: str,
+        cache_time=_DEFAULT_CACHE_TIME,
+    ):
+        super().__init__(security, storage_url, cache_time)
+
+    async def _wait_until_ready(self, timeout=-1, polling_strategy=None):
+        """since some storages take some time to initialise, this method allows to wait
+        until the storage is READY
+        """
+
+        async def status():
+            return (await self.properties()).get("resourceStatus", "n/a")
+
+        await _poll(
+            self,
+            status,
+            lambda status: status == "READY",
+            "Timeout waiting for storage to become READY",
+            timeout,
+            polling_strategy,
+        )
+
+    def _to_file_url(self, path):
+        return (
+            self.resource_url
+            + "/files"
+            + pathlib.Path("/" + path.lstrip("/")).as_posix().rstrip("/")
+        )
+
+    async def contents(self, path="/"):
+        """get a simple list of files in the given directory"""
+        return await self.transport.get(url=self._to_file_url(path))
+
+    async def stat(self, path):
+        """get a reference to a file/directory"""
+        path_url = self._to_file_url(path)
+        props = await self.transport.get(url=path_url, headers={"Accept": "application/json"})
+        if props["isDirectory"]:
+            return AsyncPathDir(self, path_url, path)
+        else:
+            return AsyncPathFile(self, path_url, path)
+
+    async def listdir(self, base="/") -> dict:
+        """get a list of files and directories in the given base directory"""
+        ret = {}
+        for path, meta in (await self.contents(base))["content"].items():
+            path_url = self._to_file_url(path)
+            path = path.lstrip("/")
+            if meta["isDirectory"]:
+                ret[path] = AsyncPathDir(self, path_url, path)
+            else:
+                ret[path] = AsyncPathFile(self, path_url, path)
+        return ret
+
+    async def rename(self, source, target):
+        """rename a file on this storage"""
+        url = (await self.links())["action:rename"]
+        return await self.transport.post(url=url, json={"from": source, "to": target})
+
+    async def copy(self, source, target):
+        """copy a file on this storage"""
+        url = (await self.links())["action:copy"]
+        return await self.transport.post(url=url, json={"from": source, "to": target})
+
+    async def mkdir(self, name):
+        """create a directory"""
+        return await self.transport.post(url=self._to_file_url(name), json={})
+
+    async def rmdir(self, name):
+        """remove a directory and all its content"""
+        await self.transport.delete(url=self._to_file_url(name))
+
+    async def rm(self, name):
+        """remove a file"""
+        await self.transport.delete(url=self._to_file_url(name))
+
+    async def upload(self, file_name, destination=None):
+        """upload local file "file_name" to the remote file "destination".
+        If "destination" is not given, it is derived from the local file path
+        (see pyunicore.client.Storage.upload())
+        """
+        if destination is None:
+            if os.path.isabs(file_name):
+                destination = os.path.basename(file_name)
+            else:
+                destination = file_name
+        fd = await _in_thread(open, file_name, "rb")
+        try:
+            await self.put(source=fd, destination=destination)
+        finally:
+            await _in_thread(fd.close)
+
+    async def put(self, source, destination):
+        """upload data to the destination file on this storage
+
+        Args:
+            source (str-like, file-like or async iterable of bytes): this will be uploaded
+            destination: target path (parent directory will be created if needed)
+        """
+        if hasattr(source, "read"):
+            source = _aiter_file(source)
+        _headers = {"Content-Type": "application/octet-stream"}
+        await self.transport.put(
+            url=self._to_file_url(destination), headers=_headers, content=source
+        )
+
+    async def _create_transfer(self, json):
+        dest = self.resource_url + "/transfers"
+        resp = await self.transport.post(url=dest, json=json)
+        return AsyncTransfer(self.transport, resp.headers["Location"])
+
+    async def send_file(
+        self, file_name, remote_url, protocol=None, scheduled=None, additional_parameters={}
+    ):
+        """launch a server-to-server transfer: send a file from this storage to a remote location
+        (see pyunicore.client.Storage.send_file())
+        """
+        params = additional_parameters.copy()
+        if protocol:
+            remote_url = protocol + ":" + remote_url
+        if scheduled:
+            params["scheduledStartTime"] = scheduled
+        json = {"file": file_name, "target": remote_url, "extraParameters": params}
+        return await self._create_transfer(json)
+
+    async def receive_file(
+        self, remote_url, file_name, protocol=None, scheduled=None, additional_parameters={}
+    ):
+        """launch a server-to-server transfer: pull a file from a remote storage to this storage
+        (see pyunicore.client.Storage.receive_file())
+        """
+        params = additional_parameters.copy()
+        if protocol:
+            remote_url = protocol + ":" + remote_url
+        if scheduled:
+            params["scheduledStartTime"] = scheduled
+        json = {"file": file_name, "source": remote_url, "extraParameters": params}
+        return await self._create_transfer(json)
+
+
+async def _in_thread(function, *args):
+    """run blocking (file) I/O in the default executor, so that
+    it does not block the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+async def _aiter_file(fd, chunk_size=_CHUNK_SIZE):
+    """async generator reading a file-like object in chunks"""
+    while True:
+        chunk = await _in_thread(fd.read, chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            chunk = chunk.encode("UTF-8")
+        yield chunk
+
+
+class AsyncPath(AsyncResource):
+    """common base for files and directories"""
+
+    def __init__(
+        self, storage: AsyncStorage, path_url: str, name: str, cache_time=_DEFAULT_CACHE_TIME
+    ):
+        super().__init__(storage.transport, path_url, cache_time)
+        self.name = name
+        self.storage = storage
+
+    def isdir(self):
+        """is a directory"""
+        return False
+
+    def isfile(self):
+        """is a file"""
+        return False
+
+    async def size(self):
+        return (await self.properties())["size"]
+
+    async def remove(self):
+        """remove this file or directory"""
+        return await self.storage.rm(self.name)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}: {self.name}"
+
+    __str__ = __repr__
+
+
+class AsyncPathDir(AsyncPath):
+    def isdir(self):
+        return True
+
+
+class AsyncPathFile(AsyncPath):
+    def isfile(self):
+        return True
+
+    async def download(self, file):
+        """download file
+
+        Args:
+            file (str or file-like): if a string, a file of that name
+            will be created, and filled with the download. If it's file-like,
+            then the contents will be written via write()
+        """
+        if isinstance(file, str):
+            fd = await _in_thread(open, file, "wb")
+            try:
+                await self.download(fd)
+            finally:
+                await _in_thread(fd.close)
+            return
+        async for chunk in self.iter_bytes():
+            await _in_thread(file.write, chunk)
+
+    async def iter_bytes(self, offset=0, size=-1, chunk_size=_CHUNK_SIZE):
+        """async iterator over the content of this file.
+        The optional 'offset' and 'size' parameters allow to download only
+        part of the file.
+        """
+        _headers = {"Accept": "application/octet-stream"}
+        if offset < 0:
+            raise ValueError("Offset must be positive")
+        if offset > 0 or size > -1:
+            _range = "bytes=%s-" % offset
+            if size > -1:
+                _range += str(size + offset - 1)
+            _headers["Range"] = _range
+        async with self.transport.stream("GET", url=self.resource_url, headers=_headers) as res:
+            async for chunk in res.aiter_bytes(chunk_size):
+                yield chunk
+
+
+class AsyncTransfer(AsyncResource):
+    """wrapper around a UNICORE server-to-server transfer"""
+
+    async def status(self):
+        return TransferStatus((await self.properties())["status"])
+
+    async def is_running(self):
+        """checks whether this transfer is still running"""
+        return (await self.properties())["status"] not in ("DONE", "FAILED")
+
+    async def abort(self):
+        """abort this transfer"""
+        await self._post_action("action:abort")
+
+    async def poll(self, state=TransferStatus.DONE, timeout=0, polling_strategy=None):
+        """wait until this transfer reaches the given status (default : DONE)
+        or a later one (like FAILED or ABORTED).
+        If the optional timeout is reached, a TimeoutError will be raised
+        """
+        await _poll(
+            self,
+            self.status,
+            lambda status: status.ordinal() >= state.ordinal(),
+            "Timeout waiting for transfer to become %s" % state.value,
+            timeout,
+            polling_strategy,
+        )
+
+
+class AsyncWorkflowService(AsyncResource):
+    """Entrypoint for the UNICORE Workflow API"""
+
+    async def assert_authentication(self):
+        '''Asserts that the remote role is not "anonymous"'''
+        if (await self.properties())["client"]["role"]["selected"] == "anonymous":
+            raise AuthenticationFailedException("Failure to authenticate at %s" % self.resource_url)
+
+    async def get_workflows(self, offset=0, num=None, tags=[]):
+        """get the list of workflows"""
+        q_params = _url_params(offset, num, tags)
+        urls = (await self.transport.get(url=self.resource_url, params=q_params))["workflows"]
+        return [AsyncWorkflow(self.transport, url) for url in urls]
+
+    async def new_workflow(self, wf_description):
+        """submit a workflow"""
+        resp = await self.transport.post(url=self.resource_url, json=wf_description)
+        return AsyncWorkflow(self.transport, resp.headers["Location"])
+
+
+class AsyncWorkflow(AsyncResource):
+    """wrapper around a UNICORE workflow"""
+
+    async def status(self):
+        return WorkflowStatus((await self.properties())["status"])
+
+    async def is_running(self):
+        """checks whether this workflow is still running"""
+        return (await self.properties())["status"] not in ("SUCCESSFUL", "ABORTED", "FAILED")
+
+    async def poll(self, state=WorkflowStatus.SUCCESSFUL, timeout=0, polling_strategy=None):
+        """wait until this workflow reaches the given status (default : SUCCESSFUL)
+        or a later one (like FAILED or ABORTED).
+        If the optional timeout is reached, a TimeoutError will be raised
+        """
+        await _poll(
+            self,
+            self.status,
+            lambda status: status.ordinal() >= state.ordinal(),
+            "Timeout waiting for workflow to become %s" % state.value,
+            timeout,
+            polling_strategy,
+        )
+
+    async def abort(self):
+        """abort this workflow"""
+        await self._post_action("action:abort")
+
+    async def resume(self, params={}):
+        """resume this workflow (from "HELD" state), optionally updating parameters"""
+        url = (await self.links())["action:continue"]
+        return await self.transport.post(url=url, json=params)
+
+    async def get_files(self):
+        """get a dictionary of registered workflow files and their
+        physical locations
+        """
+        return await self.transport.get(url=(await self.links())["files"])
+
+    async def get_jobs(self, offset=0, num=None):
+        """return the list of jobs submitted for this workflow"""
+        q_params = _url_params(offset, num, [])
+        url = (await self.links())["jobs"]
+        urls = (await self.transport.get(url=url, params=q_params))["jobs"]
+        return [AsyncJob(self.transport, url) for url in urls]
@@ -0,0 +1,140 @@
+"""
+    Caching support for resource properties
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class CacheStatistics:
+    """Counts how resource properties were retrieved:
+
+    - hits: served from the local cache, without contacting the server
+    - not_modified: revalidated with a conditional request ("304 Not Modified")
+    - misses: the full document was downloaded
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.not_modified = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def hit(self):
+        self._count("hits")
+
+    def revalidated(self):
+        self._count("not_modified")
+
+    def miss(self):
+        self._count("misses")
+
+    @property
+    def hit_ratio(self) -> float:
+        """fraction of property accesses that did not require downloading the document"""
+        total = self.hits + self.not_modified + self.misses
+        return (self.hits + self.not_modified) / total if total > 0 else 0.0
+
+    def __repr__(self):
+        return "CacheStatistics: hits={} not_modified={} misses={} hit_ratio={:.2f}".format(
+            self.hits, self.not_modified, self.misses, self.hit_ratio
+        )
+
+    __str__ = __repr__
+
+
+class CacheEntry:
+    """Cached resource properties, including the validators for conditional requests"""
+
+    def __init__(self, properties, retrieved, expires, size, etag, last_modified, immutable):
+        self.properties = properties
+        self.retrieved = retrieved
+        self.expires = expires
+        self.size = size
+        self.etag = etag
+        self.last_modified = last_modified
+        self.immutable = immutable
+
+    def is_fresh(self, now) -> bool:
+        return self.immutable or now < self.expires
+
+
+class ResourceCache:
+    """Cache for resource properties, which can be shared by many transports (and
+    thus by all Client, Job, Storage, ... objects using them), so that recreating
+    objects for the same resource does not lead to fetching the same URL again.
+
+    Entries are keyed by the resource URL, the credential and the user preferences.
+    The least recently used entries are evicted if the maximum number of entries or
+    the maximum (approximate) size in bytes is exceeded.
+
+    Resources in a final state (e.g. a SUCCESSFUL job or a DONE transfer) are
+    treated as immutable, and are kept until they are evicted.
+
+    >>> cache = ResourceCache(ttls={"Job": 10, "Storage": 60})
+    >>> transport = Transport(credential, resource_cache=cache)
+
+    Args:
+        ttls: dictionary of time-to-live values (in seconds) per resource class name,
+              e.g. {"Job": 10}. For other types, the resource's 'cache_time' is used
+        max_entries: maximum number of cache entries
+        max_bytes: maximum size of the cached documents (in bytes)
+    """
+
+    def __init__(self, ttls=None, max_entries=10000, max_bytes=64 * 1024 * 1024):
+        self.ttls = ttls or {}
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def ttl(self, resource_type, default):
+        """get the TTL for the given resource type (class name)"""
+        return self.ttls.get(resource_type, default)
+
+    def get(self, key) -> CacheEntry:
+        """get the entry for the given key (which might be expired), or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, entry: CacheEntry):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+            self._entries[key] = entry
+            self._size += entry.size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._size > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry.size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        """approximate size of the cached documents in bytes"""
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
@@ -216,7 +216,7 @@ class ListJobs(Base):
             self.print_header()
         for endpoint in self.registry.site_urls.values():
             site_client = Client(self.credential, site_url=endpoint)
-            for job in site_client.get_jobs(tags=tags):
+            for job in site_client.get_jobs(tags=tags, prefetch=self.args.long):
                 if self.args.long:
                     self.details(job)
                 else:
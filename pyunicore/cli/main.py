@@ -1,28 +1,38 @@
 """ Main client class """
 
+import importlib
 import platform
 import sys
 
-import pyunicore.cli.base
-import pyunicore.cli.exec
-import pyunicore.cli.io
+import pyunicore._version
 
+# command name -> (module, class name, description)
+# the command modules are only imported when a command is actually used
 _commands = {
-    "cancel-job": pyunicore.cli.exec.CancelJob,
-    "cat": pyunicore.cli.io.Cat,
-    "cp": pyunicore.cli.io.CP,
-    "exec": pyunicore.cli.exec.Exec,
-    "issue-token": pyunicore.cli.base.IssueToken,
-    "job-status": pyunicore.cli.exec.GetJobStatus,
-    "list-jobs": pyunicore.cli.exec.ListJobs,
-    "ls": pyunicore.cli.io.LS,
-    "rest": pyunicore.cli.base.REST,
-    "run": pyunicore.cli.exec.Run,
+    "cancel-job": ("pyunicore.cli.exec", "CancelJob", "cancel job(s)"),
+    "cat": ("pyunicore.cli.io", "Cat", "cat remote files"),
+    "cp": ("pyunicore.cli.io", "CP", "copy files"),
+    "exec": ("pyunicore.cli.exec", "Exec", "run a command through UNICORE"),
+    "issue-token": ("pyunicore.cli.base", "IssueToken", "issue an authentication token"),
+    "job-status": ("pyunicore.cli.exec", "GetJobStatus", "get job status"),
+    "list-jobs": ("pyunicore.cli.exec", "ListJobs", "list your jobs"),
+    "ls": ("pyunicore.cli.io", "LS", "list directories"),
+    "rest": ("pyunicore.cli.base", "REST", "perform a low-level REST API operation"),
+    "run": ("pyunicore.cli.exec", "Run", "runs job(s) through UNICORE"),
 }
 
 
+def get_command_class(name):
+    module_name, class_name, _ = _commands[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
 def get_command(name):
-    return _commands.get(name)()
+    return get_command_class(name)()
+
+
+def get_description(name):
+    return _commands[name][2]
 
 
 def show_version():
@@ -43,7 +53,7 @@ The following commands are available:""" % pyunicore._version.get_versions().get
     print(_header)
     print(s)
     for cmd in sorted(_commands):
-        print(f" {cmd:20} - {get_command(cmd).get_description()}")
+        print(f" {cmd:20} - {get_description(cmd)}")
     print("Enter 'unicore <command> -h' for help on a particular command.")
 
 
@@ -17,20 +17,41 @@ except ImportError:
 import os
 import pathlib
 import re
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import closing
 from datetime import datetime
 from datetime import timedelta
 from enum import Enum
+from urllib.parse import urlparse
 
 import requests
 
+from pyunicore.cache import CacheEntry
+from pyunicore.cache import CacheStatistics
+from pyunicore.cache import ResourceCache
+from pyunicore.codec import JSONCodec
+from pyunicore.codec import get_codec
+from pyunicore.compression import CompressionStatistics
+from pyunicore.compression import accept_encoding
+from pyunicore.compression import compress
 from pyunicore.credentials import Anonymous
 from pyunicore.credentials import AuthenticationFailedException
 from pyunicore.credentials import Credential
+from pyunicore.http2 import HTTP2Adapter
+from pyunicore.http2 import is_available as http2_available
+from pyunicore.metrics import RequestEvent
+from pyunicore.metrics import url_template
+from pyunicore.polling import PollingStrategy
+from pyunicore.ratelimit import RateLimiter
+from pyunicore.retry import RetryPolicy
 
 _DEFAULT_CACHE_TIME = 5  # in seconds
 
+_DEFAULT_POOL_SIZE = 10  # keep-alive connections per host
+
 _HBP_REGISTRY_URL = "https://unicore.fz-juelich.de" "/HBP/rest/registries/default_registry"
 
 _FACTORY_RE = r"""
@@ -67,11 +88,185 @@ def _url_params(offset, num, tags, filter=None):
     return q_params
 
 
+def _create_session(pool_size=_DEFAULT_POOL_SIZE, http2=False) -> requests.Session:
+    """create a requests.Session with a connection pool of the given size.
+    If 'http2' is true and the required libraries are available, HTTP/2
+    is used for "https://" URLs (see pyunicore.http2)"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if http2 and http2_available():
+        session.mount("https://", HTTP2Adapter(pool_size))
+    return session
+
+
+def _poll(resource, get_state, is_done, message, timeout=0, polling_strategy=None):
+    """wait until is_done(get_state()) is true, checking the state according to the
+    polling strategy (by default, the one of the resource's transport).
+    If the optional timeout (in seconds) is reached, a TimeoutError is raised
+    """
+    strategy = polling_strategy or resource.transport.polling_strategy
+    poller = strategy.poller()
+    start_time = time.time()
+    state = get_state()
+    while not is_done(state):
+        interval = poller.next_interval(state)
+        if timeout > 0:
+            remaining = start_time + timeout - time.time()
+            if remaining <= 0:
+                raise TimeoutError(message)
+            interval = min(interval, remaining)
+        time.sleep(interval)
+        resource._invalidate()
+        state = get_state()
+    poller.done(type(resource).__name__)
+
+
+def _run_concurrently(function, items, max_workers):
+    """apply the function to all items using a bounded thread pool.
+    Returns two dictionaries (results and errors), keyed by item
+    """
+    results = {}
+    errors = {}
+    if not items:
+        return results, errors
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        futures = {item: pool.submit(function, item) for item in items}
+        for item, future in futures.items():
+            try:
+                results[item] = future.result()
+            # any error is reported per item, and must not affect the others
+            except Exception as e:  # noqa: B902
+                errors[item] = e
+    return results, errors
+
+
+def _rewind_function(data):
+    """returns a function that resets the request body before a retry,
+    or None if the request body cannot be sent again"""
+    if data is None or isinstance(data, (bytes, str, dict, list, tuple)):
+        return lambda: None
+    try:
+        pos = data.tell()
+        return lambda: data.seek(pos)
+    except (AttributeError, OSError):
+        return None
+
+
+def _on_release(raw, callback):
+    """invokes the callback once, when the connection of the (streamed)
+    raw response is released or the raw response is closed"""
+    lock = threading.Lock()
+    released = []
+
+    def wrap(function):
+        def wrapper(*args, **kwargs):
+            try:
+                return function(*args, **kwargs)
+            finally:
+                with lock:
+                    first = not released
+                    released.append(True)
+                if first:
+                    callback()
+
+        return wrapper
+
+    if raw is None:
+        callback()
+        return
+    raw.close = wrap(raw.close)
+    raw.release_conn = wrap(raw.release_conn)
+
+
+def _server(url):
+    """get the server part (scheme://host:port) of a URL"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+# successful authentication checks: credential -> set of (URL, user preferences)
+_authenticated = weakref.WeakKeyDictionary()
+_authenticated_lock = threading.Lock()
+
+
+def _check_authentication(resource, props=None):
+    """Asserts that the remote role is not "anonymous".
+    Successful checks are remembered per (URL, credential, user preferences),
+    so the check is done only once per process"""
+    credential = resource.transport.credential
+    key = (resource.resource_url, resource.transport.preferences)
+    with _authenticated_lock:
+        if key in _authenticated.get(credential, ()):
+            return
+    if props is None:
+        props = resource.properties
+    if props["client"]["role"]["selected"] == "anonymous":
+        raise AuthenticationFailedException("Failure to authenticate at %s" % resource.resource_url)
+    with _authenticated_lock:
+        _authenticated.setdefault(credential, set()).add(key)
+
+
+class SecuritySessionStore:
+    """Thread-safe store for UNICORE security session IDs, keyed by
+    (server, credential, user preferences).
+
+    It is shared by all clones of a Transport, so that a session established
+    or renewed by one of them is immediately used by all others.
+    The store also counts full authentications (requests sent without a
+    security session), requests re-using a session, and expired sessions.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._stats = {"authentications": 0, "reused": 0, "expired": 0}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._sessions.get(key)
+
+    def put(self, key, session_id):
+        with self._lock:
+            self._sessions[key] = session_id
+
+    def invalidate(self, key, session_id=None):
+        """remove the session for the given key. If a session_id is given,
+        the session is only removed if it has not been renewed in the meantime"""
+        with self._lock:
+            if session_id is None or self._sessions.get(key) == session_id:
+                self._sessions.pop(key, None)
+
+    def count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def statistics(self) -> dict:
+        """get the counters:
+        authentications (requests sent without a security session),
+        reused (requests sent with a security session) and
+        expired (requests that had to be repeated because the session expired)
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+
 class Transport:
     """wrapper around requests, which
         - adds HTTP Authorization header based on the supplied credentials
         - transparently handles security sessions
         - handles user preferences
+        - keeps connections alive, using a connection pool that is
+          shared by all clones of the transport
+
+    A transport is thread-safe and can be shared by worker threads. Each
+    request uses a consistent snapshot of the settings (preferences, security
+    session) taken when it is started.
 
     see also
         https://unicore-docs.readthedocs.io/en/latest/user-docs/rest-api/index.html#user-preferences
@@ -84,6 +279,17 @@ class Transport:
         verify=False,
         use_security_sessions=True,
         timeout=120,
+        pool_size=_DEFAULT_POOL_SIZE,
+        session: requests.Session = None,
+        retry_policy: RetryPolicy = None,
+        resource_cache: ResourceCache = None,
+        codec: JSONCodec = None,
+        observers: list = None,
+        rate_limiter: RateLimiter = None,
+        session_store: SecuritySessionStore = None,
+        compression=None,
+        http2=False,
+        polling_strategy: PollingStrategy = None,
     ):
         """
         Create a new Transport.
@@ -94,24 +300,89 @@ class Transport:
             use_security_sessions: if true, UNICORE's security sessions mechanism
                 will be used (to speed up request processing)
             verify: if true, SSL verification of the server's certificate will be done
+            pool_size: maximum number of keep-alive connections kept open per host
+            session: optional requests.Session to use (if not given, a new pooled
+                session is created). The session is shared by all clones of this transport
+            retry_policy: optional RetryPolicy for retrying failed requests (e.g. on
+                connection errors or "503 Service Unavailable"). The policy (and its
+                statistics) is shared by all clones of this transport
+            resource_cache: optional ResourceCache for resource properties, which is
+                shared by all clones of this transport. The same cache can be used
+                by many transports
+            codec: JSON codec for encoding request bodies and decoding responses.
+                By default, the fastest available one is used (see pyunicore.codec)
+            observers: list of callables which are invoked with a RequestEvent
+                (see pyunicore.metrics) after each request. The list is shared by
+                all clones of this transport. Exceptions raised by observers are ignored
+            rate_limiter: optional RateLimiter limiting the number of concurrent requests
+                and the request rate per host. The limiter is shared by all clones of
+                this transport, requests exceeding the limits are queued
+            session_store: optional SecuritySessionStore for the security session IDs.
+                By default, a new store is created, which is shared by all clones
+                of this transport
+            compression: optional content encoding ("gzip", "zstd") or list of encodings
+                which are accepted for compressed responses ("identity" for uncompressed
+                responses). Sizes and compression ratios are recorded in the transport's
+                'compression_statistics'
+            http2: if true, HTTP/2 is used for "https://" URLs if the server supports it,
+                so that concurrent requests share a single connection. Falls back to
+                HTTP/1.1 if the server or the installed libraries do not support it
+                (see pyunicore.http2). Ignored if a 'session' is given
+            polling_strategy: optional PollingStrategy used when waiting for jobs,
+                transfers etc. By default, a new strategy is created. The strategy
+                (and its statistics) is shared by all clones of this transport
         """
         super().__init__()
         self.credential = credential
         self.verify = verify
         self.use_security_sessions = use_security_sessions
-        self.last_session_id = None
+        self.session_store = session_store if session_store is not None else SecuritySessionStore()
+        self._last_server = None
         self._preferences = None
         self.timeout = timeout
         self.settings_changed = True
+        self._settings_version = 0
+        self._lock = threading.Lock()
+        self.pool_size = pool_size
+        self.http2 = http2
+        self.session = session if session is not None else _create_session(pool_size, http2)
+        self.retry_policy = retry_policy
+        self.cache_statistics = CacheStatistics()
+        self.compression = compression
+        self._accept_encoding = accept_encoding(compression) if compression else None
+        self.compression_statistics = CompressionStatistics()
+        self.resource_cache = resource_cache
+        self.codec = codec if codec is not None else get_codec()
+        self.observers = observers if observers is not None else []
+        self.rate_limiter = rate_limiter
+        self.polling_strategy = (
+            polling_strategy if polling_strategy is not None else PollingStrategy()
+        )
 
     def _clone(self):
-        """create a copy of this transport"""
-        tr = Transport(self.credential)
+        """create a copy of this transport, sharing the underlying connection pool"""
+        tr = Transport(
+            self.credential,
+            pool_size=self.pool_size,
+            session=self.session,
+            retry_policy=self.retry_policy,
+            resource_cache=self.resource_cache,
+            codec=self.codec,
+            observers=self.observers,
+            rate_limiter=self.rate_limiter,
+            session_store=self.session_store,
+            compression=self.compression,
+            http2=self.http2,
+            polling_strategy=self.polling_strategy,
+        )
         tr._preferences = self._preferences
         tr.use_security_sessions = self.use_security_sessions
-        tr.last_session_id = self.last_session_id
+        tr._last_server = self._last_server
         tr.timeout = self.timeout
         tr.verify = self.verify
+        tr.settings_changed = self.settings_changed
+        tr.cache_statistics = self.cache_statistics
+        tr.compression_statistics = self.compression_statistics
         return tr
 
     def _headers(self, kwargs):
@@ -123,11 +394,17 @@ class Transport:
         if auth:
             headers["Authorization"] = auth
 
-        if self.use_security_sessions and self.last_session_id is not None:
-            headers["X-UNICORE-SecuritySession"] = self.last_session_id
+        preferences = self._preferences
+        if self.use_security_sessions and "url" in kwargs:
+            session_id = self.session_store.get(self._session_key(kwargs["url"], preferences))
+            if session_id is not None:
+                headers["X-UNICORE-SecuritySession"] = session_id
 
-        if self._preferences is not None:
-            headers["X-UNICORE-User-Preferences"] = self._preferences
+        if preferences is not None:
+            headers["X-UNICORE-User-Preferences"] = preferences
+
+        if self._accept_encoding is not None:
+            headers["Accept-Encoding"] = self._accept_encoding
 
         if "headers" in kwargs:
             headers.update(kwargs["headers"])
@@ -141,9 +418,30 @@ class Transport:
 
     @preferences.setter
     def preferences(self, value):
-        self._preferences = value
-        self.last_session_id = None
-        self.settings_changed = True
+        with self._lock:
+            self._preferences = value
+            self._settings_version += 1
+            self.settings_changed = True
+
+    def _session_key(self, url, preferences):
+        return (_server(url), self.credential, preferences)
+
+    @property
+    def last_session_id(self):
+        """the security session ID for the server that was last accessed"""
+        if self._last_server is None:
+            return None
+        return self.session_store.get(self._session_key(self._last_server, self._preferences))
+
+    @last_session_id.setter
+    def last_session_id(self, value):
+        if self._last_server is None:
+            return
+        key = self._session_key(self._last_server, self._preferences)
+        if value is None:
+            self.session_store.invalidate(key)
+        else:
+            self.session_store.put(key, value)
 
     def check_error(self, res):
         """checks for error and extracts any error info sent by the server"""
@@ -161,58 +459,240 @@ class Transport:
     def repeat_required(self, res, headers):
         if self.use_security_sessions:
             if 432 == res.status_code:
-                headers.pop("X-UNICORE-SecuritySession", None)
+                expired = headers.pop("X-UNICORE-SecuritySession", None)
+                self.session_store.count("expired")
+                key = self._session_key(res.url, headers.get("X-UNICORE-User-Preferences"))
+                self.session_store.invalidate(key, expired)
+                # another clone might have renewed the session already
+                renewed = self.session_store.get(key)
+                if renewed is not None and renewed != expired:
+                    headers["X-UNICORE-SecuritySession"] = renewed
                 return True
         return False
 
-    def run_method(self, method, **args):
-        """performs the requested method, handling security sessions, timeouts etc"""
-        _headers = self._headers(args)
-        res = method(headers=_headers, verify=self.verify, timeout=self.timeout, **args)
-        if self.repeat_required(res, _headers):
-            res = method(
-                headers=_headers,
+    def _count_session_use(self, headers):
+        if self.use_security_sessions:
+            if "X-UNICORE-SecuritySession" in headers:
+                self.session_store.count("reused")
+            else:
+                self.session_store.count("authentications")
+
+    def close(self):
+        """close all pooled connections (affects all clones of this transport)"""
+        self.session.close()
+
+    def _send(self, method, headers, args):
+        if self.rate_limiter is None:
+            return self._do_send(method, headers, args)
+        if not args.get("stream"):
+            with self.rate_limiter.limit(args["url"]):
+                return self._do_send(method, headers, args)
+        # a streamed response is in flight until its body is read or it is closed
+        url = args["url"]
+        self.rate_limiter.acquire(url)
+        sent = False
+        try:
+            res = self._do_send(method, headers, args)
+            sent = True
+        finally:
+            if not sent:
+                self.rate_limiter.release(url)
+        _on_release(res.raw, lambda: self.rate_limiter.release(url))
+        return res
+
+    def _do_send(self, method, headers, args):
+        self._count_session_use(headers)
+        res = self.session.request(
+            method, headers=headers, verify=self.verify, timeout=self.timeout, **args
+        )
+        if self.repeat_required(res, headers):
+            self._count_session_use(headers)
+            res = self.session.request(
+                method,
+                headers=headers,
                 verify=self.verify,
                 timeout=self.timeout,
                 **args,
             )
-        self.check_error(res)
+        return res
+
+    def _retry(self, method, attempt, rewind, response=None, error=None):
+        """checks the retry policy, and if the request should be retried,
+        waits for the backoff time"""
+        if self.retry_policy is None or rewind is None:
+            return False
+        if not self.retry_policy.should_retry(method, attempt, response, error):
+            return False
+        time.sleep(self.retry_policy.get_backoff(attempt, response))
+        rewind()
+        return True
+
+    def _record_compression(self, res, direction, decoded_bytes):
+        """record the size of a compressed response body"""
+        if res.headers.get("Content-Encoding", "identity") == "identity":
+            return
+        try:
+            encoded_bytes = res.raw.tell()
+        except AttributeError:
+            return
+        self.compression_statistics.record(direction, encoded_bytes, decoded_bytes)
+
+    def add_observer(self, observer):
+        """add an observer, which will be invoked with a RequestEvent after each request
+        (affects all clones of this transport)"""
+        self.observers.append(observer)
+
+    def _notify(self, method, args, headers, res, retries, start, error=None):
+        """send a RequestEvent to all observers"""
+        if not self.observers:
+            return
+        url = args.get("url")
+        bytes_in = bytes_out = 0
+        if res is not None:
+            if args.get("stream"):
+                bytes_in = int(res.headers.get("Content-Length", 0))
+            else:
+                bytes_in = len(res.content)
+            bytes_out = int(res.request.headers.get("Content-Length", 0))
+        event = RequestEvent(
+            method=method,
+            url=url,
+            url_template=url_template(url),
+            status=res.status_code if res is not None else None,
+            bytes_in=bytes_in,
+            bytes_out=bytes_out,
+            latency=time.perf_counter() - start,
+            retries=retries,
+            session_reused="X-UNICORE-SecuritySession" in headers,
+            error=error,
+        )
+        for observer in self.observers:
+            try:
+                observer(event)
+            # a failing observer must not break the request
+            except Exception:  # noqa: B902
+                pass
+
+    def run_method(self, method, **args):
+        """performs the requested method, handling security sessions, timeouts,
+        retries etc
+
+        Args:
+            method: the HTTP method ("GET", "PUT", "POST", "DELETE")
+        """
+        self._last_server = _server(args["url"])
+        settings_version = self._settings_version
+        _headers = self._headers(args)
+        if "json" in args:
+            args["data"] = self.codec.dumps(args.pop("json"))
+        if self.retry_policy is not None:
+            self.retry_policy.request_started()
+        rewind = _rewind_function(args.get("data"))
+        attempt = 0
+        res = None
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    res = self._send(method, _headers, args)
+                except requests.RequestException as e:
+                    if not self._retry(method, attempt, rewind, error=e):
+                        raise
+                else:
+                    if not self._retry(method, attempt, rewind, response=res):
+                        break
+                    res.close()
+                attempt += 1
+            self.check_error(res)
+        except requests.RequestException as e:
+            self._notify(method, args, _headers, res, attempt, start, e)
+            raise
+        self._notify(method, args, _headers, res, attempt, start)
+        if not args.get("stream"):
+            self._record_compression(res, "response", len(res.content))
         if self.use_security_sessions:
-            self.last_session_id = res.headers.get("X-UNICORE-SecuritySession", None)
-        self.settings_changed = False
+            self._update_session(args["url"], _headers, res)
+        with self._lock:
+            # settings might have been changed by another thread in the meantime
+            if self._settings_version == settings_version:
+                self.settings_changed = False
         return res
 
+    def _update_session(self, url, headers, res):
+        key = self._session_key(url, headers.get("X-UNICORE-User-Preferences"))
+        session_id = res.headers.get("X-UNICORE-SecuritySession", None)
+        if session_id is None:
+            self.session_store.invalidate(key)
+        else:
+            self.session_store.put(key, session_id)
+
     def get(self, to_json=True, **kwargs):
         """do GET and return the response content as JSON
 
         Note:
             For the raw response, set `to_json` to false
         """
-        res = self.run_method(requests.get, **kwargs)
+        res = self.run_method("GET", **kwargs)
         if not to_json:
             return res
-        json = res.json()
+        json = self.codec.loads(res.content)
         res.close()
         return json
 
+    def get_many(self, urls, max_workers=None, **kwargs):
+        """do concurrent GETs for all the given URLs, using a bounded thread pool
+
+        Args:
+            urls: list of URLs
+            max_workers: maximum number of concurrent requests (defaults to
+                the connection pool size)
+            kwargs: additional arguments for get(), e.g. 'params'
+
+        Returns:
+            two dictionaries keyed by URL: the JSON results, and the errors
+            for the URLs that could not be retrieved
+        """
+        return _run_concurrently(
+            lambda url: self._clone().get(url=url, **kwargs),
+            list(dict.fromkeys(urls)),
+            max_workers or self.pool_size,
+        )
+
     def put(self, **kwargs):
         """do a PUT and return the response"""
-        return self.run_method(requests.put, **kwargs)
+        return self.run_method("PUT", **kwargs)
 
     def post(self, **kwargs):
         """do a POST and return the response"""
-        return self.run_method(requests.post, **kwargs)
+        return self.run_method("POST", **kwargs)
 
     def delete(self, **kwargs):
         """send a DELETE to the current endpoint and return the response"""
-        return self.run_method(requests.delete, **kwargs)
+        return self.run_method("DELETE", **kwargs)
 
 
 class Resource:
     """Base class for accessing a UNICORE REST endpoint with (cached)
     properties and some common methods.
+
+    When the cached properties expire, they are re-validated using a
+    conditional request (based on the "ETag" and "Last-Modified" headers
+    sent by the server), so the full document is only downloaded if it
+    has actually changed.
+
+    If the transport has a shared ResourceCache, it is consulted before
+    contacting the server.
+
+    If only some of the properties are needed, get_properties(fields) can be
+    used to fetch just these fields.
+
+    Resources are thread-safe: concurrent access to the properties is
+    serialized, so that only one request is made when they have expired.
     """
 
+    # values of the "status" property which will not change any more
+    _final_states = ()
+
     def __init__(
         self, security: Credential | Transport, resource_url: str, cache_time=_DEFAULT_CACHE_TIME
     ):
@@ -235,19 +715,186 @@ class Resource:
         self.cache_time = cache_time
         self._last_properties = None
         self._last_retrieved = datetime.min
+        self._etag = None
+        self._last_modified = None
+        self._last_size = 0
+        self._projected = {}
+        self._projected_retrieved = datetime.min
+        self._lock = threading.RLock()
 
     @property
     def properties(self):
         """get resource properties (these are cached for cache_time seconds)"""
-        now = datetime.now()
-        if (
-            self.transport.settings_changed
-            or self.cache_time <= 0
-            or (timedelta(seconds=self.cache_time) < now - self._last_retrieved)
-        ):
-            self._last_properties = self.transport.get(url=self.resource_url)
+        with self._lock:
+            now = datetime.now()
+            if not self._is_fresh(self._last_retrieved, now) and not self._load_from_shared_cache(
+                now
+            ):
+                self._last_properties = self._fetch_properties()
+                self._last_retrieved = now
+                self._store_in_shared_cache(now)
+            else:
+                self.transport.cache_statistics.hit()
+            return self._last_properties
+
+    def get_properties(self, fields=None) -> dict:
+        """get resource properties, optionally only the named fields
+
+        Only the requested fields are sent by the server (using the "fields"
+        query parameter), which is a lot cheaper than getting the full document
+        e.g. for jobs with a long log. Servers that do not support this
+        send the full document, which is then cached as the resource properties.
+        Like the full properties, the fields are cached for cache_time seconds.
+
+        Args:
+            fields: list of property names (default: None = all properties)
+        """
+        if fields is None:
+            return self.properties
+        if isinstance(fields, str):
+            fields = [fields]
+        with self._lock:
+            now = datetime.now()
+            if self._is_fresh(self._last_retrieved, now) or self._load_from_shared_cache(now):
+                self.transport.cache_statistics.hit()
+                props = self._last_properties
+            elif self._is_fresh(self._projected_retrieved, now) and all(
+                f in self._projected for f in fields
+            ):
+                self.transport.cache_statistics.hit()
+                props = self._projected
+            else:
+                props = self._fetch_projection(fields, now)
+            return {f: props[f] for f in fields if f in props}
+
+    def _is_fresh(self, retrieved, now) -> bool:
+        return (
+            not self.transport.settings_changed
+            and self.cache_time > 0
+            and now - retrieved <= timedelta(seconds=self.cache_time)
+        )
+
+    def _cache_key(self):
+        return (self.resource_url, self.transport.credential, self.transport.preferences)
+
+    def _load_from_shared_cache(self, now) -> bool:
+        """use the properties from the shared cache, if available and still fresh.
+        Otherwise, only the validators for a conditional request are used."""
+        cache = self.transport.resource_cache
+        entry = cache.get(self._cache_key()) if cache is not None else None
+        if entry is None:
+            return False
+        self._last_properties = entry.properties
+        self._etag = entry.etag
+        self._last_modified = entry.last_modified
+        self._last_size = entry.size
+        if entry.is_fresh(now):
+            self._last_retrieved = entry.retrieved
+            return True
+        return False
+
+    def _store_in_shared_cache(self, now):
+        cache = self.transport.resource_cache
+        if cache is None:
+            return
+        ttl = cache.ttl(type(self).__name__, self.cache_time)
+        props = self._last_properties
+        immutable = isinstance(props, dict) and props.get("status") in self._final_states
+        entry = CacheEntry(
+            props,
+            now,
+            now + timedelta(seconds=ttl),
+            self._last_size,
+            self._etag,
+            self._last_modified,
+            immutable,
+        )
+        cache.put(self._cache_key(), entry)
+
+    def _invalidate(self):
+        """forget the cached properties, e.g. after modifying the resource"""
+        with self._lock:
+            self._last_retrieved = datetime.min
+            self._projected_retrieved = datetime.min
+        if self.transport.resource_cache is not None:
+            self.transport.resource_cache.invalidate(self._cache_key())
+
+    def _conditional_headers(self) -> dict:
+        headers = {}
+        if self._last_properties is not None:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        return headers
+
+    def _fetch_properties(self):
+        """get the properties from the server, using a conditional request if possible"""
+        with closing(
+            self.transport.get(
+                url=self.resource_url, headers=self._conditional_headers(), to_json=False
+            )
+        ) as res:
+            if res.status_code == 304:
+                self.transport.cache_statistics.revalidated()
+                return self._last_properties
+            self.transport.cache_statistics.miss()
+            self._last_size = len(res.content)
+            self._etag = res.headers.get("ETag")
+            self._last_modified = res.headers.get("Last-Modified")
+            return self.transport.codec.loads(res.content)
+
+    def _fetch_projection(self, fields, now):
+        """get the named fields from the server. If the server ignored the
+        projection and sent the full document, it is kept as the properties"""
+        params = {"fields": ",".join(fields)}
+        with closing(
+            self.transport.get(
+                url=self.resource_url,
+                params=params,
+                headers=self._conditional_headers(),
+                to_json=False,
+            )
+        ) as res:
+            if res.status_code == 304:
+                self.transport.cache_statistics.revalidated()
+                props = self._last_properties
+            else:
+                self.transport.cache_statistics.miss()
+                props = self.transport.codec.loads(res.content)
+                if not set(props).difference(fields, ["_links"]):
+                    self._projected = props
+                    self._projected_retrieved = now
+                    return props
+                self._last_properties = props
+                self._last_size = len(res.content)
+                self._etag = res.headers.get("ETag")
+                self._last_modified = res.headers.get("Last-Modified")
             self._last_retrieved = now
-        return self._last_properties
+            self._store_in_shared_cache(now)
+            return props
+
+    @staticmethod
+    def prefetch(resources, max_workers=None, fields=None) -> dict:
+        """concurrently fetch the properties of the given resources, using a
+        bounded thread pool, so that subsequent access to their properties is
+        served from the cache.
+
+        Args:
+            resources: list of Resource objects
+            max_workers: maximum number of concurrent requests (defaults to
+                the connection pool size of the first resource's transport)
+            fields: only fetch the named properties (see get_properties())
+
+        Returns:
+            dictionary of errors, keyed by resource URL
+        """
+        resources = list(resources)
+        if not resources:
+            return {}
+        max_workers = max_workers or resources[0].transport.pool_size
+        _, errors = _run_concurrently(lambda r: r.get_properties(fields), resources, max_workers)
+        return {r.resource_url: e for r, e in errors.items()}
 
     @property
     def links(self):
@@ -256,11 +903,14 @@ class Resource:
 
     def delete(self):
         """delete/destroy this resource"""
+        self._invalidate()
         self.transport.delete(url=self.resource_url).close()
 
     def set_properties(self, props):
         """set/update resource properties"""
-        return self.transport.put(url=self.resource_url, json=props).json()
+        self._invalidate()
+        with closing(self.transport.put(url=self.resource_url, json=props)) as res:
+            return self.transport.codec.loads(res.content)
 
     def __repr__(self):
         return f"Resource: {self.resource_url}"
@@ -291,12 +941,12 @@ class Registry(Resource):
             href = entry["href"]
             service_type = entry["type"]
             if "CoreServices" == service_type:
-                base = re.match(r"(https://\S+/rest/core).*", href).group(1)
-                site_name = re.match(r"https://\S+/(\S+)/rest/core", href).group(1)
+                base = re.match(r"(https?://\S+/rest/core).*", href).group(1)
+                site_name = re.match(r"https?://\S+/(\S+)/rest/core", href).group(1)
                 self.site_urls[site_name] = base
             elif "WorkflowServices" == service_type:
-                base = re.match(r"(https://\S+/rest/workflows).*", href).group(1)
-                site_name = re.match(r"https://\S+/(\S+)/rest/workflows", href).group(1)
+                base = re.match(r"(https?://\S+/rest/workflows).*", href).group(1)
+                site_name = re.match(r"https?://\S+/(\S+)/rest/workflows", href).group(1)
                 self.workflow_services_urls[site_name] = base
 
     def site(self, name):
@@ -323,6 +973,10 @@ class Client(Resource):
     >>> # to start a new job:
     >>> job_description = {...}
     >>> job = site_client.new_job(job_description)
+
+    If 'check_authentication' is True, the authentication is checked when
+    the site properties are first used, i.e. creating a client does not
+    contact the server.
     """
 
     def __init__(
@@ -336,13 +990,17 @@ class Client(Resource):
         if isinstance(self.transport.credential, Anonymous):
             check_authentication = False
         self.check_authentication = check_authentication
+
+    @property
+    def properties(self):
+        props = Resource.properties.fget(self)
         if self.check_authentication:
-            self.assert_authentication()
+            _check_authentication(self, props)
+        return props
 
     def assert_authentication(self):
         '''Asserts that the remote role is not "anonymous"'''
-        if self.access_info()["role"]["selected"] == "anonymous":
-            raise AuthenticationFailedException("Failure to authenticate at %s" % self.resource_url)
+        _check_authentication(self)
 
     def access_info(self):
         """get authentication and authentication information about the current user"""
@@ -389,22 +1047,33 @@ class Client(Resource):
             resources.append(Compute(self.transport, url))
         return resources
 
-    def get_jobs(self, offset=0, num=None, tags=[]):
+    def get_jobs(self, offset=0, num=None, tags=[], prefetch=False, fields=None):
         """return a list of `Job` objects.
         Use the optional 'offset' and 'num' parameters to handle long result lists
         (for long lists, the server might not return all results!).
-        Use the optional tag list to filter the results."""
+        Use the optional tag list to filter the results.
+        If 'prefetch' is True, the properties of all jobs are fetched concurrently.
+        If a list of 'fields' is given, only these properties are prefetched."""
         q_params = _url_params(offset, num, tags)
         urls = self.transport.get(url=self.links["jobs"], params=q_params)["jobs"]
-        return [Job(self.transport, url) for url in urls]
+        jobs = [Job(self.transport, url) for url in urls]
+        if prefetch or fields is not None:
+            Resource.prefetch(jobs, fields=fields)
+        return jobs
 
-    def new_job(self, job_description: dict, inputs=None, autostart: bool = True):
+    def new_job(
+        self, job_description: dict, inputs=None, autostart: bool = True, notification_receiver=None
+    ):
         """Submit and start a job on the site, optionally uploading local input data files
         The input files can be either a simple array of local file names, or a dictionary
         with the destination names as keys and the local file names as values.
+        If a NotificationReceiver (see pyunicore.notifications) is given, its URL is set as
+        the job's "Notification" target and the job is watched by the receiver.
         """
         if inputs is None:
             inputs = []
+        if notification_receiver is not None:
+            job_description["Notification"] = notification_receiver.url
         if len(inputs) > 0 or job_description.get("haveClientStageIn") is True:
             job_description["haveClientStageIn"] = "true"
         with closing(self.transport.post(url=self.links["jobs"], json=job_description)) as resp:
@@ -421,10 +1090,41 @@ class Client(Resource):
                     working_dir.upload(inputs[input_item], destination=input_item)
                 else:
                     working_dir.upload(input_item)
+        if notification_receiver is not None:
+            notification_receiver.watch(job)
         if autostart:
             job.start()
         return job
 
+    def new_jobs(self, job_descriptions, inputs=None, autostart: bool = True, concurrency=None):
+        """Submit (and start) many jobs concurrently, using a bounded thread pool,
+        so that the submission, the upload of input files and the start of
+        different jobs overlap.
+
+        Args:
+            job_descriptions: list of job descriptions
+            inputs: optional list with the input files for each job (see new_job())
+            autostart: whether to start the jobs
+            concurrency: maximum number of jobs submitted concurrently (defaults
+                to, and is limited by, the connection pool size of the transport)
+
+        Returns:
+            the list of Job objects, in the same order as the job descriptions
+            (None for the jobs that could not be submitted), and a dictionary of
+            errors keyed by the index of the failed job descriptions
+        """
+        job_descriptions = list(job_descriptions)
+        if inputs is None:
+            inputs = [None] * len(job_descriptions)
+        elif len(inputs) != len(job_descriptions):
+            raise ValueError("Need one list of inputs per job description")
+        results, errors = _run_concurrently(
+            lambda i: self.new_job(job_descriptions[i], inputs[i], autostart),
+            range(len(job_descriptions)),
+            min(concurrency or self.transport.pool_size, self.transport.pool_size),
+        )
+        return [results.get(i) for i in range(len(job_descriptions))], errors
+
     def execute(self, cmd: str, login_node=None):
         """run a (non-batch) command on the site, executed on a login node
         Args:
@@ -528,6 +1228,8 @@ class JobStatus(Enum):
 class Job(Resource):
     """wrapper around UNICORE job"""
 
+    _final_states = ("SUCCESSFUL", "FAILED")
+
     def __init__(
         self, security: Credential | Transport, job_url: str, cache_time=_DEFAULT_CACHE_TIME
     ):
@@ -542,7 +1244,7 @@ class Job(Resource):
 
     @property
     def status(self):
-        return JobStatus(self.properties["status"])
+        return JobStatus(self.get_properties(["status"])["status"])
 
     def bss_details(self):
         """return a JSON containing the low-level batch system details"""
@@ -550,49 +1252,54 @@ class Job(Resource):
 
     def is_running(self):
         """checks whether this job is still running"""
-        return self.properties["status"] not in ("SUCCESSFUL", "FAILED")
+        return self.get_properties(["status"])["status"] not in ("SUCCESSFUL", "FAILED")
 
     def abort(self):
         """abort this job"""
         url = self.links["action:abort"]
         with self.transport.post(url=url, json={}):
             pass
+        self._invalidate()
 
     def restart(self):
         """restart this job"""
         url = self.links["action:restart"]
         with self.transport.post(url=url, json={}):
             pass
+        self._invalidate()
 
     def start(self):
         """start this job - only required if client had to stage-in local files"""
         url = self.links["action:start"]
         with self.transport.post(url=url, json={}):
             pass
+        self._invalidate()
 
     @property
     def job_id(self):
         """get the UUID of this job"""
         return os.path.basename(self.resource_url)
 
-    def poll(self, state=JobStatus.SUCCESSFUL, timeout=0):
+    def poll(self, state=JobStatus.SUCCESSFUL, timeout=0, polling_strategy=None):
         """wait until this job reaches the given status (default : SUCCESSFUL)
         or a later one (like SUCCESSFUL or FAILED).
         If the optional timeout is reached, a TimeoutError will be raised
         Args:
             state - job state to wait for (default : JobStatus.SUCCESSFUL)
             timeout - timeout in seconds (default: 0 = no timeout)
+            polling_strategy - PollingStrategy (default: the transport's strategy)
         """
         if state == JobStatus.UNDEFINED:
             raise ValueError("Cannot wait for %s" % state)
-        if self.status.ordinal() >= JobStatus.SUCCESSFUL.ordinal():
-            return
-        start_time = int(time.time())
-        while self.status.ordinal() < state.ordinal():
-            wait_time = max(2, self.cache_time + 1)
-            time.sleep(wait_time)
-            if timeout > 0 and int(time.time()) > start_time + timeout:
-                raise TimeoutError("Timeout waiting for job to become %s" % state.value)
+        target = min(state.ordinal(), JobStatus.SUCCESSFUL.ordinal())
+        _poll(
+            self,
+            lambda: self.status,
+            lambda status: status.ordinal() >= target,
+            "Timeout waiting for job to become %s" % state.value,
+            timeout,
+            polling_strategy,
+        )
 
     def __repr__(self):
         return "Job: {} submitted: {} status: {}".format(
@@ -631,19 +1338,17 @@ class Allocation(Job):
             job.start()
         return job
 
-    def wait_until_available(self, timeout=0):
+    def wait_until_available(self, timeout=0, polling_strategy=None):
         """wait until the allocation is available"""
-        self.poll(JobStatus.RUNNING, timeout)
-        start_time = int(time.time())
-        wait_time = max(2, self.cache_time + 1)
-        while True:
-            bss_id = self.properties["batchSystemID"]
-            if bss_id.startswith("INTERACTIVE_"):
-                time.sleep(wait_time)
-                if timeout > 0 and int(time.time()) > start_time + timeout:
-                    raise TimeoutError("Timeout waiting for allocation to become available")
-            else:
-                break
+        self.poll(JobStatus.RUNNING, timeout, polling_strategy)
+        _poll(
+            self,
+            lambda: self.properties["batchSystemID"],
+            lambda bss_id: not bss_id.startswith("INTERACTIVE_"),
+            "Timeout waiting for allocation to become available",
+            timeout,
+            polling_strategy,
+        )
 
     def __repr__(self):
         return "Allocation: {} submitted: {} status: {}".format(
@@ -687,16 +1392,18 @@ class Storage(Resource):
     ):
         super().__init__(security, storage_url, cache_time)
 
-    def _wait_until_ready(self, timeout=-1):
+    def _wait_until_ready(self, timeout=-1, polling_strategy=None):
         """since some storages take some time to initialise, this method allows to wait
         until the storage is READY
         """
-        i = 0
-        while "READY" != self.properties.get("resourceStatus", "n/a"):
-            time.sleep(1)
-            i += 1
-            if timeout > 0 and i > timeout:
-                raise TimeoutError()
+        _poll(
+            self,
+            lambda: self.properties.get("resourceStatus", "n/a"),
+            lambda status: status == "READY",
+            "Timeout waiting for storage to become READY",
+            timeout,
+            polling_strategy,
+        )
 
     def _to_file_url(self, path):
         return (
@@ -705,9 +1412,17 @@ class Storage(Resource):
             + pathlib.Path("/" + path.lstrip("/")).as_posix().rstrip("/")
         )
 
-    def contents(self, path="/"):
-        """get a simple list of files in the given directory"""
-        return self.transport.get(url=self._to_file_url(path))
+    def contents(self, path="/", fields=None):
+        """get a simple list of files in the given directory.
+        If a list of 'fields' is given, only the directory content
+        is requested, and only these fields are returned for each entry."""
+        if fields is None:
+            return self.transport.get(url=self._to_file_url(path))
+        result = self.transport.get(url=self._to_file_url(path), params={"fields": "content"})
+        result["content"] = {
+            p: {f: meta[f] for f in fields if f in meta} for p, meta in result["content"].items()
+        }
+        return result
 
     def stat(self, path):
         """get a reference to a file/directory"""
@@ -722,8 +1437,9 @@ class Storage(Resource):
             ret = PathFile(self, path_url, path)
         return ret
 
-    def listdir(self, base="/") -> dict:
-        """get a list of files and directories in the given base directory"""
+    def listdir(self, base="/", prefetch=False) -> dict:
+        """get a list of files and directories in the given base directory
+        If 'prefetch' is True, the properties of all entries are fetched concurrently."""
         ret = {}
         for path, meta in self.contents(base)["content"].items():
             path_url = self._to_file_url(path)
@@ -732,6 +1448,8 @@ class Storage(Resource):
                 ret[path] = PathDir(self, path_url, path)
             else:
                 ret[path] = PathFile(self, path_url, path)
+        if prefetch:
+            Resource.prefetch(ret.values())
         return ret
 
     def rename(self, source, target):
@@ -792,15 +1510,20 @@ class Storage(Resource):
         with open(file_name, "rb") as fd:
             self.put(source=fd, destination=destination)
 
-    def put(self, source, destination):
+    def put(self, source, destination, compression=None):
         """upload data to the destination file on this storage
 
         Args:
             source (str-like or file-like): this will be uploaded
             destination: target path (parent directory will be created if needed)
+            compression: optional content encoding ("gzip", "zstd") for compressing
+                the data during the upload. The server must support this.
 
         """
         _headers = {"Content-Type": "application/octet-stream"}
+        if compression:
+            _headers["Content-Encoding"] = compression
+            source = compress(source, compression, self.transport.compression_statistics)
         with self.transport.put(
             url=self._to_file_url(destination), headers=_headers, stream=True, data=source
         ) as r:
@@ -964,13 +1687,17 @@ class PathFile(Path):
             )
         ) as resp:
             chunk_size = 10 * 1024
+            size = 0
             if isinstance(file, str):
                 with open(file, "wb") as fd:
                     for chunk in resp.iter_content(chunk_size):
                         fd.write(chunk)
+                        size += len(chunk)
             else:
                 for chunk in resp.iter_content(chunk_size):
                     file.write(chunk)
+                    size += len(chunk)
+            self.transport._record_compression(resp, "download", size)
 
     def raw(self, offset=0, size=-1):
         """access the raw http response for a streaming download.
@@ -979,7 +1706,8 @@ class PathFile(Path):
         NOTE: this is the raw response from the server and might not be
               decoded appropriately!
         """
-        _headers = {"Accept": "application/octet-stream"}
+        # the raw response is not decoded, so it must not be compressed
+        _headers = {"Accept": "application/octet-stream", "Accept-Encoding": "identity"}
         if offset < 0:
             raise ValueError("Offset must be positive")
         if offset > 0 or size > -1:
@@ -1017,16 +1745,18 @@ class TransferStatus(Enum):
 class Transfer(Resource):
     """wrapper around a UNICORE server-to-server transfer"""
 
+    _final_states = ("DONE", "FAILED", "ABORTED")
+
     def __init__(self, security: Credential, tr_url: Transport, cache_time=_DEFAULT_CACHE_TIME):
         super().__init__(security, tr_url, cache_time)
 
     @property
     def status(self):
-        return TransferStatus(self.properties["status"])
+        return TransferStatus(self.get_properties(["status"])["status"])
 
     def is_running(self):
         """checks whether this transfer is still running"""
-        return self.properties["status"] not in (
+        return self.get_properties(["status"])["status"] not in (
             "DONE",
             "FAILED",
         )
@@ -1036,21 +1766,25 @@ class Transfer(Resource):
         url = self.properties["_links"]["action:abort"]["href"]
         with self.transport.post(url=url, json={}):
             pass
+        self._invalidate()
 
-    def poll(self, state=TransferStatus.DONE, timeout=0):
+    def poll(self, state=TransferStatus.DONE, timeout=0, polling_strategy=None):
         """wait until this transfer reaches the given status (default : DONE)
         or a later one (like FAILED or ABORTED).
         If the optional timeout is reached, a TimeoutError will be raised
         Args:
             state - transfer state to wait for (default : TransferStatus.DONE)
             timeout - timeout in seconds (default: 0 = no timeout)
+            polling_strategy - PollingStrategy (default: the transport's strategy)
         """
-        start_time = int(time.time())
-        while self.status.ordinal() < state.ordinal():
-            wait_time = max(2, self.cache_time + 1)
-            time.sleep(wait_time)
-            if timeout > 0 and int(time.time()) > start_time + timeout:
-                raise TimeoutError("Timeout waiting for transfer to become %s" % state.value)
+        _poll(
+            self,
+            lambda: self.status,
+            lambda status: status.ordinal() >= state.ordinal(),
+            "Timeout waiting for transfer to become %s" % state.value,
+            timeout,
+            polling_strategy,
+        )
 
     def __repr__(self):
         return "Transfer: {} running: {}".format(
@@ -1072,6 +1806,9 @@ class WorkflowService(Resource):
     >>> # to start a new workflow:
     >>> wf_description = {...}
     >>> wf = workflow_service.new_workflow(wf_description)
+
+    If 'check_authentication' is True, the authentication is checked when
+    the service properties are first used.
     """
 
     def __init__(
@@ -1083,8 +1820,13 @@ class WorkflowService(Resource):
     ):
         super().__init__(security, workflows_url, cache_time)
         self.check_authentication = check_authentication
+
+    @property
+    def properties(self):
+        props = Resource.properties.fget(self)
         if self.check_authentication:
-            self.assert_authentication()
+            _check_authentication(self, props)
+        return props
 
     def access_info(self):
         """get authentication and authentication information about the current user"""
@@ -1092,8 +1834,7 @@ class WorkflowService(Resource):
 
     def assert_authentication(self):
         '''Asserts that the remote role is not "anonymous"'''
-        if self.access_info()["role"]["selected"] == "anonymous":
-            raise AuthenticationFailedException("Failure to authenticate at %s" % self.resource_url)
+        _check_authentication(self)
 
     def get_workflows(self, offset=0, num=None, tags=[]):
         """get the list of workflows.
@@ -1105,11 +1846,18 @@ class WorkflowService(Resource):
         urls = self.transport.get(url=self.resource_url, params=q_params)["workflows"]
         return [Workflow(self.transport, url) for url in urls]
 
-    def new_workflow(self, wf_description):
-        """submit a workflow"""
+    def new_workflow(self, wf_description, notification_receiver=None):
+        """submit a workflow. If a NotificationReceiver (see pyunicore.notifications)
+        is given, its URL is set as the workflow's "notification" target and the
+        workflow is watched by the receiver."""
+        if notification_receiver is not None:
+            wf_description["notification"] = notification_receiver.url
         with closing(self.transport.post(url=self.resource_url, json=wf_description)) as resp:
             wf_url = resp.headers["Location"]
-        return Workflow(self.transport, wf_url)
+        workflow = Workflow(self.transport, wf_url)
+        if notification_receiver is not None:
+            notification_receiver.watch(workflow)
+        return workflow
 
 
 class WorkflowStatus(Enum):
@@ -1133,6 +1881,8 @@ class WorkflowStatus(Enum):
 class Workflow(Resource):
     """wrapper around a UNICORE workflow"""
 
+    _final_states = ("SUCCESSFUL", "FAILED", "ABORTED")
+
     def __init__(
         self, security: Credential | Transport, wf_url: str, cache_time=_DEFAULT_CACHE_TIME
     ):
@@ -1140,41 +1890,48 @@ class Workflow(Resource):
 
     @property
     def status(self):
-        return WorkflowStatus(self.properties["status"])
+        return WorkflowStatus(self.get_properties(["status"])["status"])
 
     def is_running(self):
         """checks whether this workflow is still running"""
-        return self.properties["status"] not in ("SUCCESSFUL", "ABORTED", "FAILED")
+        status = self.get_properties(["status"])["status"]
+        return status not in ("SUCCESSFUL", "ABORTED", "FAILED")
 
     def is_held(self):
         """checks whether this workflow is in HELD state"""
         return self.is_running() and self.properties["status"] == "HELD"
 
-    def poll(self, state=WorkflowStatus.SUCCESSFUL, timeout=0):
+    def poll(self, state=WorkflowStatus.SUCCESSFUL, timeout=0, polling_strategy=None):
         """wait until this workflow reaches the given status (default : SUCCESSFUL)
         or a later one (like FAILED or ABORTED).
         If the optional timeout is reached, a TimeoutError will be raised
         Args:
-            state - transfer state to wait for (default : TransferStatus.DONE)
+            state - workflow state to wait for (default : WorkflowStatus.SUCCESSFUL)
             timeout - timeout in seconds (default: 0 = no timeout)
+            polling_strategy - PollingStrategy (default: the transport's strategy)
         """
-        start_time = int(time.time())
-        while self.status.ordinal() < state.ordinal():
-            wait_time = max(2, self.cache_time + 1)
-            time.sleep(wait_time)
-            if timeout > 0 and int(time.time()) > start_time + timeout:
-                raise TimeoutError("Timeout waiting for transfer to become %s" % state.value)
+        _poll(
+            self,
+            lambda: self.status,
+            lambda status: status.ordinal() >= state.ordinal(),
+            "Timeout waiting for workflow to become %s" % state.value,
+            timeout,
+            polling_strategy,
+        )
 
     def abort(self):
         """abort this workflow"""
         url = self.properties["_links"]["action:abort"]["href"]
         with self.transport.post(url=url, json={}):
             pass
+        self._invalidate()
 
     def resume(self, params={}):
         """resume this workflow (from "HELD" state), optionally updating parameters"""
         url = self.properties["_links"]["action:continue"]["href"]
-        return self.transport.post(url=url, json=params)
+        res = self.transport.post(url=url, json=params)
+        self._invalidate()
+        return res
 
     def get_files(self):
         """get a dictionary of registered workflow files and their
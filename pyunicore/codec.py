@@ -0,0 +1,95 @@
+"""
+    JSON codecs for encoding request bodies and decoding responses
+
+    By default, the fastest available implementation is used:
+    'orjson' or 'ujson' if installed, otherwise the standard
+    library's json module.
+"""
+
+import json
+
+
+class JSONCodec:
+    """JSON codec based on the standard library's json module"""
+
+    name = "json"
+
+    def loads(self, data: bytes):
+        """decode a JSON document from the given bytes"""
+        return json.loads(data)
+
+    def dumps(self, obj) -> bytes:
+        """encode the given object as a JSON document (UTF-8)"""
+        return json.dumps(obj).encode("UTF-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec based on 'orjson'"""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._orjson = orjson
+
+    def loads(self, data: bytes):
+        return self._orjson.loads(data)
+
+    def dumps(self, obj) -> bytes:
+        try:
+            return self._orjson.dumps(obj)
+        except TypeError:
+            # e.g. non-str dictionary keys, which orjson does not support
+            return super().dumps(obj)
+
+
+class UjsonCodec(JSONCodec):
+    """JSON codec based on 'ujson'"""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._ujson = ujson
+
+    def loads(self, data: bytes):
+        return self._ujson.loads(data)
+
+    def dumps(self, obj) -> bytes:
+        try:
+            return self._ujson.dumps(obj, ensure_ascii=False).encode("UTF-8")
+        except TypeError:
+            return super().dumps(obj)
+
+
+_CODECS = [OrjsonCodec, UjsonCodec, JSONCodec]
+
+_default_codec = None
+
+
+def get_codec(name: str = None) -> JSONCodec:
+    """get the named codec ("orjson", "ujson", "json"), or by default
+    the fastest one that is available
+
+    Raises:
+        ValueError: if the named codec is unknown or not available
+    """
+    global _default_codec
+    if name is None:
+        if _default_codec is None:
+            for codec_class in _CODECS:
+                try:
+                    _default_codec = codec_class()
+                    break
+                except ImportError:
+                    pass
+        return _default_codec
+    for codec_class in _CODECS:
+        if codec_class.name == name:
+            try:
+                return codec_class()
+            except ImportError:
+                raise ValueError(f"JSON codec '{name}' is not available")
+    raise ValueError(f"Unknown JSON codec '{name}'")
@@ -0,0 +1,141 @@
+"""
+    Compression of HTTP message bodies
+
+    Compressed responses are decoded transparently by requests / urllib3,
+    "zstd" is supported if the 'zstandard' package is installed.
+    Uploads can be compressed if the server supports it.
+
+    >>> transport = Transport(credential, compression=["zstd", "gzip"])
+    >>> ...
+    >>> print(transport.compression_statistics.statistics())
+"""
+
+import threading
+import zlib
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def _zstd_available() -> bool:
+    # urllib3 (2.x) decodes zstd responses if the 'zstandard' package is installed
+    try:
+        from urllib3.util.request import ACCEPT_ENCODING
+    except ImportError:
+        return False
+    return "zstd" in ACCEPT_ENCODING
+
+
+def available_encodings() -> list:
+    """get the content encodings that can be used, in order of preference"""
+    encodings = ["gzip"]
+    if _zstd_available():
+        encodings.insert(0, "zstd")
+    return encodings
+
+
+def accept_encoding(encodings) -> str:
+    """get the value for the "Accept-Encoding" header
+
+    Args:
+        encodings: an encoding name ("gzip", "zstd") or a list of names.
+            Use "identity" to request uncompressed responses
+
+    Raises:
+        ValueError: if an encoding is unknown or not available
+    """
+    if isinstance(encodings, str):
+        encodings = [encodings]
+    available = available_encodings() + ["identity"]
+    for encoding in encodings:
+        if encoding not in available:
+            raise ValueError(f"Content encoding '{encoding}' is not available")
+    return ", ".join(encodings)
+
+
+def _compressor(encoding):
+    if encoding == "gzip":
+        return zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+    if encoding == "zstd":
+        try:
+            import zstandard
+
+            return zstandard.ZstdCompressor().compressobj()
+        except ImportError:
+            pass
+    raise ValueError(f"Content encoding '{encoding}' is not available")
+
+
+def _chunks(source):
+    if isinstance(source, str):
+        source = source.encode("UTF-8")
+    if isinstance(source, (bytes, bytearray)):
+        view = memoryview(source)
+        while view:
+            yield bytes(view[:_CHUNK_SIZE])
+            view = view[_CHUNK_SIZE:]
+        return
+    while True:
+        chunk = source.read(_CHUNK_SIZE)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            chunk = chunk.encode("UTF-8")
+        yield chunk
+
+
+def compress(source, encoding, statistics=None):
+    """generator yielding the compressed data from the source (str-like or
+    file-like). When done, the sizes are recorded in the (optional) statistics"""
+    compressor = _compressor(encoding)
+    encoded = decoded = 0
+    for chunk in _chunks(source):
+        decoded += len(chunk)
+        data = compressor.compress(chunk)
+        if data:
+            encoded += len(data)
+            yield data
+    data = compressor.flush()
+    encoded += len(data)
+    yield data
+    if statistics is not None:
+        statistics.record("upload", encoded, decoded)
+
+
+class CompressionStatistics:
+    """Counts transferred (encoded) and decoded bytes of compressed
+    transfers, per direction ("response", "download", "upload")"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, direction, encoded_bytes, decoded_bytes) -> float:
+        """record a compressed transfer, returns its compression ratio"""
+        with self._lock:
+            stats = self._stats.setdefault(
+                direction, {"transfers": 0, "encoded_bytes": 0, "decoded_bytes": 0}
+            )
+            stats["transfers"] += 1
+            stats["encoded_bytes"] += encoded_bytes
+            stats["decoded_bytes"] += decoded_bytes
+        return _ratio(encoded_bytes, decoded_bytes)
+
+    def ratio(self, direction) -> float:
+        """overall compression ratio (decoded size / transferred size)"""
+        with self._lock:
+            stats = self._stats.get(direction)
+            if stats is None:
+                return 1.0
+            return _ratio(stats["encoded_bytes"], stats["decoded_bytes"])
+
+    def statistics(self) -> dict:
+        with self._lock:
+            result = {}
+            for direction, stats in self._stats.items():
+                result[direction] = dict(stats)
+                result[direction]["ratio"] = _ratio(stats["encoded_bytes"], stats["decoded_bytes"])
+            return result
+
+
+def _ratio(encoded_bytes, decoded_bytes) -> float:
+    return decoded_bytes / encoded_bytes if encoded_bytes else 1.0
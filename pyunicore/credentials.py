@@ -10,6 +10,8 @@ except ImportError:
     pass
 
 import datetime
+import threading
+import time
 from abc import ABCMeta
 from abc import abstractmethod
 from base64 import b64encode
@@ -17,7 +19,7 @@ from os import getenv
 from os.path import isabs
 
 import requests
-from jwt import ExpiredSignatureError
+from jwt import DecodeError
 from jwt import decode as jwt_decode
 from jwt import encode as jwt_encode
 
@@ -78,36 +80,53 @@ class OIDCToken(Credential):
 
 
 class RefreshHandler:
-    """helper to refresh an OAuth token"""
+    """helper to refresh an OAuth token
+
+    The token's expiry time is decoded once and cached. When a token is
+    requested less than 'refresh_margin' seconds before expiry, a refresh is
+    started in the background while the still-valid token is returned.
+    Only an already expired token requires callers to wait for the refresh.
+    Concurrent callers share a single in-flight refresh. After a failed
+    background refresh, the next one is only started after a backoff time
+    (growing exponentially up to 'max_refresh_backoff' seconds).
+    """
+
+    max_refresh_backoff = 30
 
-    def __init__(self, refresh_config, token=None):
+    def __init__(self, refresh_config, token=None, refresh_margin=60):
         """
         token: initial access token (can be None)
         refresh_config: a dict containing url, client_id, client_secret, refresh_token
+        refresh_margin: time in seconds before expiry when the token will be refreshed
         """
         self.refresh_config = refresh_config
-        self.token = token
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._refresh_error = None
+        self._refresh_failures = 0
+        self._retry_after = 0
+        self._set_token(token)
         if not token:
             self.refresh()
 
+    def _set_token(self, token):
+        """store the token and its expiry time (None if the token does not expire)"""
+        expires = None
+        if token:
+            try:
+                expires = jwt_decode(token, options={"verify_signature": False}).get("exp")
+            except DecodeError:
+                pass
+        self.token = token
+        self._expires = expires
+
     def is_valid_token(self):
         """
         check if the given token is still valid
         TODO check whether token was revoked
         """
-        try:
-            jwt_decode(
-                self.token,
-                options={
-                    "verify_signature": False,
-                    "verify_nbf": False,
-                    "verify_exp": True,
-                    "verify_aud": False,
-                },
-            )
-            return True
-        except ExpiredSignatureError:
-            return False
+        return self._expires is None or time.time() < self._expires
 
     def refresh(self):
         """refresh the token"""
@@ -121,13 +140,41 @@ class RefreshHandler:
 
         res = requests.post(url, headers={"Accept": "application/json"}, data=params)
         res.raise_for_status()
-        self.token = res.json()["access_token"]
+        self._set_token(res.json()["access_token"])
         return self.token
 
+    def _run_refresh(self):
+        try:
+            self.refresh()
+            self._refresh_error = None
+            self._refresh_failures = 0
+        except (requests.RequestException, KeyError, ValueError) as e:
+            self._refresh_error = e
+            self._refresh_failures += 1
+            backoff = min(self.max_refresh_backoff, 2 ** (self._refresh_failures - 1))
+            self._retry_after = time.time() + backoff
+        finally:
+            with self._lock:
+                self._refresh_thread = None
+
+    def _start_refresh(self):
+        """start a background refresh, unless one is already running"""
+        with self._lock:
+            if self._refresh_thread is None:
+                self._refresh_thread = threading.Thread(target=self._run_refresh, daemon=True)
+                self._refresh_thread.start()
+            return self._refresh_thread
+
     def get_token(self):
         """get a valid access token. If necessary, refresh it."""
-        if not self.is_valid_token():
-            self.refresh()
+        if self._expires is not None:
+            remaining = self._expires - time.time()
+            if remaining <= 0:
+                self._start_refresh().join()
+                if not self.is_valid_token() and self._refresh_error is not None:
+                    raise self._refresh_error
+            elif remaining < self.refresh_margin and time.time() >= self._retry_after:
+                self._start_refresh()
         return self.token
 
 
@@ -160,6 +207,10 @@ class JWTToken(Credential):
     Produces a signed JWT token ("Bearer <auth_token>")
     uses pyjwt
 
+    The signed token is cached and re-used until it is about to expire,
+    i.e. a new token is only created 'renewal_margin' seconds before the
+    end of its lifetime.
+
     Args:
         subject - the subject user name or user X.500 DN
         issuer - the issuer of the token
@@ -169,6 +220,7 @@ class JWTToken(Credential):
         lifetime - token validity time in seconds
         etd - for delegation tokens (servers / services authenticating users), this must be 'True'.
               For end users authenticating, set to 'False'
+        renewal_margin - time in seconds before expiry when a new token will be created
     """
 
     def __init__(
@@ -179,6 +231,7 @@ class JWTToken(Credential):
         algorithm="RS256",
         lifetime=300,
         etd=False,
+        renewal_margin=30,
     ):
         self.subject = subject
         self.issuer = issuer if issuer else subject
@@ -186,6 +239,9 @@ class JWTToken(Credential):
         self.algorithm = algorithm
         self.secret = secret
         self.etd = etd
+        self.renewal_margin = renewal_margin
+        self._cached = (None, 0)
+        self._lock = threading.Lock()
 
     def create_token(self):
         now = datetime.datetime.now(tz=datetime.timezone.utc)
@@ -198,8 +254,20 @@ class JWTToken(Credential):
         }
         return jwt_encode(payload, self.secret, algorithm=self.algorithm)
 
+    def get_token(self):
+        """get a signed token, re-using the cached one if it is not about to expire"""
+        token, renew_at = self._cached
+        if token is None or time.time() >= renew_at:
+            with self._lock:
+                token, renew_at = self._cached
+                if token is None or time.time() >= renew_at:
+                    renew_at = time.time() + self.lifetime - self.renewal_margin
+                    token = self.create_token()
+                    self._cached = (token, renew_at)
+        return token
+
     def get_auth_header(self):
-        return "Bearer " + self.create_token()
+        return "Bearer " + self.get_token()
 
 
 def create_credential(username=None, password=None, token=None, identity=None):
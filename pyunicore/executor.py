@@ -0,0 +1,170 @@
+"""
+    A concurrent.futures.Executor running UNICORE jobs
+
+    Jobs are submitted (including the upload of their input files) by a small
+    pool of worker threads, and the status of all submitted jobs is tracked by
+    a single JobWatcher. At most 'max_in_flight' jobs are submitted and not yet
+    finished at any time, further jobs are queued in the client.
+
+    >>> with UNICOREExecutor(client, max_in_flight=50) as executor:
+    ...     future = executor.submit({"Executable": "date"})
+    ...     print(future.result().status)
+    ...     for job in executor.map(lambda n: {"Executable": f"echo {n}"}, range(1000)):
+    ...         print(job.job_id, job.status)
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait as wait_for
+
+from pyunicore.watcher import JobWatcher
+
+
+class UNICOREExecutor(Executor):
+    """Runs jobs on a UNICORE site (or in an allocation), using the
+    concurrent.futures.Executor interface. The Futures are resolved with
+    the finished Job (which may be SUCCESSFUL or FAILED).
+
+    Args:
+        target: the pyunicore.client.Client or Allocation to submit jobs to
+        max_in_flight: maximum number of jobs submitted and not yet finished
+        max_workers: maximum number of concurrent job submissions (and uploads)
+        poll_interval: time in seconds between two status checks of a job
+    """
+
+    def __init__(self, target, max_in_flight=100, max_workers=4, poll_interval=5.0):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.target = target
+        self.max_in_flight = max_in_flight
+        self._watcher = JobWatcher(
+            max_requests=max_in_flight, interval=poll_interval, max_workers=max_workers
+        )
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._queue = deque()
+        self._in_flight = 0
+        self._futures = set()
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._watcher.start()
+
+    def submit(self, job_description, inputs=None) -> Future:
+        """submit a job (with optional input files, see Client.new_job()).
+        Returns a Future, which is resolved with the Job when it is finished"""
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Cannot submit jobs after shutdown")
+            self._queue.append((future, dict(job_description), inputs))
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        self._dispatch()
+        return future
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1):
+        """run a job for each (set of) parameter(s): 'fn' is called with the
+        parameters, and must return the job description. Returns an iterator
+        over the finished jobs, in the same order as the parameters"""
+        end_time = time.monotonic() + timeout if timeout is not None else None
+        futures = [self.submit(fn(*args)) for args in zip(*iterables)]
+
+        def results():
+            try:
+                futures.reverse()
+                while futures:
+                    if end_time is None:
+                        yield futures.pop().result()
+                    else:
+                        yield futures.pop().result(end_time - time.monotonic())
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        return results()
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        """stop accepting new jobs. If 'cancel_futures' is true, queued jobs which
+        have not yet been submitted are cancelled. If 'wait' is true, this waits
+        until all submitted jobs are finished"""
+        with self._lock:
+            self._shutdown = True
+            cancelled = []
+            if cancel_futures:
+                while self._queue:
+                    cancelled.append(self._queue.popleft()[0])
+            futures = list(self._futures)
+        for future in cancelled:
+            future.cancel()
+            future.set_running_or_notify_cancel()
+        if wait:
+            wait_for(futures)
+            self._close()
+        else:
+            threading.Thread(target=self._close_when_done, args=(futures,), daemon=True).start()
+
+    def _close_when_done(self, futures):
+        wait_for(futures)
+        self._close()
+
+    def _close(self):
+        self._pool.shutdown()
+        self._watcher.stop()
+
+    def _forget(self, future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def _dispatch(self):
+        """submit queued jobs, as long as less than 'max_in_flight' are running"""
+        while True:
+            with self._lock:
+                if not self._queue or self._in_flight >= self.max_in_flight:
+                    return
+                future, job_description, inputs = self._queue.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                self._in_flight += 1
+            self._pool.submit(self._submit_job, future, job_description, inputs)
+
+    def _submit_job(self, future, job_description, inputs):
+        try:
+            job = self.target.new_job(job_description, inputs or [])
+        # any error is passed to the caller via the Future
+        except Exception as e:  # noqa: B902
+            future.set_exception(e)
+            self._release()
+            return
+        self._watcher.add(job).add_done_callback(lambda f: self._finished(future, f))
+
+    def _finished(self, future, watched):
+        try:
+            future.set_result(watched.result())
+        # any error (or the cancellation) of the watched job is passed on
+        except Exception as e:  # noqa: B902
+            future.set_exception(e)
+        self._release()
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+        self._dispatch()
+
+    @property
+    def in_flight(self) -> int:
+        """the number of jobs which are submitted and not yet finished"""
+        with self._lock:
+            return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """the number of jobs waiting to be submitted"""
+        with self._lock:
+            return len(self._queue)
+
+    def counts(self) -> dict:
+        """the number of submitted jobs per JobStatus"""
+        return self._watcher.counts()
@@ -0,0 +1,208 @@
+"""
+    HTTP/2 support for the Transport
+
+    Requests to "https://" URLs are sent via 'httpx', which uses HTTP/2
+    if the server supports it (negotiated via TLS ALPN) and HTTP/1.1 otherwise.
+    With HTTP/2, concurrent requests to the same server are multiplexed
+    over a single connection.
+
+    It requires the 'httpx' and 'h2' libraries, install them with
+
+        pip install pyunicore[http2]
+
+    >>> transport = Transport(credential, http2=True)
+"""
+
+import threading
+from importlib.util import find_spec
+from urllib.parse import urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.exceptions import NewConnectionError
+
+_CHUNK_SIZE = 64 * 1024
+
+# connection-specific headers which are not allowed with HTTP/2
+_HOP_BY_HOP_HEADERS = ("connection", "keep-alive", "transfer-encoding", "upgrade")
+
+
+def is_available() -> bool:
+    """check whether the libraries required for HTTP/2 are installed"""
+    # importing httpx is slow, so it is only done when HTTP/2 is used
+    return find_spec("httpx") is not None and find_spec("h2") is not None
+
+
+def _timeout(timeout):
+    """convert a requests-style timeout (number or (connect, read) tuple)"""
+    import httpx
+
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+def _content(body):
+    if body is None or isinstance(body, (bytes, str)):
+        return body
+    if hasattr(body, "read"):
+        return iter(lambda: body.read(_CHUNK_SIZE), b"")
+    return body
+
+
+class HTTP2Adapter(requests.adapters.BaseAdapter):
+    """requests transport adapter sending requests via an HTTP/2 capable
+    httpx.Client, so it can be mounted on a requests.Session
+
+    Args:
+        pool_size: maximum number of connections per host
+    """
+
+    def __init__(self, pool_size=10):
+        if not is_available():
+            raise ImportError("HTTP/2 requires the 'httpx' and 'h2' libraries")
+        super().__init__()
+        self.pool_size = pool_size
+        self._clients = {}
+        self._headers_locks = {}
+        self._http1_origins = set()
+        self._lock = threading.Lock()
+
+    def _client(self, verify, cert, origin):
+        """returns the httpx.Client and the lock for sending request headers to
+        the origin (None if the origin is known to use HTTP/1.1)"""
+        import httpx
+
+        key = (verify, cert)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                limits = httpx.Limits(
+                    max_connections=self.pool_size, max_keepalive_connections=self.pool_size
+                )
+                client = httpx.Client(http2=True, verify=verify, cert=cert, limits=limits)
+                self._clients[key] = client
+            if (key, origin) in self._http1_origins:
+                return client, None
+            headers_lock = self._headers_locks.setdefault((key, origin), threading.Lock())
+            return client, headers_lock
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        import httpx
+
+        url = urlparse(request.url)
+        origin = (url.scheme, url.netloc)
+        client, headers_lock = self._client(verify, cert, origin)
+        headers = [
+            (k, v) for k, v in request.headers.items() if k.lower() not in _HOP_BY_HOP_HEADERS
+        ]
+        # httpcore allocates the HTTP/2 stream ID and sends the request headers
+        # in two steps, so concurrent requests may send their headers out of
+        # order, which servers treat as a protocol error. Sending the headers is
+        # serialized per origin, the request bodies and responses are still
+        # multiplexed. All HTTP/2 requests to an origin share a single connection,
+        # so holding the lock while it is set up does not delay other requests.
+        # Origins using HTTP/1.1 have no stream IDs, and do not need the lock
+        headers_sent = threading.Event()
+
+        def release():
+            if headers_lock is not None and not headers_sent.is_set():
+                headers_sent.set()
+                headers_lock.release()
+
+        def trace(event, info):
+            if event == "http11.send_request_headers.started":
+                with self._lock:
+                    self._http1_origins.add(((verify, cert), origin))
+                release()
+            elif event.endswith("send_request_headers.complete"):
+                release()
+
+        if headers_lock is not None:
+            headers_lock.acquire()
+        try:
+            req = client.build_request(
+                request.method,
+                request.url,
+                headers=headers,
+                content=_content(request.body),
+                timeout=_timeout(timeout),
+                extensions={"trace": trace},
+            )
+            res = client.send(req, stream=True)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.ConnectError as e:
+            # same as urllib3, so that the request is known to be not sent
+            error = NewConnectionError(None, str(e))
+            raise requests.exceptions.ConnectionError(error, request=request) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        finally:
+            release()
+        response = requests.Response()
+        response.status_code = res.status_code
+        response.headers = CaseInsensitiveDict(res.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.reason = res.reason_phrase
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.raw = _RawResponse(res, request)
+        return response
+
+    def close(self):
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+class _RawResponse:
+    """file-like access to the (decoded) body of an httpx response,
+    as expected by requests.Response"""
+
+    def __init__(self, res, request):
+        self._res = res
+        self._request = request
+        self._chunks = None
+        self._buffer = b""
+        self.http_version = res.http_version
+
+    def stream(self, amt=_CHUNK_SIZE, decode_content=True):
+        import httpx
+
+        try:
+            yield from self._res.iter_bytes(amt)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=self._request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=self._request)
+
+    def read(self, amt=None, decode_content=True):
+        if self._chunks is None:
+            self._chunks = self.stream()
+        while amt is None or len(self._buffer) < amt:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if amt is None:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:amt], self._buffer[amt:]
+        return data
+
+    def tell(self):
+        """the number of (possibly compressed) bytes received so far"""
+        return self._res.num_bytes_downloaded
+
+    def close(self):
+        self._res.close()
+
+    def release_conn(self):
+        self._res.close()
@@ -0,0 +1,55 @@
+"""
+    A small HTTP server running in a background thread
+
+    It is used for receiving notifications, and as a local server in tests.
+
+    >>> server = BackgroundHTTPServer(("127.0.0.1", 0), Handler).start()
+    >>> print(server.base_url)
+    >>> server.stop()
+"""
+
+import threading
+from http.server import ThreadingHTTPServer
+
+
+class BackgroundHTTPServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer which serves requests in a background thread
+    and can be stopped quickly"""
+
+    daemon_threads = True
+    # many clients may connect at the same time, the default (5) leads to
+    # dropped connection attempts, which are only retried after a second
+    request_queue_size = 128
+    # the time in seconds it takes serve_forever() to notice a shutdown
+    poll_interval = 0.05
+
+    def __init__(self, server_address, handler_class, bind_and_activate=True):
+        super().__init__(server_address, handler_class, bind_and_activate)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """start serving requests in a background thread"""
+        self._thread = threading.Thread(
+            target=self.serve_forever, args=(self.poll_interval,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """stop serving requests and close the server socket"""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
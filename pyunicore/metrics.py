@@ -0,0 +1,187 @@
+"""
+    Request instrumentation and in-memory metrics
+
+    A Transport emits a RequestEvent for every HTTP request to all
+    registered observers (callables taking the event as argument).
+    The MetricsRegistry is an observer that collects counters and
+    latency histograms per endpoint.
+
+    >>> metrics = MetricsRegistry()
+    >>> transport = Transport(credential, observers=[metrics])
+    >>> ...
+    >>> print(metrics.to_prometheus())
+"""
+
+import dataclasses
+import re
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+
+_DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_ID_RE = re.compile(
+    r"^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)$"
+)
+
+
+def url_template(url: str) -> str:
+    """get the endpoint of a URL, with IDs and file paths replaced by placeholders,
+    e.g. "/SITE/rest/core/jobs/{id}" or "/SITE/rest/core/storages/{id}/files/{path}"
+    """
+    path = urlparse(url).path
+    if "/files/" in path:
+        path = path.split("/files/", 1)[0] + "/files/{path}"
+    segments = path.split("/")
+    for i, segment in enumerate(segments):
+        if _ID_RE.match(segment):
+            segments[i] = "{id}"
+        elif i > 0 and segments[i - 1] in ("storages", "transfers", "factories", "workflows"):
+            if segment not in ("", "files", "{path}"):
+                segments[i] = "{id}"
+    return "/".join(segments)
+
+
+@dataclasses.dataclass
+class RequestEvent:
+    """Information about a single (logical) HTTP request, including its retries
+
+    Args:
+        method: HTTP method
+        url: the full URL
+        url_template: the URL path with IDs replaced by placeholders (see url_template())
+        status: HTTP status code of the (last) response, None if no response was received
+        bytes_in: size of the response body in bytes (if known)
+        bytes_out: size of the request body in bytes (if known)
+        latency: time in seconds from sending the request until the response was received
+        retries: number of retries
+        session_reused: True if an existing security session was used successfully
+        error: exception raised by the request, if any
+    """
+
+    method: str
+    url: str
+    url_template: str
+    status: Optional[int]
+    bytes_in: int
+    bytes_out: int
+    latency: float
+    retries: int
+    session_reused: bool
+    error: Optional[Exception] = None
+
+
+class Histogram:
+    """Cumulative histogram with fixed bucket boundaries"""
+
+    def __init__(self, buckets=_DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_dict(self) -> dict:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+
+class MetricsRegistry:
+    """In-memory registry of counters and histograms, labeled by
+    HTTP method and endpoint (URL template).
+
+    It can be used as a Transport observer, and can also record
+    additional values (via increment() and observe())
+    """
+
+    def __init__(self, buckets=_DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name, labels=(), value=1):
+        """increment the named counter"""
+        key = (name, tuple(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        """record a value in the named histogram"""
+        key = (name, tuple(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = Histogram(self.buckets)
+                self._histograms[key] = histogram
+            histogram.observe(value)
+
+    def get(self, name, labels=()):
+        """get the value of the named counter"""
+        return self._counters.get((name, tuple(labels)), 0)
+
+    def __call__(self, event: RequestEvent):
+        labels = (("method", event.method), ("endpoint", event.url_template))
+        status = str(event.status) if event.status is not None else "error"
+        self.increment("requests_total", labels + (("status", status),))
+        self.increment("bytes_in_total", labels, event.bytes_in)
+        self.increment("bytes_out_total", labels, event.bytes_out)
+        if event.retries:
+            self.increment("retries_total", labels, event.retries)
+        if event.session_reused:
+            self.increment("session_reused_total", labels)
+        if event.error is not None:
+            self.increment("errors_total", labels)
+        self.observe("request_latency_seconds", event.latency, labels)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def dump(self) -> dict:
+        """get all counters and histograms as a dictionary"""
+        with self._lock:
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in self._counters.items()
+            ]
+            histograms = [
+                {"name": name, "labels": dict(labels), **histogram.to_dict()}
+                for (name, labels), histogram in self._histograms.items()
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+    def to_prometheus(self, prefix="pyunicore_") -> str:
+        """get all metrics in the Prometheus text exposition format"""
+        lines = []
+        dump = self.dump()
+        for c in sorted(dump["counters"], key=lambda c: c["name"]):
+            lines.append(f"{prefix}{c['name']}{_labels(c['labels'])} {c['value']}")
+        for h in sorted(dump["histograms"], key=lambda h: h["name"]):
+            name = prefix + h["name"]
+            for bound, count in h["buckets"].items():
+                lines.append(f"{name}_bucket{_labels(h['labels'], le=bound)} {count}")
+            lines.append(f"{name}_sum{_labels(h['labels'])} {h['sum']}")
+            lines.append(f"{name}_count{_labels(h['labels'])} {h['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels: dict, **extra) -> str:
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    return "{" + ",".join('{}="{}"'.format(k, v) for k, v in labels.items()) + "}"
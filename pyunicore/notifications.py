@@ -0,0 +1,226 @@
+"""
+    Push-based notifications about job and workflow status changes
+
+    UNICORE can POST a message to a URL (given in the "Notification" field of
+    a job description, or the "notification" field of a workflow description)
+    whenever the status of a job or workflow changes. The NotificationReceiver
+    is a small embedded HTTP server receiving these messages, and resolving a
+    Future per job or workflow as soon as it is done. If no notification arrives
+    for a while (e.g. because the receiver is not reachable from the server),
+    the status is checked by (slow) polling instead.
+
+    >>> with NotificationReceiver(public_url="https://my-host:8765/") as receiver:
+    ...     job = client.new_job(job_description, notification_receiver=receiver)
+    ...     receiver.wait(job)
+    ...     print(job.status)
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler
+
+import requests
+
+from pyunicore.client import _run_concurrently
+from pyunicore.httpserver import BackgroundHTTPServer
+
+# states after which no more notifications are expected
+FINAL_STATES = ("SUCCESSFUL", "FAILED", "ABORTED", "DONE")
+
+# maximum number of notifications kept for resources that are not (yet) watched
+_MAX_EARLY_NOTIFICATIONS = 1000
+
+
+class NotificationReceiver:
+    """Embedded HTTP server receiving status notifications from UNICORE
+
+    Args:
+        host: the host (interface) to listen on
+        port: the port to listen on (0 selects a free port)
+        public_url: the URL the UNICORE server uses to reach the receiver,
+            if it differs from "http://host:port/" (e.g. behind a proxy)
+        fallback_interval: time in seconds without notification, after which
+            the status of a watched job or workflow is checked by polling
+        verify: if true, a notification about a final state is confirmed by
+            fetching the status from the server once, so that forged
+            notifications cannot resolve a Future
+        max_workers: maximum number of concurrent requests for the fallback polling
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        public_url=None,
+        fallback_interval=60.0,
+        verify=True,
+        max_workers=4,
+    ):
+        self.fallback_interval = fallback_interval
+        self.verify = verify
+        self.max_workers = max_workers
+        self._httpd = BackgroundHTTPServer((host, port), _Handler)
+        self._httpd.receiver = self
+        self._public_url = public_url
+        self._watched = {}
+        self._early = {}
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._poller = None
+        self._stats = {"notifications": 0, "notified": 0, "polled": 0, "polls": 0}
+
+    @property
+    def url(self):
+        """the notification URL to put into job or workflow descriptions"""
+        if self._public_url:
+            return self._public_url
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        """start receiving notifications (and polling) in background threads"""
+        self._stopped.clear()
+        self._httpd.start()
+        self._poller = threading.Thread(target=self._poll_silent, daemon=True)
+        self._poller.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._poller is not None:
+            self._poller.join()
+            self._poller = None
+        self._httpd.stop()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def add_callback(self, callback):
+        """add a callback, which will be invoked with (resource_url, status, message)
+        for each received notification. Exceptions raised by callbacks are ignored"""
+        self._callbacks.append(callback)
+
+    def watch(self, resource) -> Future:
+        """start waiting for the job or workflow to be done. Returns a Future,
+        which is resolved with the resource when it has reached a final state.
+        Watching a resource again while it is not done returns the same Future."""
+        url = resource.resource_url
+        with self._lock:
+            entry = self._watched.get(url)
+            if entry is not None:
+                return entry["future"]
+            entry = {"resource": resource, "future": Future(), "last_seen": time.time()}
+            self._watched[url] = entry
+            early = self._early.pop(url, None)
+        if early is not None:
+            self._handle(url, *early)
+        return entry["future"]
+
+    def wait(self, resource, timeout=None):
+        """wait until the job or workflow is done, and return it.
+        If the optional timeout is reached, a TimeoutError will be raised"""
+        return self.watch(resource).result(timeout)
+
+    def statistics(self) -> dict:
+        """get the number of received notifications, the number of jobs and
+        workflows resolved by notification or by polling, and the number of polls"""
+        with self._lock:
+            return dict(self._stats)
+
+    def _receive(self, message: dict):
+        url = message["href"]
+        status = message["status"]
+        status_message = message.get("statusMessage", "")
+        with self._lock:
+            self._stats["notifications"] += 1
+            if url not in self._watched:
+                # the job may not have been watched yet, e.g. if it is very short
+                if len(self._early) >= _MAX_EARLY_NOTIFICATIONS:
+                    self._early.pop(next(iter(self._early)))
+                self._early[url] = (status, status_message)
+        for callback in self._callbacks:
+            try:
+                callback(url, status, status_message)
+            # exceptions raised by callbacks are ignored (see add_callback())
+            except Exception:  # noqa: B902
+                pass
+        self._handle(url, status, status_message)
+
+    def _handle(self, url, status, status_message):
+        with self._lock:
+            entry = self._watched.get(url)
+            if entry is None:
+                return
+            entry["last_seen"] = time.time()
+        if status not in FINAL_STATES:
+            return
+        resource = entry["resource"]
+        resource._invalidate()
+        try:
+            if self.verify and resource.is_running():
+                return
+        except (requests.RequestException, KeyError, ValueError):
+            # leave it to the fallback polling
+            return
+        self._resolve(url, "notified")
+
+    def _resolve(self, url, how):
+        with self._lock:
+            entry = self._watched.pop(url, None)
+            if entry is None:
+                return
+            self._stats[how] += 1
+        if not entry["future"].done():
+            entry["future"].set_result(entry["resource"])
+
+    def _poll_silent(self):
+        """check the status of watched jobs and workflows without recent notifications"""
+        while not self._stopped.wait(self._next_poll()):
+            now = time.time()
+            with self._lock:
+                silent = []
+                for entry in self._watched.values():
+                    if now - entry["last_seen"] >= self.fallback_interval:
+                        entry["last_seen"] = now
+                        silent.append(entry["resource"])
+                self._stats["polls"] += len(silent)
+
+            def is_done(resource):
+                resource._invalidate()
+                return not resource.is_running()
+
+            results, _ = _run_concurrently(is_done, silent, self.max_workers)
+            for resource, done in results.items():
+                if done:
+                    self._resolve(resource.resource_url, "polled")
+
+    def _next_poll(self):
+        """the time in seconds until the next watched resource is due for polling"""
+        with self._lock:
+            last_seen = min((e["last_seen"] for e in self._watched.values()), default=time.time())
+        return max(0.0, last_seen + self.fallback_interval - time.time())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):  # noqa: N802
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            message = json.loads(body)
+            if "href" not in message or "status" not in message:
+                raise ValueError("Not a status notification")
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+        self.server.receiver._receive(message)
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
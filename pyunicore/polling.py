@@ -0,0 +1,119 @@
+"""
+    Polling strategies for waiting on jobs, transfers, workflows etc.
+
+    The interval between two status checks starts small and grows
+    exponentially (up to a maximum) while the status does not change,
+    so that short jobs finish quickly, while long-queued jobs do not put
+    unnecessary load on the server. The intervals can be set per state,
+    e.g. to poll frequently while a job is staging out its results.
+
+    A PollingStrategy can be passed to a pyunicore.client.Transport, and
+    will then be shared by all its clones. It can also be passed to the
+    individual poll() methods.
+
+    >>> strategy = PollingStrategy(initial=1, factor=2, max_interval=60)
+    >>> transport = Transport(credential, polling_strategy=strategy)
+    >>> ...
+    >>> job.poll()
+    >>> print(strategy.statistics())
+"""
+
+import random
+import threading
+
+# (initial, maximum) interval in seconds for some states
+DEFAULT_STATE_INTERVALS = {
+    "STAGINGIN": (0.5, 5),
+    "STAGINGOUT": (0.5, 5),
+    "QUEUED": (2, 300),
+}
+
+
+class PollingStrategy:
+    """Decides how long to wait between two status checks.
+
+    While the state does not change, the interval grows by 'factor' with every
+    check, up to 'max_interval'. When the state changes, it is reset to the
+    initial interval (of the new state).
+
+    Args:
+        initial: the initial interval in seconds
+        factor: the growth factor of the interval
+        max_interval: the maximum interval in seconds
+        jitter: random fraction (0..1) added to or subtracted from each interval,
+            so that many clients do not poll the server at the same time
+        state_intervals: dictionary of (initial, maximum) intervals per state,
+            overriding the general settings (default: DEFAULT_STATE_INTERVALS)
+    """
+
+    def __init__(self, initial=1.0, factor=1.5, max_interval=60, jitter=0.1, state_intervals=None):
+        if initial <= 0 or factor < 1 or max_interval < initial:
+            raise ValueError("Invalid polling intervals")
+        if not 0 <= jitter < 1:
+            raise ValueError("Jitter must be in the range [0, 1)")
+        self.initial = initial
+        self.factor = factor
+        self.max_interval = max_interval
+        self.jitter = jitter
+        self.state_intervals = (
+            state_intervals if state_intervals is not None else DEFAULT_STATE_INTERVALS
+        )
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def interval(self, state, polls: int) -> float:
+        """the interval (without jitter) before the next check, if 'polls'
+        checks have been done since the resource reached the given state"""
+        initial, max_interval = self.state_intervals.get(
+            getattr(state, "value", state), (self.initial, self.max_interval)
+        )
+        return min(max_interval, initial * self.factor**polls)
+
+    def poller(self):
+        """create a Poller for waiting on a single resource"""
+        return Poller(self)
+
+    def record(self, kind, polls):
+        """record the number of status checks after a resource (of the given kind,
+        e.g. "Job") has reached the state it was waited for"""
+        with self._lock:
+            stats = self._stats.setdefault(kind, {"completed": 0, "polls": 0, "max_polls": 0})
+            stats["completed"] += 1
+            stats["polls"] += polls
+            stats["max_polls"] = max(stats["max_polls"], polls)
+
+    def statistics(self) -> dict:
+        """get the number of completed waits and status checks, per kind of resource"""
+        with self._lock:
+            result = {}
+            for kind, stats in self._stats.items():
+                result[kind] = dict(stats)
+                result[kind]["average_polls"] = stats["polls"] / stats["completed"]
+            return result
+
+
+class Poller:
+    """Tracks the status checks while waiting on a single resource"""
+
+    def __init__(self, strategy: PollingStrategy):
+        self.strategy = strategy
+        self.polls = 0
+        self._state = None
+        self._polls_in_state = 0
+
+    def next_interval(self, state) -> float:
+        """get the time to wait before the next status check, given the current state"""
+        if state != self._state:
+            self._state = state
+            self._polls_in_state = 0
+        interval = self.strategy.interval(state, self._polls_in_state)
+        self._polls_in_state += 1
+        self.polls += 1
+        jitter = self.strategy.jitter
+        if jitter > 0:
+            interval *= 1 + random.uniform(-jitter, jitter)
+        return interval
+
+    def done(self, kind):
+        """record the number of status checks in the strategy's statistics"""
+        self.strategy.record(kind, self.polls)
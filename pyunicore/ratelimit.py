@@ -0,0 +1,138 @@
+"""
+    Client-side limits for the load put on UNICORE servers
+
+    A RateLimiter can be passed to a pyunicore.client.Transport, and will
+    then be shared by all its clones. It limits the number of concurrent
+    requests per host, and the request rate per host (using a token bucket).
+    Requests exceeding the limits are queued, and served in FIFO order.
+
+    >>> limiter = RateLimiter(max_concurrent=4, rate=20)
+    >>> transport = Transport(credential, rate_limiter=limiter)
+    >>> ...
+    >>> print(limiter.statistics())
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+class _HostState:
+    def __init__(self, burst):
+        self.in_flight = 0
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.queue = deque()
+
+
+class RateLimiter:
+    """Limits the number of in-flight requests and the request rate per host.
+
+    Callers that cannot be served immediately are queued (not rejected),
+    and are served in the order of their arrival.
+
+    Args:
+        max_concurrent: maximum number of in-flight requests per host
+            (None for no limit)
+        rate: maximum number of requests per second per host (None for no limit)
+        burst: number of requests that can be sent at once before the
+            rate limit applies (defaults to 'rate', at least 1)
+    """
+
+    def __init__(self, max_concurrent=None, rate=None, burst=None):
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if rate is not None and rate <= 0:
+            raise ValueError("rate must be positive")
+        self.max_concurrent = max_concurrent
+        self.rate = rate
+        self.burst = max(1, burst if burst is not None else (rate or 1))
+        self._hosts = {}
+        self._cond = threading.Condition()
+        self._stats = {"requests": 0, "queued": 0, "wait_time": 0.0, "max_queue_length": 0}
+
+    def statistics(self) -> dict:
+        """get the limiter counters:
+        requests (number of requests), queued (requests that had to wait),
+        wait_time (overall time in seconds spent waiting),
+        max_queue_length (maximum number of waiting requests for a host)
+        and in_flight (current number of in-flight requests per host)
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats["in_flight"] = {h: s.in_flight for h, s in self._hosts.items()}
+            return stats
+
+    def _refill(self, state, now):
+        if self.rate is not None:
+            elapsed = now - state.last_refill
+            state.tokens = min(self.burst, state.tokens + elapsed * self.rate)
+        state.last_refill = now
+
+    def _wait_time(self, state):
+        """returns the time to wait until the request at the head of the queue
+        can be sent (0 if it can be sent now, None if it has to wait for
+        another request to finish)"""
+        if self.max_concurrent is not None and state.in_flight >= self.max_concurrent:
+            return None
+        if self.rate is None:
+            return 0
+        self._refill(state, time.monotonic())
+        if state.tokens >= 1:
+            return 0
+        return (1 - state.tokens) / self.rate
+
+    def acquire(self, url):
+        """wait until a request to the given URL may be sent.
+        Each call must be followed by a call to release() with the same URL."""
+        host = urlparse(url).netloc
+        ticket = object()
+        start = time.monotonic()
+        queued = False
+        with self._cond:
+            state = self._hosts.get(host)
+            if state is None:
+                state = _HostState(self.burst)
+                self._hosts[host] = state
+            state.queue.append(ticket)
+            self._stats["requests"] += 1
+            while True:
+                if state.queue[0] is ticket:
+                    wait = self._wait_time(state)
+                    if wait == 0:
+                        break
+                else:
+                    wait = None
+                if not queued:
+                    queued = True
+                    self._stats["queued"] += 1
+                    self._stats["max_queue_length"] = max(
+                        self._stats["max_queue_length"], len(state.queue)
+                    )
+                self._cond.wait(wait)
+            state.queue.popleft()
+            state.in_flight += 1
+            if self.rate is not None:
+                state.tokens -= 1
+            if queued:
+                self._stats["wait_time"] += time.monotonic() - start
+            # the next request in the queue might be able to proceed, too
+            self._cond.notify_all()
+
+    def release(self, url):
+        """mark a request to the given URL as finished"""
+        host = urlparse(url).netloc
+        with self._cond:
+            self._hosts[host].in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def limit(self, url):
+        """context manager for acquire() / release()"""
+        self.acquire(url)
+        try:
+            yield
+        finally:
+            self.release(url)
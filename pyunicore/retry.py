@@ -0,0 +1,192 @@
+"""
+    Retry policies for the UNICORE REST client
+
+    A RetryPolicy can be passed to a pyunicore.client.Transport, and will
+    then be shared by all its clones.
+
+    >>> policy = RetryPolicy(max_retries=5, backoff_factor=1)
+    >>> transport = Transport(credential, retry_policy=policy)
+    >>> ...
+    >>> print(policy.statistics())
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from urllib3.exceptions import NewConnectionError
+
+IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+
+
+class RetryBudget:
+    """Limits the number of retries to a fraction of the overall number of requests,
+    so that a struggling server is not overloaded by retries.
+
+    Every request adds 'ratio' tokens (up to 'max_tokens'), every retry
+    consumes one token. Initially, 'min_tokens' tokens are available.
+
+    Args:
+        ratio: number of retries allowed per request (e.g. 0.2 for 20%)
+        min_tokens: initial number of tokens
+        max_tokens: maximum number of tokens that can be accumulated
+    """
+
+    def __init__(self, ratio=0.2, min_tokens=10, max_tokens=100):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(min_tokens)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """consume one token, returns False if the budget is exhausted"""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """Decides whether a failed request is retried, and how long to wait before that.
+
+    Requests are retried on connection errors, timeouts and the configured HTTP
+    status codes. Non-idempotent requests (POST) are only retried if the connection
+    could not be established, unless 'retry_non_idempotent' is set.
+
+    The wait time grows exponentially (backoff_factor * 2^attempt, limited to
+    'max_backoff') with "full jitter", i.e. a random time between zero and that value.
+    A "Retry-After" header sent by the server takes precedence.
+
+    Args:
+        max_retries: maximum number of retries per request
+        backoff_factor: base wait time in seconds
+        max_backoff: maximum wait time in seconds
+        jitter: if true, randomize the wait time
+        status_codes: HTTP status codes that trigger a retry
+        retry_non_idempotent: if true, POST requests are retried like the other methods
+        respect_retry_after: if true, the server's "Retry-After" header is honoured
+        budget: optional RetryBudget, by default a RetryBudget() is used.
+                Set to False to disable the budget
+    """
+
+    def __init__(
+        self,
+        max_retries=3,
+        backoff_factor=0.5,
+        max_backoff=30,
+        jitter=True,
+        status_codes=(502, 503, 504),
+        retry_non_idempotent=False,
+        respect_retry_after=True,
+        budget=None,
+    ):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_codes = frozenset(status_codes)
+        self.retry_non_idempotent = retry_non_idempotent
+        self.respect_retry_after = respect_retry_after
+        self.budget = RetryBudget() if budget is None else budget
+        self._stats = {"requests": 0, "retries": 0, "exhausted": 0, "budget_exhausted": 0}
+        self._reasons = {}
+        self._lock = threading.Lock()
+
+    def _count(self, key, reason=None):
+        with self._lock:
+            self._stats[key] += 1
+            if reason is not None:
+                self._reasons[reason] = self._reasons.get(reason, 0) + 1
+
+    def statistics(self) -> dict:
+        """get the retry counters:
+        requests (number of requests), retries (number of retries),
+        exhausted (requests that failed after max_retries),
+        budget_exhausted (retries denied by the retry budget)
+        and reasons (number of retries per status code / error type)
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["reasons"] = dict(self._reasons)
+            return stats
+
+    def request_started(self):
+        """called once per request (not per retry)"""
+        self._count("requests")
+        if self.budget:
+            self.budget.deposit()
+
+    def _is_retryable(self, method, response, error) -> bool:
+        if error is not None:
+            if _not_connected(error):
+                return True
+            if not isinstance(error, (requests.ConnectionError, requests.Timeout)):
+                return False
+        elif response.status_code not in self.status_codes:
+            return False
+        return self.retry_non_idempotent or method.upper() in IDEMPOTENT_METHODS
+
+    def should_retry(self, method, attempt, response=None, error=None) -> bool:
+        """check whether the request should be retried
+
+        Args:
+            method: the HTTP method
+            attempt: number of retries done so far
+            response: the HTTP response (if any)
+            error: the exception raised by the request (if any)
+        """
+        if not self._is_retryable(method, response, error):
+            return False
+        if attempt >= self.max_retries:
+            self._count("exhausted")
+            return False
+        if self.budget and not self.budget.withdraw():
+            self._count("budget_exhausted")
+            return False
+        reason = type(error).__name__ if error is not None else str(response.status_code)
+        self._count("retries", reason)
+        return True
+
+    def get_backoff(self, attempt, response=None) -> float:
+        """get the time (in seconds) to wait before the next retry"""
+        if self.respect_retry_after and response is not None:
+            retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return min(self.max_backoff, retry_after)
+        backoff = min(self.max_backoff, self.backoff_factor * (2**attempt))
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+        return backoff
+
+
+def _not_connected(error) -> bool:
+    """check whether the error means that the connection could not be established
+    (connection refused, unknown host, timeout), i.e. the request was not sent"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.ConnectionError) or not error.args:
+        return False
+    # requests wraps the urllib3 MaxRetryError, which holds the original error
+    reason = getattr(error.args[0], "reason", error.args[0])
+    return isinstance(reason, NewConnectionError)
+
+
+def _parse_retry_after(value):
+    """parse the value of a Retry-After header (seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,1041 @@
+"""
+    In-process fake UNICORE/X server for tests, benchmarks and load tests
+
+    The FakeUNICORE server implements the most important parts of the
+    UNICORE REST API (core properties, jobs, storages and files, transfers,
+    a registry and security sessions) with in-memory state. Latency and
+    failures can be injected to simulate a busy or unreliable server.
+
+    >>> with FakeUNICORE(latency=0.01) as server:
+    ...     client = Client(UsernamePassword("demouser", "test123"), server.site_url)
+    ...     job = client.new_job({"Executable": "date"})
+    ...     job.poll()
+
+    The server can also be run standalone with "python -m pyunicore.testing"
+"""
+
+import hashlib
+import http.client
+import io
+import ipaddress
+import json
+import os
+import queue
+import random
+import select
+import socket
+import ssl
+import tempfile
+import threading
+import time
+import urllib.request
+import uuid
+import zlib
+from collections import Counter
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs
+from urllib.parse import unquote
+from urllib.parse import urlparse
+
+from pyunicore.httpserver import BackgroundHTTPServer
+from pyunicore.metrics import url_template
+
+
+def _now():
+    return datetime.now().astimezone().strftime("%Y-%m-%dT%H:%M:%S%z")
+
+
+class _Job:
+    def __init__(self, job_id, description, storage, autostart):
+        self.id = job_id
+        self.description = description
+        self.storage = storage
+        self.submission_time = _now()
+        self.started = time.time() if autostart else None
+        self.aborted = False
+        self.tags = description.get("Tags", [])
+        self.notified_status = None
+
+    def status(self, queue_time, run_time):
+        if self.aborted:
+            return "FAILED", "Job was aborted"
+        if self.started is None:
+            return "READY", "Waiting for client stage-in"
+        elapsed = time.time() - self.started
+        if elapsed < queue_time:
+            return "QUEUED", ""
+        if elapsed < queue_time + run_time:
+            return "RUNNING", ""
+        if self.description.get("Executable") == "false":
+            return "FAILED", "User application exited with non-zero exit code"
+        return "SUCCESSFUL", ""
+
+
+class _Storage:
+    def __init__(self, name):
+        self.name = name
+        self.files = {}
+        self.dirs = {"/"}
+
+    @staticmethod
+    def normalize(path):
+        return "/" + "/".join(p for p in path.split("/") if p)
+
+    def makedirs(self, path):
+        parts = [p for p in path.split("/") if p]
+        for i in range(len(parts)):
+            self.dirs.add("/" + "/".join(parts[: i + 1]))
+
+    def write(self, path, data):
+        self.makedirs(path.rsplit("/", 1)[0])
+        self.files[path] = data
+
+    def remove(self, path):
+        prefix = path.rstrip("/") + "/"
+        for name in [f for f in self.files if f == path or f.startswith(prefix)]:
+            del self.files[name]
+        for name in [d for d in self.dirs if d == path or d.startswith(prefix)]:
+            if name != "/":
+                self.dirs.discard(name)
+
+    def stat(self, path):
+        if path in self.dirs:
+            return {"isDirectory": True, "size": 0}
+        if path in self.files:
+            return {"isDirectory": False, "size": len(self.files[path])}
+        return None
+
+    def list(self, path):
+        prefix = path.rstrip("/") + "/"
+        n = len(prefix)
+        content = {}
+        for d in self.dirs:
+            if d.startswith(prefix) and d != path and "/" not in d[n:]:
+                content[d + "/"] = self.stat(d)
+        for f in self.files:
+            if f.startswith(prefix) and "/" not in f[n:]:
+                content[f] = self.stat(f)
+        return content
+
+
+class _Transfer:
+    def __init__(self, transfer_id, source, target, status, message, size):
+        self.id = transfer_id
+        self.source = source
+        self.target = target
+        self.status = status
+        self.message = message
+        self.size = size
+
+
+class FakeUNICORE:
+    """A fake UNICORE/X server (with a registry) running in a background thread.
+
+    Args:
+        site_name: the site name used in the URLs
+        host: the interface to listen on
+        port: the port to listen on (0 = choose a free port)
+        latency: processing time in seconds added to each request, or a tuple
+            (min, max) for a random processing time
+        failure_rate: fraction of requests (0..1) answered with 'failure_status'
+        failure_status: HTTP status code for injected failures
+        job_queue_time: time in seconds a job stays QUEUED after it is started
+        job_run_time: time in seconds a job stays RUNNING
+        session_lifetime: lifetime of security sessions in seconds
+        bandwidth: optional bandwidth limit in bytes per second for
+            response bodies (e.g. to simulate a slow WAN link)
+        compression: if true, responses are gzip-compressed if the client accepts it,
+            and gzip-compressed uploads are accepted
+        job_log_lines: number of lines in each job's log (to simulate long-running jobs)
+        supports_fields: if false, the "fields" query parameter is ignored,
+            like older servers do
+        tls: if true, serve "https://" URLs using a self-signed certificate
+            (requires the 'cryptography' library)
+        http2: if true, serve "https://" URLs and support HTTP/2 (negotiated via TLS ALPN)
+            in addition to HTTP/1.1 (requires the 'h2' and 'cryptography' libraries)
+        notifications: if true, job status changes are POSTed to the URL given in the
+            job description's "Notification" field (by default when the job is
+            RUNNING, SUCCESSFUL or FAILED, see "NotificationSettings")
+        seed: optional seed for the random number generator (latency, failures)
+
+    Jobs with "Executable" set to "false" will end up FAILED, all others SUCCESSFUL.
+    Server-to-server transfers between storages of this server are completed
+    immediately, transfers involving other servers will fail.
+    """
+
+    def __init__(
+        self,
+        site_name="DEMO-SITE",
+        host="127.0.0.1",
+        port=0,
+        latency=0,
+        failure_rate=0.0,
+        failure_status=503,
+        job_queue_time=0.0,
+        job_run_time=0.0,
+        session_lifetime=3600,
+        bandwidth=None,
+        compression=False,
+        job_log_lines=3,
+        supports_fields=True,
+        tls=False,
+        http2=False,
+        notifications=True,
+        seed=None,
+    ):
+        self.site_name = site_name
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.job_queue_time = job_queue_time
+        self.job_run_time = job_run_time
+        self.session_lifetime = session_lifetime
+        self.bandwidth = bandwidth
+        self.compression = compression
+        self.job_log_lines = job_log_lines
+        self.supports_fields = supports_fields
+        self.notifications = notifications
+        self.notifications_sent = 0
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.jobs = {}
+        self.storages = {"HOME": _Storage("HOME")}
+        self.transfers = {}
+        self.sessions = {}
+        self.requests = Counter()
+        self.authentications = 0
+        self.connections = Counter()
+        self._failures = []
+        self.tls = tls or http2
+        context = _tls_context(host, http2) if self.tls else None
+        self._httpd = _Server((host, port), context)
+        self._httpd.unicore = self
+        self._notifier = None
+        self._stopped = threading.Event()
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        scheme = "https" if self.tls else "http"
+        return f"{scheme}://{host}:{port}"
+
+    @property
+    def site_url(self):
+        """the base URL of the UNICORE/X REST API (".../rest/core")"""
+        return f"{self.base_url}/{self.site_name}/rest/core"
+
+    @property
+    def registry_url(self):
+        return f"{self.base_url}/REGISTRY/rest/registries/default_registry"
+
+    def start(self):
+        """start serving requests in a background thread"""
+        self._httpd.start()
+        self._stopped.clear()
+        self._notifier = threading.Thread(target=self._send_notifications, daemon=True)
+        self._notifier.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._notifier is not None:
+            self._notifier.join()
+            self._notifier = None
+        self._httpd.stop()
+
+    def join(self):
+        """wait until the server has been stopped"""
+        self._stopped.wait()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def fail_next(self, count=1, status=503, retry_after=None):
+        """answer the next 'count' requests with the given HTTP status"""
+        with self.lock:
+            self._failures.extend([(status, retry_after)] * count)
+
+    def expire_sessions(self):
+        """invalidate all security sessions"""
+        with self.lock:
+            self.sessions.clear()
+
+    def statistics(self) -> dict:
+        """get the number of requests per (method, endpoint), the number
+        of full authentications and the number of connections per protocol"""
+        with self.lock:
+            return {
+                "requests": dict(self.requests),
+                "total": sum(self.requests.values()),
+                "authentications": self.authentications,
+                "connections": dict(self.connections),
+            }
+
+    def reset_statistics(self):
+        with self.lock:
+            self.requests.clear()
+            self.authentications = 0
+            self.connections.clear()
+
+    def _next_failure(self):
+        with self.lock:
+            if self._failures:
+                return self._failures.pop(0)
+            if self.failure_rate > 0 and self.random.random() < self.failure_rate:
+                return self.failure_status, None
+        return None
+
+    def _delay(self):
+        if isinstance(self.latency, (tuple, list)):
+            with self.lock:
+                delay = self.random.uniform(*self.latency)
+        else:
+            delay = self.latency
+        if delay > 0:
+            time.sleep(delay)
+
+    def _send_notifications(self):
+        """POST job status changes to the jobs' notification URLs"""
+        while not self._stopped.wait(0.01):
+            if not self.notifications:
+                continue
+            messages = []
+            with self.lock:
+                for job in self.jobs.values():
+                    url = job.description.get("Notification")
+                    if not url:
+                        continue
+                    status, message = job.status(self.job_queue_time, self.job_run_time)
+                    settings = job.description.get("NotificationSettings", {})
+                    states = settings.get("status", ["RUNNING", "SUCCESSFUL", "FAILED"])
+                    if status != job.notified_status and status in states:
+                        job.notified_status = status
+                        href = f"{self.site_url}/jobs/{job.id}"
+                        messages.append(
+                            (url, {"href": href, "status": status, "statusMessage": message})
+                        )
+            for url, message in messages:
+                request = urllib.request.Request(
+                    url,
+                    data=json.dumps(message).encode("UTF-8"),
+                    headers={"Content-Type": "application/json"},
+                    method="POST",
+                )
+                try:
+                    with urllib.request.urlopen(request, timeout=5):
+                        pass
+                except OSError:
+                    continue
+                with self.lock:
+                    self.notifications_sent += 1
+
+    def _check_session(self, session_id, authorization):
+        """returns the (new or existing) security session ID,
+        or None if the session has expired"""
+        now = time.time()
+        with self.lock:
+            if session_id is not None:
+                expires = self.sessions.get(session_id)
+                if expires is None or expires < now:
+                    self.sessions.pop(session_id, None)
+                    return None
+                return session_id
+            self.authentications += 1
+            if authorization is None:
+                return ""
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = now + self.session_lifetime
+            return session_id
+
+    # the UNICORE/X resources, in the same order as in the REST API
+
+    def core_properties(self, user):
+        base = self.site_url
+        role = "user" if user else "anonymous"
+        return {
+            "client": {
+                "dn": "CN=%s,O=Fake UNICORE" % (user or "anonymous"),
+                "role": {"selected": role, "availableRoles": [role]},
+                "xlogin": {"UID": user, "availableUIDs": [user]} if user else {},
+            },
+            "server": {"version": "10.1.0-fake", "dn": "CN=UNICOREX,O=Fake UNICORE"},
+            "_links": {
+                "self": {"href": base},
+                "jobs": {"href": base + "/jobs"},
+                "storages": {"href": base + "/storages"},
+                "transfers": {"href": base + "/transfers"},
+                "factories": {"href": base + "/factories"},
+                "token": {"href": base + "/token"},
+            },
+        }
+
+    def job_properties(self, job):
+        url = f"{self.site_url}/jobs/{job.id}"
+        status, message = job.status(self.job_queue_time, self.job_run_time)
+        props = {
+            "status": status,
+            "statusMessage": message,
+            "submissionTime": job.submission_time,
+            "name": job.description.get("Name", "n/a"),
+            "queue": job.description.get("Queue", "batch"),
+            "owner": "CN=demouser,O=Fake UNICORE",
+            "tags": job.tags,
+            "batchSystemID": "fake-%s" % job.id[:8],
+            "log": [
+                "%s: job log entry %s of job %s" % (job.submission_time, i, job.id)
+                for i in range(self.job_log_lines)
+            ],
+            "_links": {
+                "self": {"href": url},
+                "action:start": {"href": url + "/actions/start"},
+                "action:abort": {"href": url + "/actions/abort"},
+                "action:restart": {"href": url + "/actions/restart"},
+                "workingDirectory": {"href": f"{self.site_url}/storages/{job.storage}"},
+                "details": {"href": url + "/details"},
+            },
+        }
+        if status in ("SUCCESSFUL", "FAILED"):
+            props["exitCode"] = 0 if status == "SUCCESSFUL" else 1
+        return props
+
+    def storage_properties(self, name):
+        url = f"{self.site_url}/storages/{name}"
+        return {
+            "resourceStatus": "READY",
+            "mountPoint": "/fake/" + name,
+            "protocols": ["BFT"],
+            "_links": {
+                "self": {"href": url},
+                "files": {"href": url + "/files"},
+                "action:rename": {"href": url + "/actions/rename"},
+                "action:copy": {"href": url + "/actions/copy"},
+            },
+        }
+
+    def file_properties(self, storage, path, stat):
+        props = {
+            "isDirectory": stat["isDirectory"],
+            "size": stat["size"],
+            "owner": "demouser",
+            "permissions": "rwxr-xr-x" if stat["isDirectory"] else "rw-r--r--",
+            "lastAccessed": _now(),
+            "metadata": {},
+        }
+        if stat["isDirectory"]:
+            props["content"] = {
+                p: {
+                    "isDirectory": s["isDirectory"],
+                    "size": s["size"],
+                    "owner": "demouser",
+                    "permissions": props["permissions"],
+                }
+                for p, s in storage.list(path).items()
+            }
+        return props
+
+    def transfer_properties(self, transfer):
+        url = f"{self.site_url}/transfers/{transfer.id}"
+        return {
+            "status": transfer.status,
+            "statusMessage": transfer.message,
+            "source": transfer.source,
+            "target": transfer.target,
+            "transferredBytes": transfer.size,
+            "expectedSize": transfer.size,
+            "_links": {
+                "self": {"href": url},
+                "action:abort": {"href": url + "/actions/abort"},
+            },
+        }
+
+    def registry_properties(self):
+        return {
+            "entries": [
+                {"href": self.site_url, "type": "CoreServices"},
+            ]
+        }
+
+    def new_job(self, description):
+        job_id = str(uuid.uuid4())
+        storage = job_id + "-uspace"
+        autostart = str(description.get("haveClientStageIn", "false")).lower() != "true"
+        with self.lock:
+            self.storages[storage] = _Storage(storage)
+            self.storages[storage].write("/stdout", b"")
+            self.storages[storage].write("/stderr", b"")
+            self.jobs[job_id] = _Job(job_id, description, storage, autostart)
+        return job_id
+
+    def new_transfer(self, storage, request):
+        local_url = f"{self.site_url}/storages/{storage.name}/files"
+        local_url += storage.normalize(request["file"])
+        if "target" in request:
+            source, target = local_url, request["target"]
+        else:
+            source, target = request["source"], local_url
+        status, message, size = "DONE", "", 0
+        try:
+            src_storage, src_path = self._resolve_file_url(source)
+            dst_storage, dst_path = self._resolve_file_url(target)
+            data = src_storage.files[src_path]
+            dst_storage.write(dst_path, data)
+            size = len(data)
+        except (KeyError, ValueError) as e:
+            status, message = "FAILED", "Transfer failed: %s" % e
+        transfer = _Transfer(str(uuid.uuid4()), source, target, status, message, size)
+        self.transfers[transfer.id] = transfer
+        return transfer.id
+
+    def _resolve_file_url(self, url):
+        if not url.startswith("http"):
+            url = url.split(":", 1)[1]  # remove protocol, e.g. "UFTP:"
+        prefix = self.site_url + "/storages/"
+        if not url.startswith(prefix) or "/files" not in url:
+            raise ValueError("not a file on this server: %s" % url)
+        name, path = url.replace(prefix, "", 1).split("/files", 1)
+        return self.storages[name], _Storage.normalize(unquote(path))
+
+
+def _tls_context(host, http2):
+    """server-side SSL context with a self-signed certificate"""
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, host)])
+    try:
+        alt_name = x509.IPAddress(ipaddress.ip_address(host))
+    except ValueError:
+        alt_name = x509.DNSName(host)
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=30))
+        .add_extension(x509.SubjectAlternativeName([alt_name]), critical=False)
+        .sign(key, hashes.SHA256())
+    )
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    with tempfile.TemporaryDirectory() as tmp:
+        cert_file = os.path.join(tmp, "cert.pem")
+        key_file = os.path.join(tmp, "key.pem")
+        with open(cert_file, "wb") as f:
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
+        with open(key_file, "wb") as f:
+            f.write(
+                key.private_bytes(
+                    serialization.Encoding.PEM,
+                    serialization.PrivateFormat.PKCS8,
+                    serialization.NoEncryption(),
+                )
+            )
+        context.load_cert_chain(cert_file, key_file)
+    context.set_alpn_protocols(["h2", "http/1.1"] if http2 else ["http/1.1"])
+    return context
+
+
+class _Server(BackgroundHTTPServer):
+    """HTTP server, optionally using TLS, which serves HTTP/2
+    connections if the client selects "h2" via ALPN"""
+
+    def __init__(self, address, tls_context=None):
+        super().__init__(address, _Handler)
+        self.tls_context = tls_context
+
+    def finish_request(self, request, client_address):
+        protocol = "HTTP/1.1"
+        if self.tls_context is not None:
+            try:
+                request = self.tls_context.wrap_socket(request, server_side=True)
+            except (ssl.SSLError, OSError):
+                return
+            if request.selected_alpn_protocol() == "h2":
+                protocol = "HTTP/2"
+        with self.unicore.lock:
+            self.unicore.connections[protocol] += 1
+        try:
+            if protocol == "HTTP/2":
+                _H2Connection(request, client_address, self).serve()
+            else:
+                self.RequestHandlerClass(request, client_address, self)
+        finally:
+            if self.tls_context is not None:
+                request.close()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):  # noqa: N802
+        self._handle("GET")
+
+    def do_POST(self):  # noqa: N802
+        self._handle("POST")
+
+    def do_PUT(self):  # noqa: N802
+        self._handle("PUT")
+
+    def do_DELETE(self):  # noqa: N802
+        self._handle("DELETE")
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip().split(b";")[0], 16)
+                chunk = self.rfile.read(size)
+                self.rfile.readline()
+                if size == 0:
+                    break
+                chunks.append(chunk)
+            return b"".join(chunks)
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _reply(self, status, body=b"", content_type="application/json", headers=None):
+        # the response is sent by _handle(), after all locks have been released
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body).encode("UTF-8")
+        self._response = (status, body, content_type, headers)
+
+    def _send_reply(self, status, body, content_type, headers):
+        self.send_response(status)
+        if body or status == 200:
+            self.send_header("Content-Type", content_type)
+        if status == 200 and len(body) > 256 and self._accepts_gzip():
+            body = zlib.compress(body, wbits=16 + zlib.MAX_WBITS)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.session_id:
+            self.send_header("X-UNICORE-SecuritySession", self.session_id)
+        self.end_headers()
+        if self.server.unicore.bandwidth:
+            time.sleep(len(body) / self.server.unicore.bandwidth)
+        self.wfile.write(body)
+
+    def _accepts_gzip(self):
+        if not self.server.unicore.compression:
+            return False
+        accepted = self.headers.get("Accept-Encoding", "")
+        return "gzip" in [e.split(";")[0].strip() for e in accepted.split(",")]
+
+    def _reply_json(self, props):
+        if "fields" in self.query and self.server.unicore.supports_fields:
+            fields = self.query["fields"][0].split(",")
+            props = {f: props[f] for f in fields if f in props}
+        body = json.dumps(props).encode("UTF-8")
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self._reply(304, headers={"ETag": etag})
+        else:
+            self._reply(200, body, headers={"ETag": etag})
+
+    def _error(self, status, message):
+        self._reply(status, {"errorMessage": message, "status": status})
+
+    def _handle(self, method):
+        self._response = (500, b"", "application/json", None)
+        self._process(method)
+        self._send_reply(*self._response)
+
+    def _process(self, method):
+        unicore = self.server.unicore
+        self.session_id = None
+        url = urlparse(self.path)
+        self.query = parse_qs(url.query)
+        with unicore.lock:
+            unicore.requests[(method, url_template(url.path))] += 1
+        body = self._read_body()
+        encoding = self.headers.get("Content-Encoding", "identity")
+        if encoding != "identity":
+            if encoding != "gzip" or not unicore.compression:
+                self._reply(415, {"errorMessage": "Unsupported encoding: %s" % encoding})
+                return
+            body = zlib.decompress(body, wbits=16 + zlib.MAX_WBITS)
+        unicore._delay()
+        failure = unicore._next_failure()
+        if failure is not None:
+            status, retry_after = failure
+            headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+            self._reply(status, {"errorMessage": "Injected failure"}, headers=headers)
+            return
+        authorization = self.headers.get("Authorization")
+        session_id = unicore._check_session(
+            self.headers.get("X-UNICORE-SecuritySession"), authorization
+        )
+        if session_id is None:
+            self._reply(432)
+            return
+        self.session_id = session_id
+        self.user = "demouser" if authorization else None
+        path = [unquote(p) for p in url.path.split("/") if p]
+        query = self.query
+        try:
+            if path[:3] == ["REGISTRY", "rest", "registries"]:
+                self._reply_json(unicore.registry_properties())
+            elif path[:3] == [unicore.site_name, "rest", "core"]:
+                self._core(method, path[3:], query, body)
+            else:
+                self._error(404, "Not found: %s" % url.path)
+        except KeyError as e:
+            self._error(404, "Not found: %s" % e)
+        except (ValueError, TypeError) as e:
+            self._error(400, "Bad request: %s" % e)
+
+    def _core(self, method, path, query, body):
+        unicore = self.server.unicore
+        if not path:
+            self._reply_json(unicore.core_properties(self.user))
+        elif path[0] == "jobs":
+            self._jobs(method, path[1:], query, body)
+        elif path[0] == "storages":
+            self._storages(method, path[1:], query, body)
+        elif path[0] == "transfers":
+            self._transfers(method, path[1:], query)
+        elif path[0] == "factories":
+            self._factories(path[1:])
+        elif path[0] == "token":
+            token = "fake-token-for-%s" % (self.user or "anonymous")
+            self._reply(200, token.encode(), "text/plain")
+        else:
+            raise KeyError("/".join(path))
+
+    def _list(self, key, urls, query):
+        offset = int(query.get("offset", ["0"])[0])
+        num = int(query.get("num", [str(len(urls))])[0])
+        end = offset + num
+        self._reply_json({key: urls[offset:end]})
+
+    def _jobs(self, method, path, query, body):
+        unicore = self.server.unicore
+        base = unicore.site_url + "/jobs"
+        if not path:
+            if method == "POST":
+                job_id = unicore.new_job(json.loads(body))
+                self._reply(201, headers={"Location": f"{base}/{job_id}"})
+                return
+            tags = set(query["tags"][0].split(",")) if "tags" in query else None
+            with unicore.lock:
+                jobs = [j for j in unicore.jobs.values() if not tags or tags & set(j.tags)]
+            self._list("jobs", [f"{base}/{j.id}" for j in jobs], query)
+            return
+        with unicore.lock:
+            job = unicore.jobs[path[0]]
+            if len(path) == 1 and method == "DELETE":
+                del unicore.jobs[job.id]
+                unicore.storages.pop(job.storage, None)
+                self._reply(204)
+            elif len(path) == 1:
+                self._reply_json(unicore.job_properties(job))
+            elif path[1:] == ["details"]:
+                self._reply_json({"jobId": job.id, "queue": "batch", "status": "COMPLETED"})
+            elif path[1] == "actions" and method == "POST":
+                action = path[2]
+                if action == "start" and job.started is None:
+                    job.started = time.time()
+                elif action == "abort":
+                    job.aborted = True
+                elif action == "restart":
+                    job.aborted = False
+                    job.started = time.time()
+                self._reply(200, {})
+            else:
+                raise KeyError("/".join(path))
+
+    def _storages(self, method, path, query, body):
+        unicore = self.server.unicore
+        if not path:
+            with unicore.lock:
+                names = [n for n in unicore.storages if not n.endswith("-uspace")]
+                if query.get("filter") == ["all"]:
+                    names = list(unicore.storages)
+            self._list("storages", [f"{unicore.site_url}/storages/{n}" for n in names], query)
+            return
+        with unicore.lock:
+            storage = unicore.storages[path[0]]
+            if len(path) == 1:
+                self._reply_json(unicore.storage_properties(storage.name))
+            elif path[1] == "files":
+                self._files(method, storage, _Storage.normalize("/".join(path[2:])), body)
+            elif path[1] == "actions" and method == "POST":
+                request = json.loads(body)
+                source = storage.normalize(request["from"])
+                target = storage.normalize(request["to"])
+                storage.write(target, storage.files[source])
+                if path[2] == "rename":
+                    del storage.files[source]
+                self._reply(200, {})
+            elif path[1] == "transfers" and method == "POST":
+                transfer_id = unicore.new_transfer(storage, json.loads(body))
+                location = f"{unicore.site_url}/transfers/{transfer_id}"
+                self._reply(201, headers={"Location": location})
+            else:
+                raise KeyError("/".join(path))
+
+    def _files(self, method, storage, path, body):
+        if method == "PUT":
+            storage.write(path, body)
+            self._reply(204)
+        elif method == "POST":
+            storage.makedirs(path)
+            self._reply(201)
+        elif method == "DELETE":
+            if storage.stat(path) is None:
+                raise KeyError(path)
+            storage.remove(path)
+            self._reply(204)
+        else:
+            stat = storage.stat(path)
+            if stat is None:
+                raise KeyError(path)
+            if stat["isDirectory"] or "application/json" in self.headers.get("Accept", ""):
+                self._reply_json(self.server.unicore.file_properties(storage, path, stat))
+            else:
+                self._download(storage.files[path])
+
+    def _download(self, data):
+        content_type = "application/octet-stream"
+        requested = self.headers.get("Range")
+        if not requested or not requested.startswith("bytes="):
+            self._reply(200, data, content_type)
+            return
+        start, _, end = requested[6:].partition("-")
+        start = int(start)
+        end = min(int(end), len(data) - 1) if end else len(data) - 1
+        if start >= len(data):
+            self._reply(416, headers={"Content-Range": "bytes */%s" % len(data)})
+            return
+        headers = {"Content-Range": "bytes %s-%s/%s" % (start, end, len(data))}
+        stop = end + 1
+        self._reply(206, data[start:stop], content_type, headers)
+
+    def _transfers(self, method, path, query):
+        unicore = self.server.unicore
+        if not path:
+            with unicore.lock:
+                urls = [f"{unicore.site_url}/transfers/{t}" for t in unicore.transfers]
+            self._list("transfers", urls, query)
+            return
+        with unicore.lock:
+            transfer = unicore.transfers[path[0]]
+            if len(path) == 1 and method == "DELETE":
+                del unicore.transfers[transfer.id]
+                self._reply(204)
+            elif len(path) == 1:
+                self._reply_json(unicore.transfer_properties(transfer))
+            elif path[1:] == ["actions", "abort"] and method == "POST":
+                if transfer.status not in ("DONE", "FAILED"):
+                    transfer.status = "ABORTED"
+                self._reply(200, {})
+            else:
+                raise KeyError("/".join(path))
+
+    def _factories(self, path):
+        base = self.server.unicore.site_url + "/factories/default_target_system_factory"
+        if not path:
+            self._reply_json({"factories": [base]})
+        elif len(path) == 1:
+            self._reply_json(
+                {
+                    "applications": ["Date---1.0", "Python---3.10"],
+                    "resources": {"Nodes": "1-16", "Runtime": "1-86400"},
+                    "_links": {
+                        "self": {"href": base},
+                        "applications": {"href": base + "/applications"},
+                    },
+                }
+            )
+        elif len(path) == 2 and path[1] == "applications":
+            self._reply_json({"applications": ["Date---1.0", "Python---3.10"]})
+        elif len(path) == 3:
+            name, version = path[2].split("---")
+            self._reply_json(
+                {"ApplicationName": name, "ApplicationVersion": version, "Options": []}
+            )
+        else:
+            raise KeyError("/".join(path))
+
+
+class _H2Handler(_Handler):
+    """handles a single request received via HTTP/2, collecting the response"""
+
+    def __init__(self, server, client_address, headers, body):
+        self.server = server
+        self.client_address = client_address
+        self.command = headers[":method"]
+        self.path = headers[":path"]
+        self.request_version = "HTTP/2"
+        self.headers = http.client.HTTPMessage()
+        for name, value in headers.items():
+            if not name.startswith(":"):
+                self.headers[name] = value
+        if "content-length" not in headers:
+            self.headers["Content-Length"] = str(len(body))
+        self.rfile = io.BytesIO(body)
+        self.wfile = io.BytesIO()
+        self.status = 500
+        self.response_headers = []
+
+    def send_response(self, code, message=None):
+        self.status = code
+
+    def send_header(self, keyword, value):
+        self.response_headers.append((keyword.lower(), str(value)))
+
+    def end_headers(self):
+        pass
+
+
+class _H2Connection:
+    """serves an HTTP/2 connection: frames are read and written by a single
+    thread, while the requests are processed concurrently in worker threads"""
+
+    def __init__(self, sock, client_address, server):
+        import h2.config
+        import h2.connection
+
+        self.sock = sock
+        self.client_address = client_address
+        self.server = server
+        config = h2.config.H2Configuration(client_side=False, header_encoding="utf-8")
+        self.conn = h2.connection.H2Connection(config)
+        self.requests = {}
+        self.responses = queue.SimpleQueue()
+        self.pending = {}
+        self.wakeup, self._wakeup_sender = socket.socketpair()
+
+    def serve(self):
+        import h2.events
+        import h2.exceptions
+
+        self.conn.initiate_connection()
+        try:
+            self.sock.sendall(self.conn.data_to_send())
+            while self._receive():
+                self._send_responses()
+                self.sock.sendall(self.conn.data_to_send())
+        except (OSError, h2.exceptions.ProtocolError):
+            pass
+        finally:
+            self.wakeup.close()
+            self._wakeup_sender.close()
+
+    def _receive(self) -> bool:
+        """process incoming frames, returns False if the connection was closed"""
+        import h2.events
+
+        readable = [self.sock]
+        if not self.sock.pending():
+            readable, _, _ = select.select([self.sock, self.wakeup], [], [])
+        if self.wakeup in readable:
+            self.wakeup.recv(4096)
+        if self.sock not in readable:
+            return True
+        data = self.sock.recv(65536)
+        if not data:
+            return False
+        for event in self.conn.receive_data(data):
+            if isinstance(event, h2.events.RequestReceived):
+                self.requests[event.stream_id] = (dict(event.headers), bytearray())
+            elif isinstance(event, h2.events.DataReceived):
+                self.requests[event.stream_id][1].extend(event.data)
+                self.conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, h2.events.StreamEnded):
+                headers, body = self.requests.pop(event.stream_id)
+                args = (event.stream_id, headers, bytes(body))
+                threading.Thread(target=self._handle, args=args, daemon=True).start()
+            elif isinstance(event, h2.events.StreamReset):
+                self.requests.pop(event.stream_id, None)
+                self.pending.pop(event.stream_id, None)
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                return False
+        return True
+
+    def _handle(self, stream_id, headers, body):
+        handler = _H2Handler(self.server, self.client_address, headers, body)
+        try:
+            handler._handle(handler.command)
+        # the stream must be answered, even if the request failed unexpectedly
+        except Exception as e:  # noqa: B902
+            handler.status = 500
+            handler.wfile = io.BytesIO(str(e).encode("UTF-8"))
+        self.responses.put((stream_id, handler))
+        self._wakeup_sender.send(b"x")
+
+    def _send_responses(self):
+        import h2.exceptions
+
+        while not self.responses.empty():
+            stream_id, handler = self.responses.get()
+            headers = [(":status", str(handler.status))] + handler.response_headers
+            self.conn.send_headers(stream_id, headers)
+            self.pending[stream_id] = handler.wfile.getvalue()
+        for stream_id, body in list(self.pending.items()):
+            try:
+                while body:
+                    size = min(
+                        self.conn.local_flow_control_window(stream_id),
+                        self.conn.max_outbound_frame_size,
+                        len(body),
+                    )
+                    if size <= 0:
+                        break
+                    self.conn.send_data(stream_id, body[:size])
+                    body = body[size:]
+                if body:
+                    self.pending[stream_id] = body
+                else:
+                    self.conn.end_stream(stream_id)
+                    del self.pending[stream_id]
+            except h2.exceptions.StreamClosedError:
+                del self.pending[stream_id]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a fake UNICORE/X server")
+    parser.add_argument("-p", "--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("-l", "--latency", type=float, default=0, help="latency in seconds")
+    parser.add_argument(
+        "-f", "--failure-rate", type=float, default=0, help="fraction of failing requests"
+    )
+    parser.add_argument("--tls", action="store_true", help="use TLS (https)")
+    parser.add_argument("--http2", action="store_true", help="support HTTP/2 (implies --tls)")
+    args = parser.parse_args()
+    server = FakeUNICORE(
+        port=args.port,
+        latency=args.latency,
+        failure_rate=args.failure_rate,
+        tls=args.tls,
+        http2=args.http2,
+    )
+    print(f"Fake UNICORE/X server: {server.site_url}")
+    print(f"Registry: {server.registry_url}")
+    server.start()
+    try:
+        server.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""
+    Tracking the status of many jobs from a single thread
+
+    A JobWatcher owns a set of jobs and refreshes their status in batches,
+    with a fixed maximum number of requests per refresh cycle. Jobs are
+    refreshed round-robin, and are no longer checked once they have reached
+    a final state (SUCCESSFUL or FAILED). Since the job listing only contains
+    the job URLs, the status of each job is fetched with a separate (small)
+    request, asking for the "status" property only.
+
+    >>> watcher = JobWatcher(max_requests=100, interval=10)
+    >>> watcher.add_callback(lambda job, old, new: print(job.job_id, old, "->", new))
+    >>> futures = [watcher.add(client.new_job(job_description)) for _ in range(1000)]
+    >>> with watcher:
+    ...     for future in concurrent.futures.as_completed(futures):
+    ...         job = future.result()
+    ...         print(job.job_id, job.status)
+    >>> print(watcher.counts())
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import requests
+
+from pyunicore.client import Job
+from pyunicore.client import JobStatus
+from pyunicore.client import _run_concurrently
+
+_FINAL_STATES = (JobStatus.SUCCESSFUL, JobStatus.FAILED)
+
+
+class JobWatcher:
+    """Refreshes the status of a set of jobs in batches, invokes callbacks on
+    status changes and resolves a Future for each job when it is done.
+
+    Args:
+        max_requests: maximum number of status requests per refresh cycle
+        interval: time in seconds between the start of two refresh cycles
+            (when running in the background, see start())
+        max_workers: maximum number of concurrent requests
+    """
+
+    def __init__(self, max_requests=100, interval=5.0, max_workers=10):
+        if max_requests < 1 or max_workers < 1:
+            raise ValueError("Need at least one request per cycle and one worker")
+        self.max_requests = max_requests
+        self.interval = interval
+        self.max_workers = max_workers
+        self._jobs = {}
+        self._status = {}
+        self._futures = {}
+        self._active = deque()
+        self._queued = set()
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.requests = 0
+        self.errors = 0
+
+    def add(self, job: Job) -> Future:
+        """start watching the job. Returns a Future, which is resolved with
+        the job when it has reached a final state"""
+        with self._lock:
+            url = job.resource_url
+            if url in self._futures:
+                return self._futures[url]
+            future = Future()
+            self._jobs[url] = job
+            self._status[url] = JobStatus.UNDEFINED
+            self._futures[url] = future
+            self._enqueue(url)
+            return future
+
+    def add_all(self, client, tags=[]) -> dict:
+        """watch all jobs of the given Client (optionally only the ones with the
+        given tags), as returned by the job listing. Returns the Futures keyed by job URL"""
+        return {job.resource_url: self.add(job) for job in client.get_jobs(tags=tags)}
+
+    def remove(self, job: Job):
+        """stop watching the job, its Future is cancelled if it is not done yet"""
+        with self._lock:
+            url = job.resource_url
+            self._jobs.pop(url, None)
+            self._status.pop(url, None)
+            future = self._futures.pop(url, None)
+            if url in self._queued:
+                self._queued.discard(url)
+                self._active.remove(url)
+        if future is not None:
+            future.cancel()
+
+    def add_callback(self, callback):
+        """add a callback, which will be invoked with (job, old_status, new_status)
+        whenever a job's status changes. Exceptions raised by callbacks are ignored"""
+        self._callbacks.append(callback)
+
+    def counts(self) -> dict:
+        """get the number of watched jobs per JobStatus
+        (UNDEFINED for jobs which have not been checked yet)"""
+        with self._lock:
+            result = {status: 0 for status in JobStatus}
+            for status in self._status.values():
+                result[status] += 1
+            return result
+
+    @property
+    def pending(self) -> int:
+        """the number of jobs which have not yet reached a final state"""
+        with self._lock:
+            return len(self._active)
+
+    def refresh(self) -> int:
+        """refresh the status of the next batch of (at most 'max_requests') jobs.
+        Returns the number of jobs which are still pending"""
+        with self._lock:
+            batch = []
+            while self._active and len(batch) < self.max_requests:
+                url = self._active.popleft()
+                self._queued.discard(url)
+                batch.append(self._jobs[url])
+        for job in batch:
+            job._invalidate()
+        results, errors = _run_concurrently(
+            lambda job: job.get_properties(["status"])["status"], batch, self.max_workers
+        )
+        self.requests += len(batch)
+        self.errors += len(errors)
+        for job in batch:
+            if job in results:
+                self._update(job, JobStatus(results[job]))
+            elif _is_gone(errors[job]):
+                self._fail(job, errors[job])
+            else:
+                self._requeue(job)
+        return self.pending
+
+    def _update(self, job, new_status):
+        url = job.resource_url
+        with self._lock:
+            if url not in self._jobs:
+                return
+            old_status = self._status[url]
+            self._status[url] = new_status
+            done = new_status in _FINAL_STATES
+            if not done:
+                self._enqueue(url)
+            future = self._futures[url]
+        if old_status != new_status:
+            for callback in self._callbacks:
+                try:
+                    callback(job, old_status, new_status)
+                # a failing callback must not stop the watcher
+                except Exception:  # noqa: B902
+                    pass
+        if done and not future.done():
+            future.set_result(job)
+
+    def _requeue(self, job):
+        with self._lock:
+            if job.resource_url in self._jobs:
+                self._enqueue(job.resource_url)
+
+    def _enqueue(self, url):
+        # the lock must be held. A job which is removed and added again while
+        # it is being refreshed must not be queued twice
+        if url not in self._queued:
+            self._queued.add(url)
+            self._active.append(url)
+
+    def _fail(self, job, error):
+        with self._lock:
+            future = self._futures.get(job.resource_url)
+        if future is not None and not future.done():
+            future.set_exception(error)
+
+    def run(self, timeout=0):
+        """refresh the jobs in cycles of 'interval' seconds, until all
+        jobs are done. If the optional timeout is reached, a TimeoutError
+        will be raised"""
+        start_time = time.time()
+        while not self._stop.is_set():
+            cycle_start = time.time()
+            if self.refresh() == 0:
+                return
+            if timeout > 0 and time.time() > start_time + timeout:
+                raise TimeoutError("Timeout waiting for %s jobs" % self.pending)
+            self._stop.wait(max(0, self.interval - (time.time() - cycle_start)))
+
+    def start(self):
+        """start refreshing the jobs in a background thread, until stop() is called.
+        Jobs can still be added while the watcher is running."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run_forever(self):
+        while not self._stop.is_set():
+            cycle_start = time.time()
+            self.refresh()
+            self._stop.wait(max(0, self.interval - (time.time() - cycle_start)))
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def _is_gone(error) -> bool:
+    """check whether the error means that the job does not exist (any more)"""
+    if not isinstance(error, requests.HTTPError) or error.response is None:
+        return False
+    return error.response.status_code in (404, 410)
@@ -21,6 +21,8 @@ extras_require = {
     "fuse": ["fusepy>=3.0.1"],
     "crypto": ["cryptography>=3.3.1", "bcrypt>=4.0.0"],
     "fs": ["fs>=2.4.0"],
+    "async": ["httpx>=0.23"],
+    "http2": ["httpx[http2]>=0.23"],
 }
 
 setup(
@@ -0,0 +1,37 @@
+"""
+    Shared fixtures for the benchmarks, which run against an
+    in-process fake UNICORE/X server (see pyunicore.testing)
+"""
+
+import pytest
+
+from pyunicore.client import Client
+from pyunicore.credentials import UsernamePassword
+from pyunicore.testing import FakeUNICORE
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    # benchmarks require the "pytest-benchmark" plugin
+    collect_ignore_glob = ["test_*.py"]
+
+
+@pytest.fixture(scope="module")
+def server():
+    with FakeUNICORE() as server:
+        yield server
+
+
+@pytest.fixture
+def credential():
+    return UsernamePassword("demouser", "test123")
+
+
+@pytest.fixture
+def client(server, credential):
+    return Client(credential, server.site_url)
+
+
+@pytest.fixture
+def home(client):
+    return client.get_storages()[0]
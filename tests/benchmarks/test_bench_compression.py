@@ -0,0 +1,53 @@
+import io
+
+import pytest
+
+from pyunicore.client import Client
+from pyunicore.client import Transport
+from pyunicore.testing import FakeUNICORE
+
+# simulated WAN link with 10 MB/s
+_BANDWIDTH = 10 * 1024 * 1024
+
+
+def _job_output(size):
+    """text-heavy job output of the given size"""
+    lines = []
+    total = 0
+    i = 0
+    while total < size:
+        line = "[%08d] step %s: energy=%.6f converged=False\n" % (i, i, i * 0.001)
+        lines.append(line)
+        total += len(line)
+        i += 1
+    return "".join(lines).encode()[:size]
+
+
+@pytest.mark.parametrize("compression", ["identity", "gzip"])
+def test_download_job_output(benchmark, credential, compression):
+    size = 8 * 1024 * 1024
+    with FakeUNICORE(compression=True, bandwidth=_BANDWIDTH) as server:
+        tr = Transport(credential, compression=compression)
+        home = Client(tr, server.site_url).get_storages()[0]
+        home.put(_job_output(size), "stdout")
+        f = home.stat("stdout")
+
+        def download():
+            out = io.BytesIO()
+            f.download(out)
+            return out
+
+        assert size == len(benchmark.pedantic(download, rounds=3).getvalue())
+        benchmark.extra_info["ratio"] = tr.compression_statistics.ratio("download")
+
+
+@pytest.mark.parametrize("compression", ["identity", "gzip"])
+def test_listdir(benchmark, credential, compression):
+    with FakeUNICORE(compression=True, bandwidth=_BANDWIDTH) as server:
+        storage = server.storages["HOME"]
+        for i in range(20000):
+            storage.write("/data/file_%s.dat" % i, b"")
+        tr = Transport(credential, compression=compression)
+        home = Client(tr, server.site_url).get_storages()[0]
+        assert 20000 == len(benchmark.pedantic(home.listdir, args=("data",), rounds=3))
+        benchmark.extra_info["ratio"] = tr.compression_statistics.ratio("response")
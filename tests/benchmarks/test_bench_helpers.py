@@ -0,0 +1,61 @@
+import pyunicore.cwl.cwlconverter as cwlconverter
+import pyunicore.helpers.jobs as jobs
+import pyunicore.helpers.workflows as workflows
+from pyunicore.helpers.workflows.activities.job import Job
+
+
+def _workflow(n):
+    """a workflow with n job activities, chained by transitions"""
+    activities = [workflows.activities.Start(id="start")]
+    transitions = []
+    previous = "start"
+    for i in range(n):
+        description = jobs.Description(
+            executable="/bin/date",
+            arguments=["--utc", "-R", str(i)],
+            environment={"STEP": str(i), "WORKDIR": "/tmp/step_%s" % i},
+            resources=jobs.Resources(nodes=1, runtime="1h"),
+            tags=["benchmark", "step_%s" % i],
+        )
+        activities.append(Job(id="job_%s" % i, description=description, site_name="DEMO-SITE"))
+        transitions.append(workflows.Transition(from_=previous, to="job_%s" % i))
+        previous = "job_%s" % i
+    variables = [
+        workflows.Variable(name="v%s" % i, type=workflows.VariableType.Integer, initial_value=i)
+        for i in range(n)
+    ]
+    return workflows.Description(
+        activities=activities, transitions=transitions, variables=variables
+    )
+
+
+def _cwl_tool(n):
+    """a CWL CommandLineTool with n inputs"""
+    inputs = {}
+    values = {}
+    for i in range(n):
+        inputs["param_%s" % i] = {
+            "type": "string",
+            "inputBinding": {"position": i, "prefix": "--p%s" % i},
+        }
+        values["param_%s" % i] = "value_%s" % i
+    doc = {
+        "cwlVersion": "v1.0",
+        "class": "CommandLineTool",
+        "baseCommand": "echo",
+        "inputs": inputs,
+        "outputs": [],
+    }
+    return doc, values
+
+
+def test_workflow_to_dict(benchmark):
+    workflow = _workflow(1000)
+    result = benchmark(workflow.to_dict)
+    assert 1001 == len(result["activities"])
+
+
+def test_convert_cmdline_tool(benchmark):
+    doc, values = _cwl_tool(1000)
+    u_job, _, _ = benchmark(cwlconverter.convert_cmdline_tool, doc, values)
+    assert 2000 == len(u_job["Arguments"])
@@ -0,0 +1,34 @@
+import pytest
+
+from pyunicore.client import Client
+from pyunicore.client import Transport
+from pyunicore.http2 import is_available
+from pyunicore.testing import FakeUNICORE
+
+pytestmark = pytest.mark.skipif(not is_available(), reason="requires 'httpx' and 'h2'")
+
+
+@pytest.fixture(scope="module")
+def h2_server():
+    # supports both HTTP/1.1 and HTTP/2, with some processing time per request
+    with FakeUNICORE(http2=True, latency=0.002) as server:
+        yield server
+
+
+@pytest.mark.parametrize("http2", [False, True])
+def test_concurrent_status(benchmark, h2_server, credential, http2):
+    """fetch the status of 100 jobs concurrently"""
+    tr = Transport(credential, http2=http2)
+    client = Client(tr, h2_server.site_url)
+    urls = [job.resource_url for job in client.get_jobs()]
+    for _ in range(100 - len(urls)):
+        urls.append(client.new_job({"Executable": "date"}).resource_url)
+    h2_server.reset_statistics()
+
+    def get_status():
+        results, errors = tr.get_many(urls, max_workers=50, params={"fields": "status"})
+        assert not errors
+        return results
+
+    assert 100 == len(benchmark(get_status))
+    benchmark.extra_info["connections"] = h2_server.statistics()["connections"]
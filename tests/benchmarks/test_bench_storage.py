@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+from pyunicore.cli.io import crawl_remote
+from pyunicore.client import Client
+from pyunicore.testing import FakeUNICORE
+
+
+def _create_files(server, directory, n):
+    storage = server.storages["HOME"]
+    with server.lock:
+        for i in range(n):
+            storage.write("%s/file_%s.dat" % (directory, i), b"")
+
+
+@pytest.mark.parametrize("n", [10000, 100000])
+def test_listdir(benchmark, server, home, n):
+    _create_files(server, "/listdir_%s" % n, n)
+    result = benchmark.pedantic(home.listdir, args=("listdir_%s" % n,), rounds=3)
+    assert n == len(result)
+
+
+@pytest.mark.parametrize("size", [1024 * 1024, 16 * 1024 * 1024])
+def test_put(benchmark, home, size):
+    data = b"x" * size
+    benchmark.extra_info["bytes"] = size
+    benchmark.pedantic(lambda: home.put(io.BytesIO(data), "upload.dat"), rounds=5)
+    assert size == home.stat("upload.dat").size()
+
+
+@pytest.mark.parametrize("size", [1024 * 1024, 16 * 1024 * 1024])
+def test_download(benchmark, home, size):
+    home.put(b"x" * size, "download.dat")
+    f = home.stat("download.dat")
+    benchmark.extra_info["bytes"] = size
+
+    def download():
+        out = io.BytesIO()
+        f.download(out)
+        return out
+
+    assert size == len(benchmark.pedantic(download, rounds=5).getvalue())
+
+
+def test_crawl_remote(benchmark, credential):
+    """recursive crawl over 10 directories with 1000 files each"""
+    with FakeUNICORE() as server:
+        for i in range(10):
+            _create_files(server, "/dir_%s" % i, 1000)
+        home = Client(credential, server.site_url).get_storages()[0]
+
+        def crawl():
+            return list(crawl_remote(home, "/", "*.dat", recurse=True, all=True))
+
+        assert 10000 == len(benchmark.pedantic(crawl, rounds=3))
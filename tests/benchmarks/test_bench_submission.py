@@ -0,0 +1,53 @@
+import pytest
+
+from pyunicore.client import Client
+from pyunicore.client import Transport
+from pyunicore.testing import FakeUNICORE
+
+JOBS = 100
+
+
+@pytest.fixture(scope="module")
+def slow_server():
+    """server with 5ms latency per request"""
+    with FakeUNICORE(latency=0.005) as server:
+        yield server
+
+
+@pytest.fixture
+def slow_client(slow_server, credential):
+    return Client(credential, slow_server.site_url)
+
+
+def _submissions_per_second(benchmark):
+    # no statistics are collected when running with --benchmark-disable
+    if benchmark.stats is not None:
+        benchmark.extra_info["jobs_per_second"] = JOBS / benchmark.stats.stats.mean
+
+
+def test_new_job_sequential(benchmark, slow_client):
+    """submit and start 100 jobs one after the other"""
+    descriptions = [{"Executable": "date"} for _ in range(JOBS)]
+    jobs = benchmark.pedantic(
+        lambda: [slow_client.new_job(d) for d in descriptions], rounds=3, iterations=1
+    )
+    assert JOBS == len(jobs)
+    _submissions_per_second(benchmark)
+
+
+@pytest.mark.parametrize("concurrency", [4, 16])
+def test_new_jobs(benchmark, slow_server, credential, concurrency):
+    """submit and start 100 jobs concurrently"""
+    # one pooled connection per concurrent submission
+    client = Client(Transport(credential, pool_size=concurrency), slow_server.site_url)
+    descriptions = [{"Executable": "date"} for _ in range(JOBS)]
+    jobs, errors = benchmark.pedantic(
+        client.new_jobs,
+        args=(descriptions,),
+        kwargs={"concurrency": concurrency},
+        rounds=3,
+        iterations=1,
+    )
+    assert {} == errors
+    assert JOBS == len(jobs)
+    _submissions_per_second(benchmark)
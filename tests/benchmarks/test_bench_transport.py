@@ -0,0 +1,37 @@
+from pyunicore.client import Job
+from pyunicore.client import Transport
+
+
+def test_request_overhead(benchmark, server, credential):
+    """a single small GET request, with pooled connections and security sessions"""
+    tr = Transport(credential)
+    result = benchmark(tr.get, url=server.site_url)
+    assert "client" in result
+
+
+def test_properties_cached(benchmark, client):
+    """access to cached properties, no request sent"""
+    job = client.new_job({"Executable": "date"})
+    job.properties
+    result = benchmark(lambda: job.properties)
+    assert "SUCCESSFUL" == result["status"]
+
+
+def test_properties_revalidated(benchmark, client):
+    """expired properties, re-validated using a conditional request"""
+    job = Job(client.transport, client.new_job({"Executable": "date"}).resource_url, cache_time=0)
+    job.properties
+    result = benchmark(lambda: job.properties)
+    assert "SUCCESSFUL" == result["status"]
+    assert job.transport.cache_statistics.not_modified > 0
+
+
+def test_get_jobs_prefetch(benchmark, client):
+    """list 200 jobs and fetch all their properties concurrently"""
+    for _ in range(200 - len(client.get_jobs())):
+        client.new_job({"Executable": "date"}, autostart=False)
+
+    def get_jobs():
+        return [job.properties["status"] for job in client.get_jobs(prefetch=True)]
+
+    assert 200 <= len(benchmark(get_jobs))
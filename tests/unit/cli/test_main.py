@@ -1,8 +1,21 @@
+import subprocess
+import sys
 import unittest
 
 import pyunicore.cli.main as main
 
 
+def _imported_modules(args):
+    """run the CLI in a new interpreter, and return the names of the modules
+    which have been imported"""
+    code = "import sys; from pyunicore.cli.main import run; run(%r); print(*sys.modules)" % args
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    # the module names are printed after the output of the CLI
+    return set(result.stdout.splitlines()[-1].split())
+
+
 class TestMain(unittest.TestCase):
     def test_help(self):
         main.help()
@@ -14,6 +27,18 @@ class TestMain(unittest.TestCase):
             c.parser.print_usage()
             c.parser.print_help()
 
+    def test_descriptions(self):
+        for cmd in main._commands:
+            self.assertEqual(main.get_command(cmd).get_description(), main.get_description(cmd))
+
+    def test_lazy_imports(self):
+        for args in [["--version"], ["help"]]:
+            print("\n*** imported modules for 'unicore %s'" % args[0])
+            modules = _imported_modules(args)
+            self.assertIn("pyunicore.cli.main", modules)
+            self.assertNotIn("requests", modules)
+            self.assertNotIn("pyunicore.client", modules)
+
     def test_run_args(self):
         main.run([])
         main.run(["--version"])
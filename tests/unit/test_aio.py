@@ -0,0 +1,215 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from pyunicore.aio import AsyncClient
+from pyunicore.aio import AsyncJob
+from pyunicore.aio import AsyncResource
+from pyunicore.aio import AsyncTransport
+from pyunicore.client import JobStatus
+from pyunicore.credentials import UsernamePassword
+from pyunicore.httpserver import BackgroundHTTPServer
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _send(self, status, body=b"", headers={}):
+        self.send_response(status)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, doc):
+        self._send(
+            200,
+            json.dumps(doc).encode(),
+            {"Content-Type": "application/json", "X-UNICORE-SecuritySession": "s1"},
+        )
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding") != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        data = b""
+        while True:
+            size = int(self.rfile.readline().strip(), 16)
+            data += self.rfile.read(size)
+            self.rfile.readline()
+            if size == 0:
+                return data
+
+    def _link(self, path):
+        return {"href": self.server.base + path}
+
+    def do_GET(self):  # noqa: N802
+        self.server.seen_headers.append(dict(self.headers))
+        if self.headers.get("X-UNICORE-SecuritySession") == "expired":
+            self._send(432)
+        elif self.path == "/rest/core":
+            self._json(
+                {
+                    "client": {"role": {"selected": "user"}},
+                    "_links": {"jobs": self._link("/rest/core/jobs")},
+                }
+            )
+        elif self.path == "/rest/core/jobs/1":
+            self._json(
+                {
+                    "status": "SUCCESSFUL",
+                    "_links": {
+                        "action:start": self._link("/rest/core/jobs/1/actions/start"),
+                        "workingDirectory": self._link("/rest/core/storages/1"),
+                    },
+                }
+            )
+        elif self.path == "/rest/core/storages/1":
+            self._json({"resourceStatus": "READY", "_links": {}})
+        elif self.path.startswith("/rest/core/storages/1/files/"):
+            if self.headers.get("Accept") == "application/json":
+                self._json({"isDirectory": False, "size": len(self.server.files[self.path])})
+                return
+            data = self.server.files[self.path]
+            r = self.headers.get("Range")
+            if r:
+                start, end = r.split("=")[1].split("-")
+                start, stop = int(start), int(end) + 1
+                data = data[start:stop]
+            self._send(200, data, {"Content-Type": "application/octet-stream"})
+        else:
+            self._send(404)
+
+    def do_POST(self):  # noqa: N802
+        self._read_body()
+        if self.path == "/rest/core/jobs":
+            self._send(201, headers={"Location": self.server.base + "/rest/core/jobs/1"})
+        else:
+            self.server.actions.append(self.path)
+            self._send(200, b"{}")
+
+    def do_PUT(self):  # noqa: N802
+        self.server.files[self.path] = self._read_body()
+        self._send(204)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestAsyncClient(unittest.TestCase):
+    def setUp(self):
+        self.server = BackgroundHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.base = self.server.base_url
+        self.server.files = {}
+        self.server.actions = []
+        self.server.seen_headers = []
+        self.server.start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_job_and_files(self):
+        print("*** test_job_and_files")
+
+        async def run():
+            async with AsyncTransport(self.credential) as tr:
+                client = AsyncClient(tr, self.server.base + "/rest/core")
+                await client.assert_authentication()
+                job = await client.new_job({"Executable": "date"}, autostart=True)
+                await job.poll()
+                self.assertEqual(JobStatus.SUCCESSFUL, await job.status())
+                wd = await job.working_dir()
+                await wd.put(io.BytesIO(b"some test data"), "in.txt")
+                files = await asyncio.gather(*[wd.stat("in.txt") for _ in range(10)])
+                for f in files:
+                    out = io.BytesIO()
+                    await f.download(out)
+                    self.assertEqual(b"some test data", out.getvalue())
+                    chunks = [c async for c in f.iter_bytes(offset=5, size=4)]
+                    self.assertEqual(b"test", b"".join(chunks))
+
+        asyncio.run(run())
+        self.assertEqual(["/rest/core/jobs/1/actions/start"], self.server.actions)
+
+    def test_local_files(self):
+        print("*** test_local_files")
+
+        class SlowFile(io.BytesIO):
+            def read(self, size=-1):
+                time.sleep(0.05)
+                return super().read(size)
+
+        async def ticker(ticks):
+            while True:
+                await asyncio.sleep(0.005)
+                ticks.append(1)
+
+        async def run(tmp):
+            async with AsyncTransport(self.credential) as tr:
+                client = AsyncClient(tr, self.server.base + "/rest/core")
+                job = await client.new_job({"Executable": "date"})
+                wd = await job.working_dir()
+                ticks = []
+                task = asyncio.ensure_future(ticker(ticks))
+                # reading the file does not block the event loop
+                await wd.put(SlowFile(b"some test data"), "in.txt")
+                task.cancel()
+                self.assertGreater(len(ticks), 5)
+                await wd.upload(os.path.join(tmp, "local.txt"), "local.txt")
+                f = await wd.stat("local.txt")
+                await f.download(os.path.join(tmp, "out.txt"))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "local.txt"), "wb") as fd:
+                fd.write(b"local data")
+            asyncio.run(run(tmp))
+            with open(os.path.join(tmp, "out.txt"), "rb") as fd:
+                self.assertEqual(b"local data", fd.read())
+
+    def test_security_sessions_and_preferences(self):
+        print("*** test_security_sessions_and_preferences")
+
+        async def run():
+            tr = AsyncTransport(self.credential)
+            tr.preferences = "uid:demouser"
+            client = AsyncClient(tr, self.server.base + "/rest/core")
+            await client.properties()
+            self.assertEqual("s1", client.transport.last_session_id)
+            client.transport.last_session_id = "expired"
+            client.transport.settings_changed = True
+            await client.properties()
+            self.assertEqual("s1", client.transport.last_session_id)
+            await tr.aclose()
+
+        asyncio.run(run())
+        headers = self.server.seen_headers
+        self.assertEqual(3, len(headers))
+        self.assertEqual("uid:demouser", headers[0]["X-UNICORE-User-Preferences"])
+        self.assertNotIn("X-UNICORE-SecuritySession", headers[2])
+
+    def test_prefetch(self):
+        print("*** test_prefetch")
+
+        async def run():
+            async with AsyncTransport(self.credential) as tr:
+                jobs = [AsyncJob(tr, self.server.base + "/rest/core/jobs/1") for _ in range(5)]
+                jobs.append(AsyncJob(tr, self.server.base + "/rest/core/jobs/missing"))
+                errors = await AsyncResource.prefetch(jobs)
+                self.assertEqual([jobs[5].resource_url], list(errors))
+                results, errors = await tr.get_many([j.resource_url for j in jobs])
+                self.assertEqual("SUCCESSFUL", results[jobs[0].resource_url]["status"])
+                self.assertEqual(1, len(errors))
+
+        asyncio.run(run())
+        self.assertEqual(8, len(self.server.seen_headers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import json
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from pyunicore.cache import CacheEntry
+from pyunicore.cache import ResourceCache
+from pyunicore.client import Job
+from pyunicore.client import JobStatus
+from pyunicore.client import Transport
+from pyunicore.credentials import UsernamePassword
+from pyunicore.httpserver import BackgroundHTTPServer
+
+
+class ETagHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # noqa: N802
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.version += 1
+        self.server.status = "QUEUED"
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):  # noqa: N802
+        etag = '"%s"' % self.server.version
+        self.server.requests += 1
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        props = {
+            "status": self.server.status,
+            "log": ["x" * 1000],
+            "_links": {"action:restart": {"href": self.server.base + "/actions/restart"}},
+        }
+        body = json.dumps(props).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestPropertiesCache(unittest.TestCase):
+    def setUp(self):
+        self.server = BackgroundHTTPServer(("127.0.0.1", 0), ETagHandler)
+        self.server.version = 1
+        self.server.status = "QUEUED"
+        self.server.requests = 0
+        self.server.base = self.server.base_url
+        self.url = self.server.base + "/rest/core/jobs/1"
+        self.server.start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_conditional_get(self):
+        print("*** test_conditional_get")
+        job = Job(Transport(self.credential), self.url, cache_time=0)
+        stats = job.transport.cache_statistics
+        for _ in range(5):
+            self.assertEqual(JobStatus.QUEUED, job.status)
+        self.assertEqual(5, self.server.requests)
+        self.assertEqual(1, stats.misses)
+        self.assertEqual(4, stats.not_modified)
+        self.server.version = 2
+        self.server.status = "RUNNING"
+        self.assertEqual(JobStatus.RUNNING, job.status)
+        self.assertEqual(2, stats.misses)
+        print(stats)
+
+    def test_cache_time_hits(self):
+        print("*** test_cache_time_hits")
+        tr = Transport(self.credential)
+        job = Job(tr, self.url, cache_time=60)
+        for _ in range(4):
+            job.properties
+        self.assertEqual(1, self.server.requests)
+        self.assertIs(tr.cache_statistics, job.transport.cache_statistics)
+        self.assertEqual(3, tr.cache_statistics.hits)
+        self.assertEqual(0.75, tr.cache_statistics.hit_ratio)
+
+    def test_shared_cache(self):
+        print("*** test_shared_cache")
+        cache = ResourceCache(ttls={"Job": 60})
+        tr = Transport(self.credential, resource_cache=cache)
+        for _ in range(5):
+            Job(tr, self.url, cache_time=0).properties
+        self.assertEqual(1, self.server.requests)
+        other_user = Transport(UsernamePassword("otheruser", "test123"), resource_cache=cache)
+        Job(other_user, self.url).properties
+        self.assertEqual(2, self.server.requests)
+        self.assertEqual(2, len(cache))
+        tr = Transport(self.credential, resource_cache=ResourceCache(ttls={"Job": 0}))
+        Job(tr, self.url).properties
+        Job(tr, self.url).properties
+        self.assertEqual(4, self.server.requests)
+        self.assertEqual(1, tr.cache_statistics.not_modified)
+
+    def test_immutable_final_state(self):
+        print("*** test_immutable_final_state")
+        self.server.status = "SUCCESSFUL"
+        cache = ResourceCache(ttls={"Job": 0})
+        tr = Transport(self.credential, resource_cache=cache)
+        job = Job(tr, self.url, cache_time=0)
+        for _ in range(5):
+            self.assertEqual(JobStatus.SUCCESSFUL, Job(tr, self.url, cache_time=0).status)
+        self.assertEqual(1, self.server.requests)
+        job.restart()
+        self.assertEqual(JobStatus.QUEUED, job.status)
+        self.assertEqual(2, self.server.requests)
+
+    def test_lru_eviction(self):
+        print("*** test_lru_eviction")
+        cache = ResourceCache(max_entries=3, max_bytes=300)
+        for i in range(3):
+            cache.put(i, CacheEntry({}, None, None, 100, None, None, False))
+        cache.get(0)
+        cache.put(3, CacheEntry({}, None, None, 100, None, None, False))
+        self.assertIsNone(cache.get(1))
+        self.assertIsNotNone(cache.get(0))
+        cache.put(4, CacheEntry({}, None, None, 150, None, None, False))
+        self.assertEqual(2, len(cache))
+        self.assertEqual(250, cache.size)
+        self.assertEqual(3, cache.evictions)
+
+
+if __name__ == "__main__":
+    unittest.main()
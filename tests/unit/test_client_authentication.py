@@ -0,0 +1,66 @@
+import unittest
+
+from pyunicore.client import Client
+from pyunicore.client import Registry
+from pyunicore.credentials import AuthenticationFailedException
+from pyunicore.credentials import Credential
+from pyunicore.credentials import UsernamePassword
+from pyunicore.testing import FakeUNICORE
+
+CORE_URL = ("GET", "/DEMO-SITE/rest/core")
+
+
+class NoAuthorization(Credential):
+    def get_auth_header(self):
+        return None
+
+
+class TestClientAuthentication(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeUNICORE().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def core_requests(self):
+        return self.server.statistics()["requests"].get(CORE_URL, 0)
+
+    def test_lazy_check(self):
+        print("*** test_lazy_check")
+        credential = UsernamePassword("demouser", "test123")
+        clients = [Client(credential, self.server.site_url) for _ in range(10)]
+        self.assertEqual(0, self.server.statistics()["total"])
+        clients[0].get_storages()
+        self.assertEqual(1, self.core_requests())
+        # successful check is remembered
+        for client in clients:
+            client.assert_authentication()
+        self.assertEqual(1, self.core_requests())
+        registry = Registry(credential, self.server.registry_url)
+        registry.site("DEMO-SITE").assert_authentication()
+        self.assertEqual(1, self.core_requests())
+
+    def test_failed_check(self):
+        print("*** test_failed_check")
+        client = Client(NoAuthorization(), self.server.site_url)
+        self.assertEqual(0, self.server.statistics()["total"])
+        self.assertRaises(AuthenticationFailedException, client.get_storages)
+        self.assertRaises(AuthenticationFailedException, client.assert_authentication)
+        unchecked = Client(NoAuthorization(), self.server.site_url, check_authentication=False)
+        self.assertEqual("anonymous", unchecked.access_info()["role"]["selected"])
+
+    def test_preferences_change(self):
+        print("*** test_preferences_change")
+        client = Client(UsernamePassword("demouser", "test123"), self.server.site_url)
+        client.assert_authentication()
+        self.assertEqual(1, self.core_requests())
+        client.transport.preferences = "uid:demouser"
+        client.assert_authentication()
+        self.assertEqual(2, self.core_requests())
+        client.transport.preferences = None
+        client.assert_authentication()
+        self.assertEqual(2, self.core_requests())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import time
+import unittest
+
+from pyunicore.codec import JSONCodec
+from pyunicore.codec import get_codec
+
+
+def _listing(n):
+    """a storage listing with n files, as returned by UNICORE"""
+    content = {}
+    for i in range(n):
+        content["/data/file_%s.dat" % i] = {
+            "owner": "demouser",
+            "isDirectory": False,
+            "size": i * 1024,
+            "permissions": "rw-r--r--",
+            "lastAccessed": "2024-10-01T12:00:00+0200",
+            "metadata": {"comment": "generated file %s" % i},
+        }
+    return {"isDirectory": True, "content": content}
+
+
+def _job_list(n):
+    base = "https://localhost:8080/DEMO-SITE/rest/core/jobs/"
+    return {"jobs": [base + "%08d-0000-0000-0000-000000000000" % i for i in range(n)]}
+
+
+def _available_codecs():
+    codecs = []
+    for name in ["orjson", "ujson", "json"]:
+        try:
+            codecs.append(get_codec(name))
+        except ValueError:
+            pass
+    return codecs
+
+
+class TestCodec(unittest.TestCase):
+    def test_default_codec(self):
+        print("*** test_default_codec")
+        codec = get_codec()
+        print("Default JSON codec: %s" % codec.name)
+        self.assertIs(codec, get_codec())
+        self.assertIsInstance(codec, JSONCodec)
+        self.assertRaises(ValueError, get_codec, "no-such-codec")
+
+    def test_roundtrip(self):
+        print("*** test_roundtrip")
+        doc = {"Executable": "date", "Arguments": ["ä", "ö"], "Resources": {"Nodes": 1}}
+        for codec in _available_codecs():
+            self.assertEqual(doc, codec.loads(codec.dumps(doc)))
+            self.assertEqual(doc, json.loads(codec.dumps(doc)))
+            self.assertEqual({"1": 2}, json.loads(codec.dumps({1: 2})))
+
+    def test_decoding_benchmark(self):
+        print("*** test_decoding_benchmark")
+        payloads = {
+            "file listing (20000 entries)": json.dumps(_listing(20000)).encode(),
+            "job list (50000 entries)": json.dumps(_job_list(50000)).encode(),
+        }
+        for name, data in payloads.items():
+            reference = None
+            for codec in _available_codecs():
+                start = time.perf_counter()
+                result = codec.loads(data)
+                duration = time.perf_counter() - start
+                print(f"{name}, {len(data)} bytes, {codec.name}: {1000*duration:.1f} ms")
+                if reference is None:
+                    reference = result
+                self.assertEqual(reference, result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import io
+import unittest
+
+import requests
+
+from pyunicore.client import Client
+from pyunicore.client import Transport
+from pyunicore.compression import CompressionStatistics
+from pyunicore.compression import accept_encoding
+from pyunicore.compression import compress
+from pyunicore.credentials import UsernamePassword
+from pyunicore.testing import FakeUNICORE
+
+
+def _text(lines):
+    return "".join("step %s: computing energy ... done\n" % i for i in range(lines)).encode()
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeUNICORE(compression=True).start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_accept_encoding(self):
+        print("*** test_accept_encoding")
+        self.assertEqual("gzip", accept_encoding("gzip"))
+        self.assertRaises(ValueError, accept_encoding, "no-such-encoding")
+        self.assertRaises(ValueError, Transport, self.credential, compression="foo")
+
+    def test_compress(self):
+        print("*** test_compress")
+        import gzip
+
+        stats = CompressionStatistics()
+        data = _text(1000)
+        for source in [data, io.BytesIO(data), data.decode()]:
+            self.assertEqual(data, gzip.decompress(b"".join(compress(source, "gzip", stats))))
+        print(stats.statistics())
+        self.assertEqual(3, stats.statistics()["upload"]["transfers"])
+        self.assertTrue(stats.ratio("upload") > 5)
+
+    def test_compressed_transfers(self):
+        print("*** test_compressed_transfers")
+        tr = Transport(self.credential, compression="gzip")
+        home = Client(tr, self.server.site_url).get_storages()[0]
+        data = _text(10000)
+        home.put(data, "out.txt", compression="gzip")
+        for i in range(100):
+            home.put(b"", "dir/file_%s.txt" % i)
+        self.assertEqual(100, len(home.listdir("dir")))
+        f = home.stat("out.txt")
+        self.assertEqual(len(data), f.size())
+        out = io.BytesIO()
+        f.download(out)
+        self.assertEqual(data, out.getvalue())
+        self.assertEqual(data[100:200], f.raw(offset=100, size=100).read())
+        stats = tr.compression_statistics.statistics()
+        print(stats)
+        for direction in ("upload", "download", "response"):
+            self.assertTrue(stats[direction]["ratio"] > 5)
+        self.assertEqual(len(data), stats["download"]["decoded_bytes"])
+        self.assertEqual(len(data), stats["upload"]["decoded_bytes"])
+
+    def test_unsupported_upload_compression(self):
+        print("*** test_unsupported_upload_compression")
+        self.server.compression = False
+        home = Client(self.credential, self.server.site_url).get_storages()[0]
+        self.assertRaises(
+            requests.HTTPError, home.put, b"test data", "test.txt", compression="gzip"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
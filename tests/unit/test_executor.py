@@ -0,0 +1,91 @@
+import os
+import tempfile
+import threading
+import unittest
+
+import requests
+
+from pyunicore.client import Client
+from pyunicore.client import JobStatus
+from pyunicore.credentials import UsernamePassword
+from pyunicore.executor import UNICOREExecutor
+from pyunicore.testing import FakeUNICORE
+
+
+class TestExecutor(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeUNICORE(job_queue_time=0.05, job_run_time=0.05).start()
+        self.client = Client(UsernamePassword("demouser", "test123"), self.server.site_url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_submit(self):
+        print("*** test_submit")
+        with UNICOREExecutor(self.client, poll_interval=0.02) as executor:
+            ok = executor.submit({"Executable": "date"})
+            failed = executor.submit({"Executable": "false"})
+            self.assertEqual(JobStatus.SUCCESSFUL, ok.result(timeout=5).status)
+            self.assertEqual(JobStatus.FAILED, failed.result(timeout=5).status)
+            self.assertEqual(0, executor.in_flight)
+            self.assertEqual(1, executor.counts()[JobStatus.FAILED])
+        self.assertRaises(RuntimeError, executor.submit, {"Executable": "date"})
+
+    def test_map(self):
+        print("*** test_map")
+        in_flight = []
+        with UNICOREExecutor(self.client, max_in_flight=5, poll_interval=0.02) as executor:
+            done = threading.Event()
+
+            def monitor():
+                while not done.wait(0.005):
+                    in_flight.append(executor.in_flight)
+
+            threading.Thread(target=monitor, daemon=True).start()
+            jobs = list(
+                executor.map(lambda n: {"Executable": "date", "Name": "job%s" % n}, range(30))
+            )
+            done.set()
+        self.assertEqual(["job%s" % n for n in range(30)], [j.properties["name"] for j in jobs])
+        self.assertEqual(30, len(self.server.jobs))
+        self.assertLessEqual(max(in_flight), 5)
+        self.assertEqual(5, max(in_flight))
+
+    def test_inputs(self):
+        print("*** test_inputs")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "input.txt")
+            with open(path, "w") as f:
+                f.write("some input")
+            with UNICOREExecutor(self.client, poll_interval=0.02) as executor:
+                job = executor.submit({"Executable": "date"}, {"data.txt": path}).result(5)
+        self.assertEqual(JobStatus.SUCCESSFUL, job.status)
+        self.assertIn("data.txt", job.working_dir.listdir())
+
+    def test_submit_error(self):
+        print("*** test_submit_error")
+        with UNICOREExecutor(self.client, max_in_flight=1, poll_interval=0.02) as executor:
+            self.server.fail_next(status=400)
+            failed = executor.submit({"Executable": "date"})
+            ok = executor.submit({"Executable": "date"})
+            self.assertRaises(requests.HTTPError, failed.result, 5)
+            self.assertEqual(JobStatus.SUCCESSFUL, ok.result(5).status)
+
+    def test_shutdown(self):
+        print("*** test_shutdown")
+        self.server.job_queue_time = 0.5
+        executor = UNICOREExecutor(self.client, max_in_flight=1, poll_interval=0.02)
+        futures = [executor.submit({"Executable": "date"}) for _ in range(5)]
+        self.assertEqual(4, executor.queued)
+        executor.shutdown(cancel_futures=True)
+        self.assertEqual(JobStatus.SUCCESSFUL, futures[0].result().status)
+        self.assertTrue(all(f.cancelled() for f in futures[1:]))
+        self.assertEqual(1, len(self.server.jobs))
+
+    def test_invalid_settings(self):
+        print("*** test_invalid_settings")
+        self.assertRaises(ValueError, UNICOREExecutor, self.client, max_in_flight=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
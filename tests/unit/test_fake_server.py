@@ -0,0 +1,157 @@
+import io
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from pyunicore.client import Client
+from pyunicore.client import JobStatus
+from pyunicore.client import Registry
+from pyunicore.client import TransferStatus
+from pyunicore.client import Transport
+from pyunicore.credentials import Anonymous
+from pyunicore.credentials import AuthenticationFailedException
+from pyunicore.credentials import UsernamePassword
+from pyunicore.retry import RetryPolicy
+from pyunicore.testing import FakeUNICORE
+
+
+class TestFakeServer(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeUNICORE().start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_registry(self):
+        print("*** test_registry")
+        registry = Registry(self.credential, self.server.registry_url)
+        self.assertEqual({"DEMO-SITE": self.server.site_url}, registry.site_urls)
+        client = registry.site("DEMO-SITE")
+        self.assertEqual((10, 1, 0), client.server_version_info())
+        self.assertEqual("user", client.access_info()["role"]["selected"])
+        anon = Client(Anonymous(), self.server.site_url)
+        self.assertRaises(AuthenticationFailedException, anon.assert_authentication)
+
+    def test_jobs(self):
+        print("*** test_jobs")
+        client = Client(self.credential, self.server.site_url)
+        with tempfile.NamedTemporaryFile() as f:
+            f.write(b"input data")
+            f.flush()
+            job = client.new_job({"Executable": "cat in.txt", "Tags": ["t1"]}, {"in.txt": f.name})
+        job.poll()
+        self.assertEqual(JobStatus.SUCCESSFUL, job.status)
+        wd = job.working_dir
+        self.assertEqual(["in.txt", "stderr", "stdout"], sorted(wd.listdir().keys()))
+        failed = client.new_job({"Executable": "false"})
+        failed.poll()
+        self.assertEqual(JobStatus.FAILED, failed.status)
+        self.assertEqual(2, len(client.get_jobs()))
+        self.assertEqual(1, len(client.get_jobs(tags=["t1"])))
+        self.assertEqual(1, len(client.get_jobs(offset=1)))
+        failed.delete()
+        self.assertEqual(1, len(client.get_jobs()))
+
+    def test_job_states(self):
+        print("*** test_job_states")
+        self.server.job_queue_time = 0.2
+        self.server.job_run_time = 0.2
+        client = Client(self.credential, self.server.site_url)
+        job = client.new_job({"Executable": "date"})
+        job.cache_time = 0
+        self.assertEqual(JobStatus.QUEUED, job.status)
+        time.sleep(0.25)
+        self.assertEqual(JobStatus.RUNNING, job.status)
+        job.abort()
+        self.assertEqual(JobStatus.FAILED, job.status)
+
+    def test_files(self):
+        print("*** test_files")
+        client = Client(self.credential, self.server.site_url)
+        home = client.get_storages()[0]
+        data = bytes(range(256)) * 100
+        home.put(io.BytesIO(data), "folder/data.bin")
+        home.mkdir("empty")
+        self.assertEqual(["empty/", "folder/"], sorted(home.listdir().keys()))
+        f = home.stat("folder/data.bin")
+        self.assertTrue(f.isfile())
+        self.assertEqual(len(data), f.size())
+        out = io.BytesIO()
+        f.download(out)
+        self.assertEqual(data, out.getvalue())
+        self.assertEqual(data[100:150], f.raw(offset=100, size=50).read())
+        self.assertEqual(data[-10:], f.raw(offset=len(data) - 10).read())
+        home.copy("folder/data.bin", "copy.bin")
+        home.rename("copy.bin", "renamed.bin")
+        self.assertEqual(len(data), home.stat("renamed.bin").size())
+        home.rmdir("folder")
+        self.assertRaises(requests.HTTPError, home.stat, "folder/data.bin")
+
+    def test_transfers(self):
+        print("*** test_transfers")
+        client = Client(self.credential, self.server.site_url)
+        home = client.get_storages()[0]
+        home.put(b"some data", "source.txt")
+        target = home.resource_url + "/files/target.txt"
+        transfer = home.send_file("source.txt", target, protocol="UFTP")
+        transfer.poll()
+        self.assertEqual(TransferStatus.DONE, transfer.status)
+        self.assertEqual(9, home.stat("target.txt").size())
+        transfer = home.receive_file("https://elsewhere/storages/X/files/f", "f.txt")
+        self.assertEqual(TransferStatus.FAILED, transfer.status)
+        self.assertEqual(2, len(client.get_transfers()))
+
+    def test_failure_injection(self):
+        print("*** test_failure_injection")
+        policy = RetryPolicy(backoff_factor=0.01)
+        tr = Transport(self.credential, retry_policy=policy)
+        self.server.fail_next(2)
+        client = Client(tr, self.server.site_url)
+        client.assert_authentication()
+        self.assertEqual(2, policy.statistics()["retries"])
+        self.server.fail_next(1, status=500)
+        self.assertRaises(requests.HTTPError, client.get_storages)
+        self.server.failure_rate = 1.0
+        self.assertRaises(requests.HTTPError, client.get_jobs)
+        stats = policy.statistics()
+        self.assertEqual(5, stats["retries"])
+        self.assertEqual(1, stats["exhausted"])
+
+    def test_concurrent_downloads(self):
+        print("*** test_concurrent_downloads")
+        client = Client(self.credential, self.server.site_url)
+        home = client.get_storages()[0]
+        home.put(io.BytesIO(b"x" * 10000), "data.bin")
+        f = home.stat("data.bin")
+        # each download takes 0.1 seconds
+        self.server.bandwidth = 100000
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(lambda _: f.raw().read(), range(5)))
+        self.assertEqual([b"x" * 10000] * 5, results)
+        # the downloads are not serialized by the server
+        self.assertLess(time.perf_counter() - start, 0.4)
+
+    def test_latency_and_sessions(self):
+        print("*** test_latency_and_sessions")
+        self.server.latency = 0.05
+        client = Client(self.credential, self.server.site_url)
+        start = time.perf_counter()
+        client.get_storages()
+        self.assertTrue(time.perf_counter() - start >= 0.05)
+        self.server.latency = 0
+        self.server.expire_sessions()
+        client.get_storages()
+        stats = self.server.statistics()
+        print(stats)
+        self.assertEqual(2, stats["authentications"])
+        # including the request rejected because of the expired session
+        self.assertEqual(3, stats["requests"][("GET", "/DEMO-SITE/rest/core/storages")])
+
+
+if __name__ == "__main__":
+    unittest.main()
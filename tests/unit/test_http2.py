@@ -0,0 +1,91 @@
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+
+import requests
+
+from pyunicore.client import Client
+from pyunicore.client import Transport
+from pyunicore.credentials import UsernamePassword
+from pyunicore.http2 import HTTP2Adapter
+from pyunicore.http2 import is_available
+from pyunicore.testing import FakeUNICORE
+
+
+@unittest.skipUnless(
+    is_available() and find_spec("cryptography"), "requires 'httpx', 'h2' and 'cryptography'"
+)
+class TestHTTP2(unittest.TestCase):
+    def setUp(self):
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def test_multiplexing(self):
+        print("*** test_multiplexing")
+        with FakeUNICORE(http2=True, latency=0.01) as server:
+            tr = Transport(self.credential, http2=True)
+            self.assertIsInstance(tr.session.get_adapter(server.site_url), HTTP2Adapter)
+            client = Client(tr, server.site_url)
+            urls = [client.new_job({"Executable": "date"}).resource_url for _ in range(50)]
+            results, errors = tr.get_many(urls, max_workers=50)
+            self.assertEqual(50, len(results))
+            self.assertEqual({}, errors)
+            # all requests share a single connection
+            self.assertEqual({"HTTP/2": 1}, server.statistics()["connections"])
+            res = tr.get(url=server.site_url, to_json=False)
+            self.assertEqual("HTTP/2", res.raw.http_version)
+
+    def test_files(self):
+        print("*** test_files")
+        with FakeUNICORE(http2=True, compression=True) as server:
+            tr = Transport(self.credential, http2=True, compression="gzip")
+            home = Client(tr, server.site_url).get_storages()[0]
+            data = b"some test data\n" * 20000
+            home.put(io.BytesIO(data), "data.txt")
+            f = home.stat("data.txt")
+            out = io.BytesIO()
+            f.download(out)
+            self.assertEqual(data, out.getvalue())
+            self.assertEqual(data[15:29], f.raw(offset=15, size=14).read())
+            self.assertTrue(tr.compression_statistics.ratio("download") > 10)
+            self.assertRaises(requests.HTTPError, home.stat, "no_such_file")
+
+    def test_fallback(self):
+        print("*** test_fallback")
+        # server without HTTP/2 support
+        with FakeUNICORE(tls=True) as server:
+            tr = Transport(self.credential, http2=True)
+            res = tr.get(url=server.site_url, to_json=False)
+            self.assertEqual("HTTP/1.1", res.raw.http_version)
+            self.assertEqual({"HTTP/1.1": 1}, server.statistics()["connections"])
+        # plain http is always using HTTP/1.1
+        with FakeUNICORE() as server:
+            tr = Transport(self.credential, http2=True)
+            self.assertEqual(1, len(Client(tr, server.site_url).get_storages()))
+
+    def test_concurrent_fallback(self):
+        print("*** test_concurrent_fallback")
+        with FakeUNICORE(tls=True, latency=0.05) as server:
+            tr = Transport(self.credential, http2=True)
+            adapter = tr.session.get_adapter(server.site_url)
+            with ThreadPoolExecutor(max_workers=10) as pool:
+                clients = set(pool.map(lambda _: adapter._client(False, None, None)[0], range(10)))
+            self.assertEqual(1, len(clients))
+            client = Client(tr, server.site_url)
+            urls = [client.new_job({"Executable": "date"}).resource_url for _ in range(10)]
+            results, errors = tr.get_many(urls, max_workers=10)
+            self.assertEqual({}, errors)
+            # HTTP/1.1 needs one connection per concurrent request
+            self.assertGreater(server.statistics()["connections"]["HTTP/1.1"], 1)
+
+    def test_connection_error(self):
+        print("*** test_connection_error")
+        server = FakeUNICORE(http2=True)
+        url = server.site_url
+        server.stop()
+        tr = Transport(self.credential, http2=True)
+        self.assertRaises(requests.ConnectionError, tr.get, url=url)
+
+
+if __name__ == "__main__":
+    unittest.main()
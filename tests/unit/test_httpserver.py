@@ -0,0 +1,32 @@
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+import requests
+
+from pyunicore.httpserver import BackgroundHTTPServer
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):  # noqa: N802
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestBackgroundHTTPServer(unittest.TestCase):
+    def test_start_stop(self):
+        print("*** test_start_stop")
+        with BackgroundHTTPServer(("127.0.0.1", 0), Handler) as server:
+            self.assertEqual(204, requests.get(server.base_url).status_code)
+            start = time.perf_counter()
+        self.assertLess(time.perf_counter() - start, 0.2)
+        self.assertRaises(requests.ConnectionError, requests.get, server.base_url)
+        # stopping a server that was never started
+        BackgroundHTTPServer(("127.0.0.1", 0), Handler).stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+from concurrent.futures import wait
+
+import requests
+
+from pyunicore.client import Client
+from pyunicore.client import JobStatus
+from pyunicore.credentials import UsernamePassword
+from pyunicore.testing import FakeUNICORE
+from pyunicore.watcher import JobWatcher
+
+JOB_URL = ("GET", "/DEMO-SITE/rest/core/jobs/{id}")
+
+
+class TestJobWatcher(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeUNICORE(job_queue_time=0.2, job_run_time=0.2).start()
+        self.client = Client(UsernamePassword("demouser", "test123"), self.server.site_url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_refresh(self):
+        print("*** test_refresh")
+        # jobs stay QUEUED until the queue time is reset below
+        self.server.job_queue_time = 3600
+        jobs = [self.client.new_job({"Executable": "date"}) for _ in range(10)]
+        jobs.append(self.client.new_job({"Executable": "false"}))
+        watcher = JobWatcher(max_requests=4)
+        changes = []
+        watcher.add_callback(lambda job, old, new: changes.append((job.job_id, old, new)))
+        futures = [watcher.add(job) for job in jobs]
+        self.assertIs(futures[0], watcher.add(jobs[0]))
+        self.assertEqual(11, watcher.counts()[JobStatus.UNDEFINED])
+        self.server.reset_statistics()
+        # request budget: one batch per refresh
+        self.assertEqual(11, watcher.refresh())
+        self.assertEqual(4, self.server.statistics()["requests"][JOB_URL])
+        self.assertEqual(7, watcher.counts()[JobStatus.UNDEFINED])
+        self.assertEqual(4, len(changes))
+        self.assertEqual((jobs[0].job_id, JobStatus.UNDEFINED, JobStatus.QUEUED), changes[0])
+        self.server.job_queue_time = 0
+        self.server.job_run_time = 0
+        while watcher.refresh() > 0:
+            pass
+        wait(futures, timeout=1)
+        self.assertIs(jobs[3], futures[3].result())
+        counts = watcher.counts()
+        self.assertEqual(10, counts[JobStatus.SUCCESSFUL])
+        self.assertEqual(1, counts[JobStatus.FAILED])
+        # finished jobs are not checked any more
+        self.server.reset_statistics()
+        watcher.refresh()
+        self.assertEqual({}, self.server.statistics()["requests"])
+
+    def test_run(self):
+        print("*** test_run")
+        watcher = JobWatcher(max_requests=20, interval=0.05)
+        futures = [watcher.add(self.client.new_job({"Executable": "date"})) for _ in range(50)]
+        watcher.run(timeout=5)
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertEqual(50, watcher.counts()[JobStatus.SUCCESSFUL])
+        self.assertEqual(0, watcher.errors)
+
+    def test_background(self):
+        print("*** test_background")
+        with JobWatcher(max_requests=10, interval=0.02) as watcher:
+            jobs = [self.client.new_job({"Executable": "date"}) for _ in range(20)]
+            futures = [watcher.add(job) for job in jobs]
+            watcher.remove(jobs[0])
+            self.assertTrue(futures[0].cancelled())
+            done, not_done = wait(futures[1:], timeout=5)
+            self.assertEqual(0, len(not_done))
+        self.assertEqual(19, watcher.counts()[JobStatus.SUCCESSFUL])
+
+    def test_remove(self):
+        print("*** test_remove")
+        jobs = [self.client.new_job({"Executable": "date"}) for _ in range(3)]
+        watcher = JobWatcher()
+        for job in jobs:
+            watcher.add(job)
+        watcher.remove(jobs[0])
+        self.assertEqual(2, watcher.pending)
+        watcher.remove(jobs[0])
+        future = watcher.add(jobs[0])
+        watcher.add(jobs[0])
+        self.assertEqual(3, watcher.pending)
+        self.server.reset_statistics()
+        watcher.refresh()
+        self.assertEqual(3, watcher.requests)
+        self.assertEqual(3, self.server.statistics()["requests"][JOB_URL])
+        self.assertFalse(future.cancelled())
+
+    def test_deleted_job(self):
+        print("*** test_deleted_job")
+        job = self.client.new_job({"Executable": "date"})
+        watcher = JobWatcher()
+        future = watcher.add(job)
+        job.delete()
+        watcher.refresh()
+        self.assertRaises(requests.HTTPError, future.result, 1)
+        self.assertEqual(0, watcher.pending)
+
+    def test_add_all(self):
+        print("*** test_add_all")
+        self.client.new_job({"Executable": "date", "Tags": ["test"]})
+        self.client.new_job({"Executable": "date"})
+        watcher = JobWatcher()
+        self.assertEqual(1, len(watcher.add_all(self.client, tags=["test"])))
+        self.assertEqual(2, len(watcher.add_all(self.client)))
+        self.assertEqual(2, watcher.pending)
+
+    def test_invalid_settings(self):
+        print("*** test_invalid_settings")
+        self.assertRaises(ValueError, JobWatcher, max_requests=0)
+        self.assertRaises(ValueError, JobWatcher, max_workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
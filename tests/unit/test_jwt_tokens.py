@@ -1,8 +1,18 @@
+import threading
+import time
 import unittest
 
 import pyunicore.credentials as uc_credentials
 
 
+class CountingJWTToken(uc_credentials.JWTToken):
+    created = 0
+
+    def create_token(self):
+        self.created += 1
+        return super().create_token()
+
+
 class TestJWTCredentials(unittest.TestCase):
     def setUp(self):
         pass
@@ -18,6 +28,45 @@ class TestJWTCredentials(unittest.TestCase):
         )
         print(credential.create_token())
 
+    def test_token_caching(self):
+        print("*** test_token_caching")
+        credential = CountingJWTToken("CN=Demouser", None, secret="test123", algorithm="HS256")
+        h1 = credential.get_auth_header()
+        threads = [
+            threading.Thread(target=lambda: [credential.get_auth_header() for _ in range(100)])
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(h1, credential.get_auth_header())
+        self.assertEqual(1, credential.created)
+
+    def test_token_renewal(self):
+        print("*** test_token_renewal")
+        credential = CountingJWTToken(
+            "CN=Demouser", None, secret="test123", algorithm="HS256", lifetime=10, renewal_margin=10
+        )
+        for _ in range(3):
+            credential.get_auth_header()
+        self.assertEqual(3, credential.created)
+
+    def test_header_generation_rate(self):
+        print("*** test_header_generation_rate")
+        n = 2000
+        credential = uc_credentials.JWTToken("CN=Demouser", None, "test123", algorithm="HS256")
+        start = time.perf_counter()
+        for _ in range(n):
+            credential.create_token()
+        signing = n / (time.perf_counter() - start)
+        start = time.perf_counter()
+        for _ in range(n):
+            credential.get_auth_header()
+        cached = n / (time.perf_counter() - start)
+        print(f"Headers per second: {signing:.0f} (signing), {cached:.0f} (cached)")
+        self.assertGreater(cached, signing)
+
 
 if __name__ == "__main__":
     unittest.main()
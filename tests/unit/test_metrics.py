@@ -0,0 +1,95 @@
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+import requests
+
+from pyunicore.client import Job
+from pyunicore.client import Transport
+from pyunicore.credentials import UsernamePassword
+from pyunicore.httpserver import BackgroundHTTPServer
+from pyunicore.metrics import MetricsRegistry
+from pyunicore.metrics import url_template
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status = 404 if "9999" in self.path else 200
+        body = b'{"status": "RUNNING"}'
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-UNICORE-SecuritySession", "s1")
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_PUT = _reply  # noqa: N815
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.server = BackgroundHTTPServer(("127.0.0.1", 0), Handler)
+        self.base = self.server.base_url + "/SITE/rest/core"
+        self.server.start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_url_template(self):
+        print("*** test_url_template")
+        base = "https://localhost:8080/DEMO-SITE/rest/core"
+        for url, expected in [
+            (base, "/DEMO-SITE/rest/core"),
+            (
+                base + "/jobs/f5ed1a2c-6f5b-4d0c-9a1e-3c0e2b0f9d1a?fields=status",
+                "/DEMO-SITE/rest/core/jobs/{id}",
+            ),
+            (
+                base + "/storages/HOME/files/a/b.txt",
+                "/DEMO-SITE/rest/core/storages/{id}/files/{path}",
+            ),
+            (base + "/storages/HOME/files", "/DEMO-SITE/rest/core/storages/{id}/files"),
+            (base + "/transfers/1234", "/DEMO-SITE/rest/core/transfers/{id}"),
+        ]:
+            self.assertEqual(expected, url_template(url))
+
+    def test_metrics_registry(self):
+        print("*** test_metrics_registry")
+        metrics = MetricsRegistry()
+        events = []
+        tr = Transport(self.credential, observers=[metrics])
+        job = Job(tr, self.base + "/jobs/1234", cache_time=0)
+        job.transport.add_observer(events.append)
+        job.transport.add_observer(lambda event: 1 / 0)
+        for _ in range(3):
+            job.properties
+        tr.put(url=self.base + "/storages/HOME/files/test.txt", data=b"test data")
+        self.assertRaises(requests.HTTPError, tr.get, url=self.base + "/jobs/9999")
+        self.assertEqual(5, len(events))
+        self.assertEqual([False, True, True], [e.session_reused for e in events[:3]])
+        self.assertEqual(9, events[3].bytes_out)
+        self.assertEqual(404, events[4].status)
+        self.assertIsNotNone(events[4].error)
+        labels = (("method", "GET"), ("endpoint", "/SITE/rest/core/jobs/{id}"))
+        self.assertEqual(3, metrics.get("requests_total", labels + (("status", "200"),)))
+        self.assertEqual(84, metrics.get("bytes_in_total", labels))
+        self.assertEqual(3, metrics.get("session_reused_total", labels))
+        dump = metrics.dump()
+        self.assertEqual(2, len(dump["histograms"]))
+        text = metrics.to_prometheus()
+        print(text)
+        self.assertIn(
+            'pyunicore_request_latency_seconds_count{method="GET",'
+            'endpoint="/SITE/rest/core/jobs/{id}"} 4',
+            text,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+
+from pyunicore.client import Client
+from pyunicore.client import JobStatus
+from pyunicore.client import Transport
+from pyunicore.credentials import UsernamePassword
+from pyunicore.testing import FakeUNICORE
+
+
+class TestNewJobs(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeUNICORE().start()
+        self.client = Client(UsernamePassword("demouser", "test123"), self.server.site_url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_new_jobs(self):
+        print("*** test_new_jobs")
+        descriptions = [{"Executable": "date", "Name": "job%s" % i} for i in range(20)]
+        jobs, errors = self.client.new_jobs(descriptions)
+        self.assertEqual({}, errors)
+        self.assertEqual(["job%s" % i for i in range(20)], [j.properties["name"] for j in jobs])
+        self.assertEqual(20, len(self.server.jobs))
+
+    def test_concurrency(self):
+        print("*** test_concurrency")
+        self.client.properties
+        self.server.latency = 0.05
+        descriptions = [{"Executable": "date"} for _ in range(20)]
+        start = time.perf_counter()
+        jobs, errors = self.client.new_jobs(descriptions, concurrency=10)
+        self.assertEqual({}, errors)
+        # sequential submission would take at least 20 * 0.05 seconds
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_pool_size(self):
+        print("*** test_pool_size")
+        transport = Transport(UsernamePassword("demouser", "test123"), pool_size=2)
+        client = Client(transport, self.server.site_url)
+        client.properties
+        self.server.latency = 0.01
+        self.server.reset_statistics()
+        jobs, errors = client.new_jobs([{"Executable": "date"}] * 10, concurrency=10)
+        self.assertEqual({}, errors)
+        # concurrency is limited by the pool size, so no connections are discarded
+        self.assertLessEqual(self.server.statistics()["connections"]["HTTP/1.1"], 2)
+
+    def test_inputs(self):
+        print("*** test_inputs")
+        with tempfile.TemporaryDirectory() as tmp:
+            inputs = []
+            for i in range(3):
+                path = os.path.join(tmp, "input%s.txt" % i)
+                with open(path, "w") as f:
+                    f.write("input %s" % i)
+                inputs.append({"data.txt": path})
+            descriptions = [{"Executable": "date"} for _ in range(3)]
+            jobs, errors = self.client.new_jobs(descriptions, inputs)
+        self.assertEqual({}, errors)
+        for i, job in enumerate(jobs):
+            self.assertEqual(JobStatus.SUCCESSFUL, job.status)
+            content = job.working_dir.stat("data.txt").raw().read()
+            self.assertEqual(("input %s" % i).encode(), content)
+        self.assertRaises(ValueError, self.client.new_jobs, descriptions, inputs[:2])
+
+    def test_partial_failure(self):
+        print("*** test_partial_failure")
+        self.client.properties
+        self.server.fail_next(status=400)
+        descriptions = [{"Executable": "date"} for _ in range(5)]
+        jobs, errors = self.client.new_jobs(descriptions, concurrency=1)
+        self.assertIsNone(jobs[0])
+        self.assertEqual([0], list(errors))
+        self.assertIsInstance(errors[0], requests.HTTPError)
+        self.assertEqual([JobStatus.SUCCESSFUL] * 4, [job.status for job in jobs[1:]])
+        self.assertEqual(4, len(self.server.jobs))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import time
+import unittest
+
+import requests
+
+from pyunicore.client import Client
+from pyunicore.client import Job
+from pyunicore.credentials import UsernamePassword
+from pyunicore.notifications import NotificationReceiver
+from pyunicore.testing import FakeUNICORE
+
+JOB_URL = ("GET", "/DEMO-SITE/rest/core/jobs/{id}")
+
+
+class TestNotifications(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeUNICORE(job_queue_time=0.1, job_run_time=0.1).start()
+        self.client = Client(UsernamePassword("demouser", "test123"), self.server.site_url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_notification(self):
+        print("*** test_notification")
+        changes = []
+        with NotificationReceiver(fallback_interval=60) as receiver:
+            receiver.add_callback(lambda url, status, msg: changes.append(status))
+            description = {"Executable": "date"}
+            start = time.perf_counter()
+            job = self.client.new_job(description, notification_receiver=receiver)
+            self.assertEqual(receiver.url, description["Notification"])
+            self.server.reset_statistics()
+            self.assertIs(job, receiver.wait(job, timeout=5))
+            duration = time.perf_counter() - start
+            # no polling, only a single request to confirm the final status
+            self.assertEqual(1, self.server.statistics()["requests"][JOB_URL])
+            self.assertEqual("SUCCESSFUL", job.properties["status"])
+        self.assertTrue(duration < 1.0)
+        self.assertEqual(["RUNNING", "SUCCESSFUL"], changes)
+        stats = receiver.statistics()
+        self.assertEqual(1, stats["notified"])
+        self.assertEqual(0, stats["polls"])
+
+    def test_early_notification(self):
+        print("*** test_early_notification")
+        self.server.job_queue_time = 0
+        self.server.job_run_time = 0
+        with NotificationReceiver() as receiver:
+            job = self.client.new_job({"Executable": "date", "Notification": receiver.url})
+            while receiver.statistics()["notifications"] == 0:
+                time.sleep(0.01)
+            self.assertIs(job, receiver.watch(job).result(timeout=1))
+
+    def test_fallback_polling(self):
+        print("*** test_fallback_polling")
+        self.server.notifications = False
+        with NotificationReceiver(fallback_interval=0.1) as receiver:
+            job = self.client.new_job({"Executable": "false"}, notification_receiver=receiver)
+            receiver.wait(job, timeout=5)
+            self.assertEqual("FAILED", job.properties["status"])
+        stats = receiver.statistics()
+        self.assertEqual(0, stats["notifications"])
+        self.assertEqual(1, stats["polled"])
+        self.assertTrue(stats["polls"] >= 1)
+
+    def test_verify(self):
+        print("*** test_verify")
+        self.server.job_queue_time = 60
+        with NotificationReceiver(fallback_interval=60) as receiver:
+            job = self.client.new_job({"Executable": "date"}, notification_receiver=receiver)
+            message = {"href": job.resource_url, "status": "SUCCESSFUL"}
+            res = requests.post(receiver.url, json=message)
+            self.assertEqual(204, res.status_code)
+            future = receiver.watch(job)
+            self.assertFalse(future.done())
+            self.assertIs(future, receiver.watch(Job(job.transport, job.resource_url)))
+            self.assertEqual(1, receiver.statistics()["notifications"])
+            res = requests.post(receiver.url, json={"status": "SUCCESSFUL"})
+            self.assertEqual(400, res.status_code)
+            self.assertRaises(TimeoutError, receiver.wait, job, 0.1)
+
+    def test_stop(self):
+        print("*** test_stop")
+        receiver = NotificationReceiver(fallback_interval=60).start()
+        receiver.watch(self.client.new_job({"Executable": "date"}))
+        start = time.perf_counter()
+        receiver.stop()
+        self.assertLess(time.perf_counter() - start, 0.2)
+        self.assertRaises(requests.ConnectionError, requests.post, receiver.url, json={})
+
+
+if __name__ == "__main__":
+    unittest.main()
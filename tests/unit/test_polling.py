@@ -0,0 +1,104 @@
+import time
+import unittest
+
+from pyunicore.client import Client
+from pyunicore.client import JobStatus
+from pyunicore.client import Transport
+from pyunicore.credentials import UsernamePassword
+from pyunicore.polling import PollingStrategy
+from pyunicore.testing import FakeUNICORE
+
+
+class TestPollingStrategy(unittest.TestCase):
+    def test_intervals(self):
+        print("*** test_intervals")
+        strategy = PollingStrategy(initial=1, factor=2, max_interval=10, jitter=0)
+        poller = strategy.poller()
+        intervals = [poller.next_interval(JobStatus.RUNNING) for _ in range(6)]
+        self.assertEqual([1, 2, 4, 8, 10, 10], intervals)
+        # state-aware: fast while staging out, slow while queued
+        self.assertEqual(0.5, poller.next_interval(JobStatus.STAGINGOUT))
+        self.assertEqual(1.0, poller.next_interval(JobStatus.STAGINGOUT))
+        self.assertEqual(5, strategy.interval("STAGINGOUT", 10))
+        self.assertEqual(300, strategy.interval(JobStatus.QUEUED, 20))
+        # interval is reset when the state changes
+        self.assertEqual(1, poller.next_interval(JobStatus.RUNNING))
+        self.assertEqual(9, poller.polls)
+        poller.done("Job")
+        stats = strategy.statistics()["Job"]
+        self.assertEqual(1, stats["completed"])
+        self.assertEqual(9, stats["max_polls"])
+
+    def test_jitter(self):
+        print("*** test_jitter")
+        strategy = PollingStrategy(initial=10, max_interval=10, jitter=0.2)
+        poller = strategy.poller()
+        intervals = [poller.next_interval("RUNNING") for _ in range(100)]
+        self.assertTrue(all(8 <= i <= 12 for i in intervals))
+        self.assertTrue(len(set(intervals)) > 1)
+
+    def test_invalid_settings(self):
+        print("*** test_invalid_settings")
+        self.assertRaises(ValueError, PollingStrategy, initial=0)
+        self.assertRaises(ValueError, PollingStrategy, factor=0.5)
+        self.assertRaises(ValueError, PollingStrategy, initial=10, max_interval=5)
+        self.assertRaises(ValueError, PollingStrategy, jitter=1)
+
+
+class TestPolling(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeUNICORE(job_queue_time=0.3, job_run_time=0.2).start()
+        self.strategy = PollingStrategy(
+            initial=0.02, factor=2, max_interval=0.1, jitter=0, state_intervals={}
+        )
+        tr = Transport(UsernamePassword("demouser", "test123"), polling_strategy=self.strategy)
+        self.client = Client(tr, self.server.site_url)
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_poll_job(self):
+        print("*** test_poll_job")
+        job = self.client.new_job({"Executable": "date"})
+        start = time.perf_counter()
+        job.poll(JobStatus.RUNNING)
+        self.assertEqual(JobStatus.RUNNING, job.status)
+        job.poll()
+        duration = time.perf_counter() - start
+        self.assertEqual(JobStatus.SUCCESSFUL, job.status)
+        # a short job does not wait for seconds
+        self.assertTrue(duration < 1.0)
+        stats = self.strategy.statistics()
+        print(stats)
+        self.assertEqual(2, stats["Job"]["completed"])
+        self.assertTrue(stats["Job"]["polls"] >= 5)
+
+    def test_poll_with_strategy(self):
+        print("*** test_poll_with_strategy")
+        job = self.client.new_job({"Executable": "false"})
+        strategy = PollingStrategy(initial=0.05, jitter=0, state_intervals={})
+        job.poll(polling_strategy=strategy)
+        self.assertEqual(JobStatus.FAILED, job.status)
+        self.assertEqual(1, strategy.statistics()["Job"]["completed"])
+        self.assertNotIn("Job", self.strategy.statistics())
+
+    def test_timeout(self):
+        print("*** test_timeout")
+        self.server.job_queue_time = 10
+        job = self.client.new_job({"Executable": "date"})
+        start = time.perf_counter()
+        self.assertRaises(TimeoutError, job.poll, timeout=0.3)
+        self.assertTrue(time.perf_counter() - start < 1.0)
+        self.assertEqual({}, self.strategy.statistics())
+
+    def test_poll_transfer(self):
+        print("*** test_poll_transfer")
+        home = self.client.get_storages()[0]
+        home.put(b"data", "source.txt")
+        transfer = home.send_file("source.txt", home.resource_url + "/files/target.txt")
+        transfer.poll()
+        self.assertEqual(1, self.strategy.statistics()["Transfer"]["completed"])
+
+
+if __name__ == "__main__":
+    unittest.main()
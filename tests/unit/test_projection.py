@@ -0,0 +1,90 @@
+import unittest
+
+from pyunicore.client import Client
+from pyunicore.client import Job
+from pyunicore.client import JobStatus
+from pyunicore.credentials import UsernamePassword
+from pyunicore.metrics import MetricsRegistry
+from pyunicore.testing import FakeUNICORE
+
+JOB_URL = ("GET", "/DEMO-SITE/rest/core/jobs/{id}")
+
+
+class TestProjection(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeUNICORE(job_log_lines=500).start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_status_fast_path(self):
+        print("*** test_status_fast_path")
+        metrics = MetricsRegistry()
+        client = Client(self.credential, self.server.site_url)
+        client.transport.add_observer(metrics)
+        job = client.new_job({"Executable": "date"})
+        job.cache_time = 0
+        labels = (("method", "GET"), ("endpoint", JOB_URL[1]))
+        metrics.reset()
+        self.assertEqual(JobStatus.SUCCESSFUL, job.status)
+        status_bytes = metrics.get("bytes_in_total", labels)
+        self.assertFalse(job.is_running())
+        self.assertEqual({"status": "SUCCESSFUL"}, job.get_properties(["status"]))
+        self.assertEqual({"exitCode": 0}, job.get_properties("exitCode"))
+        metrics.reset()
+        job = Job(client.transport, job.resource_url)
+        self.assertEqual(500, len(job.properties["log"]))
+        full_bytes = metrics.get("bytes_in_total", labels)
+        print("status: %s bytes, full document: %s bytes" % (status_bytes, full_bytes))
+        self.assertTrue(status_bytes < 100)
+        self.assertTrue(full_bytes > 10000)
+
+    def test_cached_fields(self):
+        print("*** test_cached_fields")
+        client = Client(self.credential, self.server.site_url)
+        job = client.new_job({"Executable": "date"})
+        job.cache_time = 60
+        self.server.reset_statistics()
+        for _ in range(5):
+            self.assertEqual(JobStatus.SUCCESSFUL, job.status)
+        self.assertEqual(1, self.server.statistics()["requests"][JOB_URL])
+        # the full properties are also used for projections
+        job.properties
+        job.get_properties(["status", "queue"])
+        self.assertEqual(2, self.server.statistics()["requests"][JOB_URL])
+        job._invalidate()
+        job.status
+        self.assertEqual(3, self.server.statistics()["requests"][JOB_URL])
+
+    def test_unsupported(self):
+        print("*** test_unsupported")
+        self.server.supports_fields = False
+        client = Client(self.credential, self.server.site_url)
+        job = client.new_job({"Executable": "date"})
+        job.cache_time = 60
+        self.server.reset_statistics()
+        self.assertEqual(JobStatus.SUCCESSFUL, job.status)
+        # the full document was sent, so it is kept as the properties
+        self.assertEqual(500, len(job.properties["log"]))
+        self.assertEqual(1, self.server.statistics()["requests"][JOB_URL])
+
+    def test_listings(self):
+        print("*** test_listings")
+        client = Client(self.credential, self.server.site_url)
+        for _ in range(3):
+            client.new_job({"Executable": "date"})
+        self.server.reset_statistics()
+        jobs = client.get_jobs(fields=["status", "name"])
+        self.assertEqual(3, self.server.statistics()["requests"][JOB_URL])
+        for job in jobs:
+            self.assertEqual(JobStatus.SUCCESSFUL, job.status)
+        self.assertEqual(3, self.server.statistics()["requests"][JOB_URL])
+        home = client.get_storages()[0]
+        home.put(b"data", "test.txt")
+        content = home.contents(fields=["size"])["content"]
+        self.assertEqual({"/test.txt": {"size": 4}}, content)
+
+
+if __name__ == "__main__":
+    unittest.main()
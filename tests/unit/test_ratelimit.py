@@ -0,0 +1,119 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from pyunicore.client import Transport
+from pyunicore.credentials import UsernamePassword
+from pyunicore.httpserver import BackgroundHTTPServer
+from pyunicore.ratelimit import RateLimiter
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        time.sleep(0.05)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRateLimit(unittest.TestCase):
+    def setUp(self):
+        self.server = BackgroundHTTPServer(("127.0.0.1", 0), SlowHandler)
+        self.server.lock = threading.Lock()
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.url = self.server.base_url + "/rest/core"
+        self.server.start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_concurrency_limit(self):
+        print("*** test_concurrency_limit")
+        limiter = RateLimiter(max_concurrent=3)
+        tr = Transport(self.credential, rate_limiter=limiter)
+        urls = [self.url + "/jobs/%s" % i for i in range(20)]
+        results, errors = tr._clone().get_many(urls, max_workers=10)
+        self.assertEqual(20, len(results))
+        self.assertEqual(0, len(errors))
+        self.assertEqual(3, self.server.max_in_flight)
+        stats = limiter.statistics()
+        print(stats)
+        self.assertEqual(20, stats["requests"])
+        self.assertTrue(stats["queued"] > 0)
+        self.assertEqual(0, sum(stats["in_flight"].values()))
+
+    def test_rate_limit(self):
+        print("*** test_rate_limit")
+        limiter = RateLimiter(rate=50, burst=1)
+        tr = Transport(self.credential, rate_limiter=limiter)
+        start = time.perf_counter()
+        for i in range(10):
+            tr.get(url=self.url)
+        duration = time.perf_counter() - start
+        print("10 requests at max. 50/sec: %.3f sec" % duration)
+        self.assertTrue(duration >= 0.18)
+
+    def test_streamed_response(self):
+        print("*** test_streamed_response")
+        limiter = RateLimiter(max_concurrent=1)
+        tr = Transport(self.credential, rate_limiter=limiter)
+        res = tr.get(url=self.url, to_json=False, stream=True)
+        # the slot is held until the streamed response is closed
+        self.assertEqual(1, sum(limiter.statistics()["in_flight"].values()))
+        res.close()
+        self.assertEqual(0, sum(limiter.statistics()["in_flight"].values()))
+        # or until its body has been read
+        res = tr.get(url=self.url, to_json=False, stream=True)
+        self.assertEqual(b"{}", res.raw.read())
+        self.assertEqual(0, sum(limiter.statistics()["in_flight"].values()))
+        res.close()
+        self.assertEqual(0, sum(limiter.statistics()["in_flight"].values()))
+
+    def test_fifo_order(self):
+        print("*** test_fifo_order")
+        limiter = RateLimiter(max_concurrent=1)
+        order = []
+        limiter.acquire(self.url)
+
+        def worker(i):
+            limiter.acquire(self.url)
+            order.append(i)
+            limiter.release(self.url)
+
+        threads = []
+        for i in range(10):
+            t = threading.Thread(target=worker, args=(i,))
+            t.start()
+            threads.append(t)
+            # make sure the threads queue up in order
+            while limiter.statistics()["queued"] < i + 1:
+                time.sleep(0.001)
+        limiter.release(self.url)
+        for t in threads:
+            t.join()
+        self.assertEqual(list(range(10)), order)
+
+    def test_invalid_settings(self):
+        print("*** test_invalid_settings")
+        self.assertRaises(ValueError, RateLimiter, max_concurrent=0)
+        self.assertRaises(ValueError, RateLimiter, rate=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import io
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+import requests
+
+from pyunicore.client import Job
+from pyunicore.client import Transport
+from pyunicore.credentials import UsernamePassword
+from pyunicore.httpserver import BackgroundHTTPServer
+from pyunicore.retry import RetryBudget
+from pyunicore.retry import RetryPolicy
+
+
+class FailingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.bodies.append(body)
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            self.send_response(503)
+            if self.server.retry_after is not None:
+                self.send_header("Retry-After", self.server.retry_after)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    do_GET = do_PUT = do_POST = _reply  # noqa: N815
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRetry(unittest.TestCase):
+    def setUp(self):
+        self.server = BackgroundHTTPServer(("127.0.0.1", 0), FailingHandler)
+        self.server.failures = 0
+        self.server.retry_after = None
+        self.server.bodies = []
+        self.url = self.server.base_url + "/rest/core"
+        self.server.start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_no_policy(self):
+        print("*** test_no_policy")
+        self.server.failures = 1
+        tr = Transport(self.credential)
+        self.assertRaises(requests.HTTPError, tr.get, url=self.url)
+
+    def test_retry_idempotent(self):
+        print("*** test_retry_idempotent")
+        policy = RetryPolicy(backoff_factor=0.01)
+        tr = Transport(self.credential, retry_policy=policy)
+        job = Job(tr, self.url)
+        self.assertIs(policy, job.transport.retry_policy)
+        self.server.failures = 2
+        self.assertEqual({}, job.transport.get(url=self.url))
+        self.server.failures = 2
+        tr.put(url=self.url, data=io.BytesIO(b"test data"))
+        self.assertEqual([b"test data"] * 3, self.server.bodies[3:])
+        self.server.failures = 5
+        self.assertRaises(requests.HTTPError, tr.get, url=self.url)
+        stats = policy.statistics()
+        print(stats)
+        self.assertEqual(3, stats["requests"])
+        self.assertEqual(7, stats["retries"])
+        self.assertEqual(1, stats["exhausted"])
+        self.assertEqual({"503": 7}, stats["reasons"])
+
+    def test_no_retry_post(self):
+        print("*** test_no_retry_post")
+        policy = RetryPolicy(backoff_factor=0.01)
+        tr = Transport(self.credential, retry_policy=policy)
+        self.server.failures = 1
+        self.assertRaises(requests.HTTPError, tr.post, url=self.url, json={})
+        self.assertEqual(0, policy.statistics()["retries"])
+        policy.retry_non_idempotent = True
+        self.server.failures = 1
+        tr.post(url=self.url, json={})
+        self.assertEqual(1, policy.statistics()["retries"])
+
+    def test_retry_after(self):
+        print("*** test_retry_after")
+        policy = RetryPolicy(backoff_factor=0.01)
+        tr = Transport(self.credential, retry_policy=policy)
+        self.server.failures = 1
+        self.server.retry_after = "1"
+        start = time.time()
+        tr.get(url=self.url)
+        self.assertGreaterEqual(time.time() - start, 1)
+
+    def test_retry_budget(self):
+        print("*** test_retry_budget")
+        policy = RetryPolicy(backoff_factor=0.01, budget=RetryBudget(ratio=0, min_tokens=2))
+        tr = Transport(self.credential, retry_policy=policy)
+        self.server.failures = 3
+        self.assertRaises(requests.HTTPError, tr.get, url=self.url)
+        stats = policy.statistics()
+        self.assertEqual(2, stats["retries"])
+        self.assertEqual(1, stats["budget_exhausted"])
+
+    def test_connection_error(self):
+        print("*** test_connection_error")
+        policy = RetryPolicy(max_retries=2, backoff_factor=0.01)
+        tr = Transport(self.credential, retry_policy=policy)
+        self.tearDown()
+        self.assertRaises(requests.ConnectionError, tr.get, url=self.url)
+        self.assertEqual({"ConnectionError": 2}, policy.statistics()["reasons"])
+        self.setUp()
+
+    def test_connection_refused_post(self):
+        print("*** test_connection_refused_post")
+        policy = RetryPolicy(max_retries=2, backoff_factor=0.01)
+        tr = Transport(self.credential, retry_policy=policy)
+        self.tearDown()
+        # the request was never sent, so it is safe to retry a POST
+        self.assertRaises(requests.ConnectionError, tr.post, url=self.url, json={})
+        self.assertEqual({"ConnectionError": 2}, policy.statistics()["reasons"])
+        self.setUp()
+        # but not if the connection broke after the request was sent
+        error = requests.ConnectionError("Connection aborted.")
+        self.assertFalse(policy.should_retry("POST", 0, error=error))
+        self.assertTrue(policy.should_retry("GET", 0, error=error))
+
+    def test_backoff(self):
+        print("*** test_backoff")
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+        self.assertEqual([1, 2, 4, 5], [policy.get_backoff(i) for i in range(4)])
+        policy.jitter = True
+        for i in range(4):
+            self.assertTrue(0 <= policy.get_backoff(i) <= 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+from pyunicore.client import Job
+from pyunicore.client import SecuritySessionStore
+from pyunicore.client import Transport
+from pyunicore.credentials import UsernamePassword
+from pyunicore.httpserver import BackgroundHTTPServer
+
+
+class SessionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # noqa: N802
+        server = self.server
+        session_id = self.headers.get("X-UNICORE-SecuritySession")
+        with server.lock:
+            if session_id is None:
+                server.authentications += 1
+                server.session_counter += 1
+                session_id = "session-%s" % server.session_counter
+                server.valid_sessions.add(session_id)
+            elif session_id not in server.valid_sessions:
+                self.send_response(432)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        body = b'{"status": "RUNNING"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-UNICORE-SecuritySession", session_id)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestSecuritySessions(unittest.TestCase):
+    def setUp(self):
+        self.server = BackgroundHTTPServer(("127.0.0.1", 0), SessionHandler)
+        self.server.lock = threading.Lock()
+        self.server.authentications = 0
+        self.server.session_counter = 0
+        self.server.valid_sessions = set()
+        self.base = self.server.base_url + "/SITE/rest/core"
+        self.server.start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_shared_sessions(self):
+        print("*** test_shared_sessions")
+        tr = Transport(self.credential)
+        tr.get(url=self.base)
+        self.assertEqual("session-1", tr.last_session_id)
+        jobs = [Job(tr._clone(), self.base + "/jobs/%s" % i, cache_time=0) for i in range(50)]
+        for job in jobs:
+            job.properties
+        self.assertEqual(1, self.server.authentications)
+        # session expires on the server: only the first clone does a full authentication
+        self.server.valid_sessions.clear()
+        for job in jobs:
+            job.properties
+        self.assertEqual(2, self.server.authentications)
+        for job in jobs:
+            self.assertEqual("session-2", job.transport.last_session_id)
+        stats = tr.session_store.statistics()
+        print(stats)
+        self.assertEqual(2, stats["authentications"])
+        self.assertEqual(1, stats["expired"])
+        self.assertEqual(100, stats["reused"])
+
+    def test_session_keys(self):
+        print("*** test_session_keys")
+        store = SecuritySessionStore()
+        tr1 = Transport(self.credential, session_store=store)
+        tr2 = Transport(UsernamePassword("otheruser", "test123"), session_store=store)
+        tr1.get(url=self.base)
+        tr2.get(url=self.base)
+        self.assertEqual(2, len(store))
+        tr3 = tr1._clone()
+        tr3.preferences = "uid:demouser"
+        tr3.get(url=self.base)
+        self.assertEqual(3, len(store))
+        self.assertEqual(3, self.server.authentications)
+        self.assertNotEqual(tr1.last_session_id, tr3.last_session_id)
+        tr1.get(url=self.base)
+        self.assertEqual(3, self.server.authentications)
+
+    def test_invalidate(self):
+        print("*** test_invalidate")
+        store = SecuritySessionStore()
+        store.put("key", "s2")
+        store.invalidate("key", "s1")
+        self.assertEqual("s2", store.get("key"))
+        store.invalidate("key", "s2")
+        self.assertIsNone(store.get("key"))
+
+
+if __name__ == "__main__":
+    unittest.main()
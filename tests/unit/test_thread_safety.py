@@ -0,0 +1,91 @@
+import threading
+import unittest
+
+from pyunicore.client import Client
+from pyunicore.client import Job
+from pyunicore.credentials import UsernamePassword
+from pyunicore.testing import FakeUNICORE
+
+
+def run_threads(target, count):
+    errors = []
+
+    def worker(i):
+        try:
+            target(i)
+        # failures of any kind are collected, and checked by the test
+        except Exception as e:  # noqa: B902
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return errors
+
+
+class TestThreadSafety(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeUNICORE().start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_shared_client(self):
+        print("*** test_shared_client")
+        client = Client(self.credential, self.server.site_url)
+        home = client.get_storages()[0]
+        jobs = [client.new_job({"Executable": "date"}) for _ in range(4)]
+
+        def work(i):
+            for n in range(10):
+                job = jobs[(i + n) % len(jobs)]
+                job.cache_time = 0
+                self.assertTrue(job.properties["status"])
+                data = ("data %s %s" % (i, n)).encode()
+                name = "t%s/f%s.txt" % (i, n)
+                home.put(data, name)
+                self.assertEqual(len(data), home.stat(name).size())
+                self.assertEqual(4, len(client.get_jobs()))
+
+        errors = run_threads(work, 32)
+        self.assertEqual([], errors)
+        self.assertEqual(32, len(home.listdir()))
+        stats = self.server.statistics()
+        # threads starting at the same time may each authenticate once
+        self.assertLessEqual(stats["authentications"], 33)
+
+    def test_preferences_snapshot(self):
+        print("*** test_preferences_snapshot")
+        client = Client(self.credential, self.server.site_url)
+        tr = client.transport
+
+        def work(i):
+            for n in range(20):
+                tr.preferences = "uid:demouser" if (i + n) % 2 else None
+                tr.get(url=self.server.site_url)
+
+        errors = run_threads(work, 16)
+        self.assertEqual([], errors)
+        # one security session per set of preferences
+        self.assertEqual(2, len(tr.session_store))
+
+    def test_single_fetch(self):
+        print("*** test_single_fetch")
+        client = Client(self.credential, self.server.site_url)
+        job = client.new_job({"Executable": "date"})
+        shared = Job(client.transport, job.resource_url, cache_time=60)
+        self.server.latency = 0.05
+        self.server.reset_statistics()
+        results = []
+        errors = run_threads(lambda i: results.append(shared.properties["status"]), 20)
+        self.assertEqual([], errors)
+        self.assertEqual(20, len(results))
+        stats = self.server.statistics()
+        self.assertEqual(1, stats["requests"][("GET", "/DEMO-SITE/rest/core/jobs/{id}")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import json
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler
+
+import requests
+
+from pyunicore.client import Job
+from pyunicore.client import Resource
+from pyunicore.client import Storage
+from pyunicore.client import Transport
+from pyunicore.credentials import UsernamePassword
+from pyunicore.httpserver import BackgroundHTTPServer
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):  # noqa: N802
+        time.sleep(self.server.delay)
+        if "missing" in self.path:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"status": "SUCCESSFUL", "path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = BackgroundHTTPServer(("127.0.0.1", 0), CountingHandler)
+        self.server.connections = 0
+        self.server.delay = 0
+        self.base = self.server.base_url
+        self.server.start()
+        self.credential = UsernamePassword("demouser", "test123")
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_clones_share_pool(self):
+        print("*** test_clones_share_pool")
+        tr = Transport(self.credential, pool_size=4)
+        job = Job(tr, self.base + "/rest/core/jobs/1")
+        storage = Storage(job.transport, self.base + "/rest/core/storages/1")
+        self.assertIs(tr.session, job.transport.session)
+        self.assertIs(tr.session, storage.transport.session)
+        self.assertEqual(4, storage.transport.pool_size)
+        for _ in range(10):
+            tr.get(url=self.base + "/rest/core")
+            job.transport.get(url=job.resource_url)
+            storage.transport.get(url=storage.resource_url)
+        self.assertEqual(1, self.server.connections)
+        tr.close()
+
+    def test_pooled_latency(self):
+        print("*** test_pooled_latency")
+        n = 100
+        url = self.base + "/rest/core"
+        start = time.perf_counter()
+        for _ in range(n):
+            requests.get(url).close()
+        unpooled = (time.perf_counter() - start) / n
+        unpooled_connections = self.server.connections
+        tr = Transport(self.credential)
+        start = time.perf_counter()
+        for _ in range(n):
+            tr.get(url=url)
+        pooled = (time.perf_counter() - start) / n
+        print(f"Mean latency without pool: {1000*unpooled:.3f} ms, with pool: {1000*pooled:.3f} ms")
+        self.assertEqual(n, unpooled_connections)
+        self.assertEqual(n + 1, self.server.connections)
+
+    def test_get_many(self):
+        print("*** test_get_many")
+        tr = Transport(self.credential)
+        urls = [self.base + "/rest/core/jobs/%s" % i for i in range(5)]
+        urls.append(self.base + "/rest/core/jobs/missing")
+        results, errors = tr.get_many(urls)
+        self.assertEqual(5, len(results))
+        self.assertEqual("/rest/core/jobs/3", results[urls[3]]["path"])
+        self.assertEqual([urls[5]], list(errors))
+        self.assertIsInstance(errors[urls[5]], requests.HTTPError)
+
+    def test_prefetch(self):
+        print("*** test_prefetch")
+        self.server.delay = 0.1
+        tr = Transport(self.credential, pool_size=20)
+        jobs = [Job(tr, self.base + "/rest/core/jobs/%s" % i) for i in range(20)]
+        start = time.time()
+        self.assertEqual({}, Resource.prefetch(jobs))
+        self.assertLess(time.time() - start, 1.0)
+        self.assertEqual(20, tr.cache_statistics.misses)
+        for job in jobs:
+            self.assertEqual("SUCCESSFUL", job.status.value)
+        self.assertEqual(20, tr.cache_statistics.hits)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,11 @@
+import threading
+import time
 import unittest
 from base64 import b64encode
 
+import requests
+from jwt import encode as jwt_encode
+
 import pyunicore.credentials as uc_credentials
 from pyunicore.client import Transport
 
@@ -41,6 +46,52 @@ class TestCredentials(unittest.TestCase):
         credential = uc_credentials.OIDCToken("test123", refresh_handler)
         self.assertEqual("Bearer foobar", credential.get_auth_header())
 
+    def test_refresh_handler_background_refresh(self):
+        print("*** test_refresh_handler_background_refresh")
+        token = _token(expires_in=30)
+        handler = MockRefreshHandler(token, refresh_margin=60)
+        start = time.time()
+        results = _get_tokens_concurrently(handler, 10)
+        self.assertLess(time.time() - start, handler.delay)
+        self.assertEqual([token] * 10, results)
+        handler._refresh_thread.join()
+        self.assertEqual(1, handler.refreshed)
+        self.assertNotEqual(token, handler.get_token())
+        self.assertTrue(handler.is_valid_token())
+
+    def test_refresh_handler_expired_token(self):
+        print("*** test_refresh_handler_expired_token")
+        handler = MockRefreshHandler(_token(expires_in=-10))
+        self.assertFalse(handler.is_valid_token())
+        results = _get_tokens_concurrently(handler, 10)
+        self.assertEqual(1, handler.refreshed)
+        self.assertEqual([handler.token] * 10, results)
+        self.assertTrue(handler.is_valid_token())
+
+    def test_refresh_handler_failed_refresh(self):
+        print("*** test_refresh_handler_failed_refresh")
+        token = _token(expires_in=30)
+        handler = FailingRefreshHandler(token, refresh_margin=60)
+        for _ in range(10):
+            self.assertEqual(token, handler.get_token())
+            thread = handler._refresh_thread
+            if thread is not None:
+                thread.join()
+        # no new refresh is started before the backoff time has passed
+        self.assertEqual(1, handler.refreshed)
+        self.assertIsInstance(handler._refresh_error, requests.ConnectionError)
+        handler._retry_after = 0
+        handler.get_token()
+        handler._refresh_thread.join()
+        self.assertEqual(2, handler.refreshed)
+        self.assertEqual(2, handler._refresh_failures)
+
+    def test_refresh_handler_opaque_token(self):
+        print("*** test_refresh_handler_opaque_token")
+        handler = MockRefreshHandler("not-a-jwt")
+        self.assertEqual("not-a-jwt", handler.get_token())
+        self.assertEqual(0, handler.refreshed)
+
     def test_basic_token(self):
         print("*** test_basic_token")
         credential = uc_credentials.BasicToken("test123")
@@ -60,5 +111,44 @@ class MockRefresh:
         return "foobar"
 
 
+class MockRefreshHandler(uc_credentials.RefreshHandler):
+    delay = 0.5
+
+    def __init__(self, token, refresh_margin=60):
+        self.refreshed = 0
+        super().__init__({}, token, refresh_margin)
+
+    def refresh(self):
+        time.sleep(self.delay)
+        self.refreshed += 1
+        self._set_token(_token(expires_in=3600, sub="refreshed"))
+        return self.token
+
+
+class FailingRefreshHandler(MockRefreshHandler):
+    def refresh(self):
+        self.refreshed += 1
+        raise requests.ConnectionError("Connection refused")
+
+
+def _token(expires_in, sub="demouser"):
+    payload = {"sub": sub, "exp": int(time.time()) + expires_in}
+    return jwt_encode(payload, "some-secret-for-testing-token-refresh", algorithm="HS256")
+
+
+def _get_tokens_concurrently(handler, n):
+    results = [None] * n
+
+    def get(i):
+        results[i] = handler.get_token()
+
+    threads = [threading.Thread(target=get, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
 if __name__ == "__main__":
     unittest.main()